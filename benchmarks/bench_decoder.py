@@ -0,0 +1,81 @@
+"""
+Microbenchmark da decodificação das entregas do RabbitMQ.
+
+Compara o caminho antigo (`body.decode()` + `json.loads` + novo
+`json.loads` da observação) com os decodificadores de
+`chatgraph.messages.decoder`, que leem os bytes diretamente.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_decoder.py [--number 20000]
+"""
+
+import argparse
+import json
+import timeit
+
+from chatgraph.messages.decoder import DECODERS, get_decoder
+
+
+def build_body(observation_keys: int = 40) -> bytes:
+    """Monta uma entrega representativa com observação de alguns KB."""
+    observation = {
+        f'campo_{i}': {'valor': i, 'descricao': 'x' * 32}
+        for i in range(observation_keys)
+    }
+    payload = {
+        'user_state': {
+            'session_id': 22,
+            'chat_id': {'user_id': '5511999999999', 'company_id': '42'},
+            'platform': 'whatsapp',
+            'menu': {'id': 1, 'name': 'Main', 'active': True},
+            'user': {'name': 'João Silva', 'phone': '11999999999'},
+            'route': 'start.choice_start.receber_btns',
+            'observation': json.dumps(observation),
+            'last_update': '2025-11-16T07:42:47-03:00',
+        },
+        'message': {
+            'text_message': {'id': 'abc', 'detail': 'Mandar outra foto'},
+            'buttons': [{'type': 'postback', 'title': 'Voltar'}] * 3,
+            'date_time': '2025-11-16T07:42:47',
+        },
+    }
+    return json.dumps(payload).encode()
+
+
+def legacy_decode(body: bytes) -> dict:
+    """Caminho anterior: decode + loads + loads da observação."""
+    message = json.loads(body.decode())
+    observation = message['user_state'].get('observation', '{}')
+    if isinstance(observation, str):
+        observation = json.loads(observation)
+    return message
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=20000)
+    args = parser.parse_args()
+
+    body = build_body()
+    print(f'Tamanho da entrega: {len(body)} bytes')
+
+    results = {'legado (decode + 2x loads)': legacy_decode}
+    for name in DECODERS:
+        try:
+            results[name] = get_decoder(name)
+        except ImportError:
+            print(f'{name}: não instalado, ignorado')
+
+    baseline = None
+    for label, decode in results.items():
+        elapsed = timeit.timeit(lambda: decode(body), number=args.number)
+        per_message = elapsed / args.number * 1e6
+        baseline = baseline or per_message
+        print(
+            f'{label:>28}: {per_message:8.2f} µs/mensagem '
+            f'({baseline / per_message:4.2f}x)'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark do acesso à observação do UserState.
+
+Simula um handler típico (várias leituras de `usercall.observation`,
+algumas atualizações e uma escrita ao final) com observações de tamanhos
+diferentes. Compara o caminho antigo (`json.loads` a cada leitura e
+`json.dumps` a cada atualização) com o cache da observação decodificada,
+serializada apenas no flush.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_observation.py [--number 2000]
+"""
+
+import argparse
+import json
+import timeit
+
+from chatgraph.models.userstate import ChatID, UserState
+
+READS = 4
+UPDATES = 3
+
+
+def build_observation(size: int) -> str:
+    """Monta uma observação com aproximadamente `size` bytes."""
+    keys = max(1, size // 64)
+    return json.dumps(
+        {
+            f'campo_{i}': {'valor': i, 'descricao': 'x' * 32}
+            for i in range(keys)
+        }
+    )
+
+
+def legacy_handler(observation: str) -> str:
+    """Caminho anterior: loads por leitura, loads + dumps por atualização."""
+    for _ in range(READS):
+        json.loads(observation)
+    for i in range(UPDATES):
+        obs = json.loads(observation)
+        obs['contador'] = i
+        observation = json.dumps(obs)
+    return observation
+
+
+def cached_handler(observation: str) -> str:
+    """Caminho atual: cache decodificado e serialização única no flush."""
+    user_state = UserState(
+        chat_id=ChatID(user_id='5511999999999', company_id='42'),
+        platform='whatsapp',
+        observation=observation,
+    )
+    for _ in range(READS):
+        user_state.observation_dict
+    for i in range(UPDATES):
+        obs = user_state.observation_dict
+        obs['contador'] = i
+        user_state.set_observation_dict(obs)
+    return user_state.flush_observation()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--number', type=int, default=2000)
+    args = parser.parse_args()
+
+    for size in (1_024, 8_192, 65_536):
+        observation = build_observation(size)
+        assert json.loads(legacy_handler(observation)) == json.loads(
+            cached_handler(observation)
+        )
+
+        print(f'Observação de {len(observation)} bytes:')
+        baseline = None
+        for label, handler in (
+            ('legado', legacy_handler),
+            ('cache', cached_handler),
+        ):
+            elapsed = timeit.timeit(
+                lambda: handler(observation), number=args.number
+            )
+            per_call = elapsed / args.number * 1e6
+            baseline = baseline or per_call
+            print(
+                f'{label:>10}: {per_call:10.2f} µs/mensagem '
+                f'({baseline / per_call:4.2f}x)'
+            )
+
+
+if __name__ == '__main__':
+    main()
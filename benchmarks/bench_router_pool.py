@@ -0,0 +1,142 @@
+"""
+Benchmark das configurações do pool de conexões com o roteador.
+
+Sobe um servidor HTTP/1.1 local que simula o roteador (custo de
+estabelecimento de conexão, como um handshake TLS, e latência por
+requisição) e mede a vazão de `RouterHTTPClient.send_message` com
+diferentes limites de conexões e de keep-alive, além do pico de
+requisições aguardando conexão livre (`pool_stats().waiters`).
+
+HTTP/2 é incluído apenas com o extra `chatgraph[http2]` instalado e, como
+o servidor local fala apenas HTTP/1.1 sem TLS, serve como referência de
+que a opção não degrada o caso sem multiplexação.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_router_pool.py \\
+        [--chats 200] [--messages 10] [--connect-cost 0.01]
+"""
+
+import argparse
+import asyncio
+import importlib.util
+import json
+import time
+
+from chatgraph.models.message import Message
+from chatgraph.models.userstate import ChatID, UserState
+from chatgraph.services.router_http_client import RouterHTTPClient
+
+
+class StandInRouter:
+    """Servidor HTTP/1.1 mínimo com keep-alive que imita o roteador."""
+
+    def __init__(self, connect_cost: float, request_cost: float) -> None:
+        self.connect_cost = connect_cost
+        self.request_cost = request_cost
+        self.connections = 0
+        self.requests = 0
+
+    async def handle(self, reader, writer) -> None:
+        self.connections += 1
+        try:
+            await asyncio.sleep(self.connect_cost)
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (
+                        line.partition(':')
+                        for line in head.decode().split('\r\n')[1:]
+                        if line
+                    )
+                }
+                await reader.readexactly(
+                    int(headers.get('content-length', '0'))
+                )
+                await asyncio.sleep(self.request_cost)
+                self.requests += 1
+
+                data = json.dumps({'status': True, 'message': 'ok'}).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\n'
+                    b'Content-Type: application/json\r\n'
+                    + f'Content-Length: {len(data)}\r\n\r\n'.encode()
+                    + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def run(args, label: str, **options) -> None:
+    router = StandInRouter(args.connect_cost, args.request_cost)
+    server = await asyncio.start_server(router.handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    client = RouterHTTPClient(base_url=f'http://127.0.0.1:{port}', **options)
+    peak_waiters = 0
+    done = asyncio.Event()
+
+    async def sample() -> None:
+        nonlocal peak_waiters
+        while not done.is_set():
+            peak_waiters = max(peak_waiters, client.pool_stats().waiters)
+            await asyncio.sleep(0.005)
+
+    async def chat(user_id: int) -> None:
+        state = UserState(
+            chat_id=ChatID(user_id=str(user_id), company_id='42'),
+            platform='whatsapp',
+        )
+        for i in range(args.messages):
+            await client.send_message(Message(text_message=f'msg {i}'), state)
+
+    sampler = asyncio.create_task(sample())
+    started = time.perf_counter()
+    await asyncio.gather(*(chat(user_id) for user_id in range(args.chats)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    await sampler
+
+    await client.close()
+    server.close()
+    await server.wait_closed()
+
+    print(
+        f'{label:>24}: {router.requests / elapsed:8.0f} req/s, '
+        f'{router.connections:5d} conexões, '
+        f'pico de espera {peak_waiters:4d}, {elapsed:6.2f} s'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=200)
+    parser.add_argument('--messages', type=int, default=10)
+    parser.add_argument('--connect-cost', type=float, default=0.01)
+    parser.add_argument('--request-cost', type=float, default=0.002)
+    args = parser.parse_args()
+
+    configs = [
+        ('10 conexões', {'max_connections': 10}),
+        ('100 conexões', {'max_connections': 100}),
+        (
+            '100 conexões sem keep-alive',
+            {'max_connections': 100, 'max_keepalive_connections': 0},
+        ),
+        (
+            '200 conexões, keep-alive 200',
+            {'max_connections': 200, 'max_keepalive_connections': 200},
+        ),
+    ]
+    if importlib.util.find_spec('h2') is not None:
+        configs.append(('100 conexões + http2', {'http2': True}))
+
+    for label, options in configs:
+        asyncio.run(run(args, label, **options))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Benchmark do envio de mensagens em lote.
+
+Sobe um servidor HTTP local que simula o roteador (custo fixo por
+requisição, custo menor por mensagem e um número limitado de workers) e
+mede a vazão de `RouterHTTPClient.send_message` com e sem o agrupamento
+de envios entre chats.
+
+Uso:
+    PYTHONPATH=. python benchmarks/bench_send_batching.py \\
+        [--chats 200] [--messages 10] [--request-cost 0.002]
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+from chatgraph.models.message import Message
+from chatgraph.models.userstate import ChatID, UserState
+from chatgraph.services.router_http_client import RouterHTTPClient
+
+BATCH_ENDPOINT = '/messages/send/batch/'
+
+
+class StandInRouter:
+    """Servidor HTTP/1.1 mínimo com keep-alive que imita o roteador."""
+
+    def __init__(
+        self,
+        request_cost: float,
+        message_cost: float,
+        workers: int,
+    ) -> None:
+        self.request_cost = request_cost
+        self.message_cost = message_cost
+        self.workers = asyncio.Semaphore(workers)
+        self.requests = 0
+        self.messages = 0
+
+    async def handle(self, reader, writer) -> None:
+        try:
+            while True:
+                head = await reader.readuntil(b'\r\n\r\n')
+                request_line, *header_lines = head.decode().split('\r\n')
+                headers = {
+                    name.strip().lower(): value.strip()
+                    for name, _, value in (
+                        line.partition(':') for line in header_lines if line
+                    )
+                }
+                body = await reader.readexactly(
+                    int(headers.get('content-length', '0'))
+                )
+                path = request_line.split()[1]
+                payload = await self.process(path, json.loads(body))
+
+                data = json.dumps(payload).encode()
+                writer.write(
+                    b'HTTP/1.1 200 OK\r\n'
+                    b'Content-Type: application/json\r\n'
+                    + f'Content-Length: {len(data)}\r\n\r\n'.encode()
+                    + data
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def process(self, path: str, body: dict) -> dict:
+        batch = body.get('messages') if path == BATCH_ENDPOINT else [body]
+        async with self.workers:
+            await asyncio.sleep(
+                self.request_cost + self.message_cost * len(batch)
+            )
+        self.requests += 1
+        self.messages += len(batch)
+
+        if path == BATCH_ENDPOINT:
+            data = [{'status': True, 'message': 'ok'} for _ in batch]
+            return {'status': True, 'message': 'ok', 'data': data}
+        return {'status': True, 'message': 'ok'}
+
+
+async def run(args, batched: bool) -> None:
+    router = StandInRouter(args.request_cost, args.message_cost, args.workers)
+    server = await asyncio.start_server(router.handle, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+
+    client = RouterHTTPClient(
+        base_url=f'http://127.0.0.1:{port}',
+        batch_endpoint=BATCH_ENDPOINT if batched else None,
+        batch_size=args.batch_size,
+    )
+
+    async def chat(user_id: int) -> None:
+        state = UserState(
+            chat_id=ChatID(user_id=str(user_id), company_id='42'),
+            platform='whatsapp',
+        )
+        for i in range(args.messages):
+            await client.send_message(Message(text_message=f'msg {i}'), state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(chat(user_id) for user_id in range(args.chats)))
+    elapsed = time.perf_counter() - started
+
+    await client.close()
+    server.close()
+    await server.wait_closed()
+
+    label = 'em lote' if batched else 'individual'
+    print(
+        f'{label:>10}: {router.messages / elapsed:8.0f} mensagens/s, '
+        f'{router.requests:6d} requisições, {elapsed:6.2f} s'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chats', type=int, default=200)
+    parser.add_argument('--messages', type=int, default=10)
+    parser.add_argument('--request-cost', type=float, default=0.002)
+    parser.add_argument('--message-cost', type=float, default=0.0001)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--batch-size', type=int, default=50)
+    args = parser.parse_args()
+
+    asyncio.run(run(args, batched=False))
+    asyncio.run(run(args, batched=True))
+
+
+if __name__ == '__main__':
+    main()
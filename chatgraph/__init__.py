@@ -15,6 +15,7 @@ from .types.route import Route
 from .types.background_task import BackgroundTask
 from .container.container import Container
 from .logger import logger
+from .logger.logger import configure_logging
 
 __all__ = [
     "ChatbotApp",
@@ -36,4 +37,5 @@ __all__ = [
     "TextMessage",
     "BackgroundTask",
     "Container",
+    "configure_logging",
 ]
@@ -1,11 +1,12 @@
 import asyncio
+import gc
 import inspect
 import re
 from functools import wraps
-from logging import debug, error
 from typing import Optional, Callable
 
 from ..error.chatbot_error import ChatbotMessageError
+from ..logger.logger import logger
 from ..messages.message_consumer import MessageConsumer
 from ..models.message import MessageTypes, Message, File
 from ..types.usercall import UserCall
@@ -16,6 +17,7 @@ from ..types.end_types import (
 )
 from ..types.route import Route
 from .chatbot_router import ChatbotRouter
+from .supervisor import WorkerSupervisor
 from ..types.background_task import BackgroundTask
 from .default_functions import voltar
 
@@ -47,6 +49,7 @@ class ChatbotApp:
         self.default_functions = default_functions
         self.__message_consumer = message_consumer
         self.__routes = {}
+        self.__route_names: list[str] = []
 
     def include_router(self, router: ChatbotRouter) -> None:
         """
@@ -56,6 +59,7 @@ class ChatbotApp:
             router (ChatbotRouter): O roteador contendo as rotas a serem adicionadas.
         """
         self.__routes.update(router.routes)
+        self.__route_names = list(self.__routes.keys())
 
     def route(self, route_name: str) -> Callable:
         """
@@ -81,13 +85,14 @@ class ChatbotApp:
                     else 'Any'
                 )
                 params[param_type] = name
-                debug(f'Parameter: {name}, Type: {param_type}')
+                logger.debug(f'Parameter: {name}, Type: {param_type}')
 
             self.__routes[route_name] = {
                 'function': func,
                 'params': params,
                 'return': output_param,
             }
+            self.__route_names = list(self.__routes.keys())
 
             @wraps(func)
             async def wrapper(*args, **kwargs):
@@ -97,12 +102,39 @@ class ChatbotApp:
 
         return decorator
 
-    def start(self):
+    def start(self, workers: int = 1):
         """
         Inicia o consumo de mensagens pelo chatbot,
         processando cada mensagem recebida.
+
+        Args:
+            workers (int): Quantidade de processos worker. Com mais de um
+                worker, as rotas já registradas são compartilhadas via fork
+                e cada processo abre as próprias conexões AMQP e HTTP.
         """
         self.__message_consumer.reprer()
+
+        if workers <= 1:
+            self.__run_worker()
+            return
+
+        # Congela os objetos já criados (rotas, módulos) para que o GC
+        # dos workers não toque nessas páginas e quebre o copy-on-write
+        gc.collect()
+        gc.freeze()
+        WorkerSupervisor(
+            self.__run_worker,
+            workers,
+            drain_timeout=self.__message_consumer.drain_timeout,
+        ).run()
+
+    def __run_worker(self) -> None:
+        """
+        Executa o loop de consumo no processo atual.
+
+        O MessageConsumer trata o SIGTERM drenando as mensagens em
+        processamento antes de encerrar.
+        """
         asyncio.run(
             self.__message_consumer.start_consume(self.process_message)
         )
@@ -112,6 +144,9 @@ class ChatbotApp:
         Processa uma mensagem recebida, identificando a rota correspondente
         e executando a função associada.
 
+        Ao final, envia de uma só vez as alterações de rota e observação
+        acumuladas pelo UserCall (`usercall.flush()`).
+
         Args:
             usercall (UserCall): A mensagem a ser processada.
 
@@ -119,6 +154,12 @@ class ChatbotApp:
             ChatbotMessageError: Se nenhuma rota for encontrada para
             o menu atual do usuário.
         """
+        try:
+            await self.__route_message(usercall)
+        finally:
+            await usercall.flush()
+
+    async def __route_message(self, usercall: UserCall) -> None:
         user_id = usercall.user_id
         route = usercall.route.lower()
         route_handler = route.split('.')[-1]
@@ -128,7 +169,7 @@ class ChatbotApp:
         for regex, func in self.default_functions.items():
             if re.match(regex, usercall.content_message):
                 matchDefault = True
-                debug(
+                logger.debug(
                     f'Função padrão encontrada: {func.__name__} para a rota {route}'
                 )
                 handler = {
@@ -153,7 +194,7 @@ class ChatbotApp:
         if usercall_name:
             kwargs[usercall_name] = usercall
         if route_state_name:
-            kwargs[route_state_name] = Route(route, list(self.__routes.keys()))
+            kwargs[route_state_name] = Route(route, self.__route_names)
 
         if asyncio.iscoroutinefunction(func):
             usercall_response = await func(**kwargs)
@@ -222,7 +263,7 @@ class ChatbotApp:
 
         if isinstance(usercall_response, RedirectResponse):
             await usercall.set_route(usercall_response.route)
-            await self.process_message(usercall)
+            await self.__route_message(usercall)
             return
 
         if not usercall_response:
@@ -235,5 +276,5 @@ class ChatbotApp:
             await self.__process_func_response(response, usercall, route=route)
             return
 
-        error('Tipo de retorno inválido!')
+        logger.error('Tipo de retorno inválido!')
         return None
@@ -1,9 +1,9 @@
 
 import inspect
 from functools import wraps
-from logging import debug
 
 from ..error.chatbot_error import ChatbotError
+from ..logger.logger import logger
 
 
 class ChatbotRouter:
@@ -55,7 +55,7 @@ class ChatbotRouter:
                     else 'Any'
                 )
                 params[param_type] = name
-                debug(f'Parameter: {name}, Type: {param_type}')
+                logger.debug(f'Parameter: {name}, Type: {param_type}')
 
             self.__routes[route_name] = {
                 'function': func,
@@ -1,3 +1,4 @@
+from ..logger.logger import logger
 from ..types.usercall import UserCall
 from ..models.message import Message, Button
 from ..types.end_types import (
@@ -18,7 +19,7 @@ async def voltar(route: Route, userCall: UserCall) -> RedirectResponse:
     """
 
     previous = route.get_previous()
-    userCall.console.print(
-        f"Voltando rota. ({route.current}) -> ({previous.current})", style="bold yellow"
+    logger.debug(
+        "Voltando rota. (%s) -> (%s)", route.current, previous.current
     )
     return RedirectResponse(previous.current_node)
@@ -0,0 +1,185 @@
+"""
+Supervisor de processos worker do chatbot.
+
+Este módulo contém o WorkerSupervisor, que cria N processos worker via
+fork, reinicia workers que terminam inesperadamente e propaga sinais de
+encerramento para que cada worker finalize de forma graciosa.
+"""
+
+import multiprocessing
+import multiprocessing.connection
+import signal
+import time
+from collections import deque
+from typing import Callable, Optional
+
+from ..logger.logger import logger
+
+# Tempo, além da drenagem, para o worker fechar os clientes AMQP e HTTP
+CLEANUP_MARGIN = 10.0
+
+
+class WorkerSupervisor:
+    """
+    Gerencia um conjunto de processos worker criados via fork.
+
+    O estado do processo pai (rotas registradas, configurações) é herdado
+    pelos workers em copy-on-write, então cada worker só precisa abrir as
+    próprias conexões (AMQP e HTTP) ao iniciar.
+
+    Attributes:
+        workers: Quantidade de processos worker.
+        max_restarts: Reinícios permitidos dentro de `restart_window`.
+        restart_window: Janela (em segundos) para contagem de reinícios.
+        drain_timeout: Tempo (em segundos) que cada worker aguarda as
+            mensagens em processamento após o SIGTERM.
+        shutdown_timeout: Tempo (em segundos) aguardado para os workers
+            encerrarem após SIGTERM antes de serem finalizados à força.
+            Deve ser maior que `drain_timeout`, para que o worker feche
+            suas conexões após drenar.
+    """
+
+    def __init__(
+        self,
+        target: Callable[[], None],
+        workers: int,
+        max_restarts: int = 10,
+        restart_window: float = 60.0,
+        drain_timeout: float = 30.0,
+        shutdown_timeout: Optional[float] = None,
+    ) -> None:
+        """
+        Inicializa o supervisor.
+
+        Args:
+            target: Função executada em cada worker.
+            workers: Quantidade de processos worker.
+            max_restarts: Reinícios permitidos dentro de `restart_window`.
+            restart_window: Janela (em segundos) para contagem de reinícios.
+            drain_timeout: Prazo de drenagem do consumidor em cada worker.
+            shutdown_timeout: Tempo máximo de espera no encerramento.
+                Padrão: `drain_timeout` + CLEANUP_MARGIN.
+        """
+        if workers < 1:
+            raise ValueError('workers deve ser maior que zero.')
+
+        if shutdown_timeout is None:
+            shutdown_timeout = drain_timeout + CLEANUP_MARGIN
+        if shutdown_timeout <= drain_timeout:
+            raise ValueError(
+                'shutdown_timeout deve ser maior que drain_timeout.'
+            )
+
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError(
+                'Modo multi-processo requer suporte a fork nesta plataforma.'
+            )
+
+        self.workers = workers
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.drain_timeout = drain_timeout
+        self.shutdown_timeout = shutdown_timeout
+        self.__target = target
+        self.__context = multiprocessing.get_context('fork')
+        self.__processes: dict[int, multiprocessing.Process] = {}
+        self.__restarts: deque[float] = deque()
+        self.__stopping = False
+
+    def run(self) -> None:
+        """
+        Inicia os workers e supervisiona até receber SIGTERM/SIGINT.
+
+        Raises:
+            RuntimeError: Se os workers reiniciarem mais que `max_restarts`
+            vezes dentro de `restart_window`.
+        """
+        previous = {
+            sig: signal.signal(sig, self.__handle_signal)
+            for sig in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for slot in range(self.workers):
+                self.__spawn(slot)
+
+            while not self.__stopping:
+                sentinels = [p.sentinel for p in self.__processes.values()]
+                multiprocessing.connection.wait(sentinels, timeout=1.0)
+                self.__reap()
+        finally:
+            self.__shutdown()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def __spawn(self, slot: int) -> None:
+        """Cria o processo worker para a posição `slot`."""
+        process = self.__context.Process(
+            target=self.__bootstrap,
+            name=f'chatgraph-worker-{slot}',
+            daemon=False,
+        )
+        process.start()
+        self.__processes[slot] = process
+        logger.info(f'Worker {slot} iniciado (pid={process.pid})')
+
+    def __bootstrap(self) -> None:
+        """Ponto de entrada do worker, executado após o fork."""
+        # O pai coordena o Ctrl+C; o worker encerra apenas via SIGTERM
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        self.__target()
+
+    def __reap(self) -> None:
+        """Reinicia workers que terminaram fora de um encerramento."""
+        for slot, process in list(self.__processes.items()):
+            if process.is_alive() or self.__stopping:
+                continue
+
+            logger.warning(
+                f'Worker {slot} (pid={process.pid}) terminou com código '
+                f'{process.exitcode}'
+            )
+            del self.__processes[slot]
+            process.close()
+            self.__check_restart_rate()
+            self.__spawn(slot)
+
+    def __check_restart_rate(self) -> None:
+        """Garante que os reinícios não excedam o limite configurado."""
+        now = time.monotonic()
+        self.__restarts.append(now)
+        while self.__restarts[0] < now - self.restart_window:
+            self.__restarts.popleft()
+
+        if len(self.__restarts) > self.max_restarts:
+            raise RuntimeError(
+                f'Workers reiniciados {len(self.__restarts)} vezes em '
+                f'{self.restart_window}s. Encerrando supervisor.'
+            )
+
+    def __handle_signal(self, signum, frame) -> None:
+        """Marca o supervisor para encerramento."""
+        logger.info(
+            f'Sinal {signal.Signals(signum).name} recebido, encerrando.'
+        )
+        self.__stopping = True
+
+    def __shutdown(self) -> None:
+        """Propaga SIGTERM aos workers e aguarda o encerramento."""
+        self.__stopping = True
+        processes = [p for p in self.__processes.values() if p.is_alive()]
+        for process in processes:
+            process.terminate()
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for process in processes:
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                logger.error(
+                    f'Worker pid={process.pid} não encerrou a tempo, '
+                    'finalizando à força.'
+                )
+                process.kill()
+                process.join()
+
+        self.__processes.clear()
@@ -2,9 +2,9 @@ import typer
 from rich.console import Console
 from rich.table import Table
 from dotenv import load_dotenv
-from ..gRPC.gRPCCall import WhatsappServiceClient, UserStateServiceClient
-import os, re
+import importlib, os, re, sys
 
+# O gRPC é importado apenas nos comandos que o usam: `run` não depende dele
 load_dotenv()
 app = typer.Typer()
 
@@ -46,6 +46,8 @@ def configs():
 @app.command()
 def campaigns(regex: str = typer.Option(None, "--regex", "-r", help="Filtro regex para campanhas.")):
     """Recupera as campanhas cadastradas."""
+    from ..gRPC.gRPCCall import WhatsappServiceClient
+
     grpc = os.getenv('GRPC_URI')
     
     wwp = WhatsappServiceClient(grpc)
@@ -76,6 +78,8 @@ def tabulations(
     regex: str = typer.Option(None, "--regex", "-r", help="Filtro regex para as tabulações.")
 ):
     """Recupera as tabulações cadastradas."""
+    from ..gRPC.gRPCCall import WhatsappServiceClient
+
     grpc = os.getenv('GRPC_URI')
     
     wwp = WhatsappServiceClient(grpc)
@@ -124,6 +128,8 @@ def user_state(
     regex: str = typer.Option(None, "--regex", "-r", help="Filtro regex para os estados do usuário.")
 ):
     """Recupera os UserState em operação no momento."""
+    from ..gRPC.gRPCCall import UserStateServiceClient
+
     grpc = os.getenv('GRPC_URI')
     
     ustate = UserStateServiceClient(grpc)
@@ -169,6 +175,8 @@ def user_state(
 @app.command("del-ustate")
 def delete_user_state(user_id: str = typer.Argument(..., help="ID do UserState a ser deletado.")):
     """Deleta um UserState em operação no momento."""
+    from ..gRPC.gRPCCall import UserStateServiceClient
+
     grpc = os.getenv('GRPC_URI')
     
     ustate = UserStateServiceClient(grpc)
@@ -183,5 +191,23 @@ def delete_user_state(user_id: str = typer.Argument(..., help="ID do UserState a
     except Exception as e:
         typer.echo(f"Erro ao tentar deletar UserState: {e}", err=True)
     
+@app.command()
+def run(
+    app_path: str = typer.Argument(
+        ..., help="Aplicação no formato 'modulo:variavel'."
+    ),
+    workers: int = typer.Option(
+        1, "--workers", "-w", help="Quantidade de processos worker."
+    ),
+):
+    """Inicia um ChatbotApp, opcionalmente com múltiplos processos worker."""
+    module_name, _, attr = app_path.partition(":")
+    sys.path.insert(0, os.getcwd())
+
+    module = importlib.import_module(module_name)
+    chatbot = getattr(module, attr or "app")
+    chatbot.start(workers=workers)
+
+
 def main():
     app()
@@ -1,4 +1,141 @@
+"""
+Pipeline de logging do chatgraph.
+
+Os registros são colocados em uma fila (QueueHandler) e escritos por uma
+thread em segundo plano (QueueListener), de modo que o event loop nunca
+bloqueia em escrita no terminal. Todos os componentes compartilham um
+único `Console` do rich.
+
+Configuração por variáveis de ambiente:
+    CHATGRAPH_LOG_LEVEL: Nível mínimo (padrão: WARNING)
+    CHATGRAPH_LOG_SAMPLING: Amostragem por nível, ex: "DEBUG=0.01,INFO=0.1"
+"""
+
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import random
+from typing import Optional
+
+from rich.console import Console
+from rich.logging import RichHandler
 
 logger_httpx = logging.getLogger('httpx')
 logger_httpx.setLevel(logging.ERROR)
+
+console = Console()
+logger = logging.getLogger('chatgraph')
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_settings: tuple = (None, None)
+_paused = False
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Descarta uma fração dos registros de cada nível.
+
+    Attributes:
+        rates: Fração (0 a 1) de registros mantidos por nível numérico.
+    """
+
+    def __init__(self, rates: dict[int, float]) -> None:
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        rate = self.rates.get(record.levelno, 1.0)
+        return rate >= 1.0 or random.random() < rate
+
+
+def _parse_sampling(value: str) -> dict[int, float]:
+    """Converte "DEBUG=0.01,INFO=0.1" em {10: 0.01, 20: 0.1}."""
+    rates = {}
+    for item in value.split(','):
+        if '=' not in item:
+            continue
+        name, rate = item.split('=', 1)
+        level = logging.getLevelName(name.strip().upper())
+        if isinstance(level, int):
+            rates[level] = float(rate)
+    return rates
+
+
+def _stop_listener() -> None:
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def configure_logging(
+    level: Optional[str | int] = None,
+    sampling: Optional[dict[str, float]] = None,
+) -> None:
+    """
+    Configura (ou reconfigura) o logger 'chatgraph'.
+
+    Args:
+        level: Nível mínimo. Padrão: CHATGRAPH_LOG_LEVEL ou WARNING.
+        sampling: Fração de registros mantidos por nível,
+            ex: {'DEBUG': 0.01}. Padrão: CHATGRAPH_LOG_SAMPLING.
+    """
+    global _listener, _settings
+    _stop_listener()
+
+    if level is None:
+        level = os.getenv('CHATGRAPH_LOG_LEVEL', 'WARNING')
+    if isinstance(level, str):
+        level = level.strip().upper()
+
+    if sampling is None:
+        rates = _parse_sampling(os.getenv('CHATGRAPH_LOG_SAMPLING', ''))
+    else:
+        rates = {
+            logging.getLevelName(name.upper()): rate
+            for name, rate in sampling.items()
+        }
+    _settings = (
+        level,
+        {logging.getLevelName(lvl): rate for lvl, rate in rates.items()},
+    )
+
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(records)
+    if rates:
+        queue_handler.addFilter(SamplingFilter(rates))
+
+    writer = RichHandler(console=console, show_path=False)
+    _listener = logging.handlers.QueueListener(
+        records, writer, respect_handler_level=True
+    )
+    _listener.start()
+
+    logger.handlers = [queue_handler]
+    logger.setLevel(level)
+    logger.propagate = False
+
+
+def _pause_before_fork() -> None:
+    """Para a thread de escrita para que o fork não a copie no meio de I/O."""
+    global _paused
+    _paused = _listener is not None
+    _stop_listener()
+
+
+def _resume_after_fork() -> None:
+    """Recria a thread de escrita no pai e no filho após o fork."""
+    if _paused:
+        configure_logging(*_settings)
+
+
+configure_logging()
+atexit.register(_stop_listener)
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(
+        before=_pause_before_fork,
+        after_in_parent=_resume_after_fork,
+        after_in_child=_resume_after_fork,
+    )
@@ -0,0 +1,76 @@
+"""
+Decodificadores JSON para o corpo das entregas.
+
+Os decodificadores recebem os bytes (ou memoryview) da entrega diretamente,
+sem passar por `bytes.decode()`. Quando disponíveis, `orjson` ou `msgspec`
+são usados; caso contrário, o módulo `json` da biblioteca padrão.
+"""
+
+import json
+from typing import Any, Callable
+
+Decoder = Callable[[bytes | bytearray | memoryview], Any]
+
+DECODERS = ('orjson', 'msgspec', 'json')
+
+
+def _stdlib_decoder() -> Decoder:
+    def decode(body: bytes | bytearray | memoryview) -> Any:
+        # json.loads aceita bytes, mas não memoryview
+        if isinstance(body, memoryview):
+            body = body.tobytes()
+        return json.loads(body)
+
+    return decode
+
+
+def _orjson_decoder() -> Decoder:
+    import orjson
+
+    return orjson.loads
+
+
+def _msgspec_decoder() -> Decoder:
+    import msgspec
+
+    return msgspec.json.Decoder().decode
+
+
+_FACTORIES: dict[str, Callable[[], Decoder]] = {
+    'orjson': _orjson_decoder,
+    'msgspec': _msgspec_decoder,
+    'json': _stdlib_decoder,
+}
+
+
+def get_decoder(name: str = 'auto') -> Decoder:
+    """
+    Retorna o decodificador JSON solicitado.
+
+    Args:
+        name: 'auto', 'orjson', 'msgspec' ou 'json'. Em 'auto', usa o
+            primeiro disponível nessa ordem.
+
+    Returns:
+        Função que converte o corpo da entrega em objetos Python.
+
+    Raises:
+        ValueError: Se o nome for desconhecido.
+        ImportError: Se o decodificador solicitado não estiver instalado.
+    """
+    name = (name or 'auto').strip().lower()
+
+    if name == 'auto':
+        for candidate in DECODERS:
+            try:
+                return _FACTORIES[candidate]()
+            except ImportError:
+                continue
+
+    if name not in _FACTORIES:
+        raise ValueError(
+            f'Decodificador JSON inválido: {name}. '
+            f'Opções: auto, {", ".join(DECODERS)}'
+        )
+
+    return _FACTORIES[name]()
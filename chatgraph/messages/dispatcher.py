@@ -0,0 +1,98 @@
+"""
+Despacho de mensagens particionado por chat.
+
+Este módulo contém o ChatDispatcher, responsável por executar os
+handlers de mensagens de forma concorrente entre chats diferentes,
+mantendo a ordem estrita de processamento dentro de um mesmo chat.
+"""
+
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+from ..logger.logger import logger
+
+Job = Callable[[], Awaitable[Any]]
+
+
+class ChatDispatcher:
+    """
+    Despachante de tarefas particionado por chave (chat).
+
+    Cada chave possui uma fila FIFO própria e no máximo um worker ativo,
+    garantindo que as tarefas de um mesmo chat sejam executadas em ordem.
+    Chats diferentes são processados em paralelo, limitados por
+    `max_concurrency` tarefas em execução simultânea.
+
+    Attributes:
+        max_concurrency: Número máximo de tarefas executando ao mesmo tempo.
+    """
+
+    def __init__(self, max_concurrency: int = 1) -> None:
+        """
+        Inicializa o despachante.
+
+        Args:
+            max_concurrency: Limite de tarefas concorrentes entre chats.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency deve ser maior que zero.')
+
+        self.max_concurrency = max_concurrency
+        self.__semaphore = asyncio.Semaphore(max_concurrency)
+        self.__queues: dict[Hashable, deque[Job]] = {}
+        self.__workers: dict[Hashable, asyncio.Task] = {}
+        self.__pending = 0
+        self.__idle = asyncio.Event()
+        self.__idle.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Quantidade de tarefas enfileiradas ou em execução."""
+        return self.__pending
+
+    @property
+    def active_chats(self) -> int:
+        """Quantidade de chats com tarefas pendentes."""
+        return len(self.__workers)
+
+    def submit(self, key: Hashable, job: Job) -> None:
+        """
+        Agenda uma tarefa para o chat identificado por `key`.
+
+        Args:
+            key: Chave de particionamento (ex: user_id + company_id).
+            job: Função sem argumentos que retorna um awaitable.
+        """
+        queue = self.__queues.setdefault(key, deque())
+        queue.append(job)
+        self.__pending += 1
+        self.__idle.clear()
+
+        if key not in self.__workers:
+            self.__workers[key] = asyncio.create_task(self.__drain(key))
+
+    async def join(self) -> None:
+        """Aguarda até que todas as tarefas agendadas sejam concluídas."""
+        await self.__idle.wait()
+
+    async def __drain(self, key: Hashable) -> None:
+        """Executa, em ordem, as tarefas enfileiradas para uma chave."""
+        queue = self.__queues[key]
+        try:
+            while queue:
+                job = queue.popleft()
+                try:
+                    async with self.__semaphore:
+                        await job()
+                except Exception as e:
+                    logger.error(f'Erro ao executar tarefa do chat {key}: {e}')
+                finally:
+                    self.__pending -= 1
+        finally:
+            # Tarefas não executadas (ex: worker cancelado) saem da contagem
+            self.__pending -= len(queue)
+            del self.__queues[key]
+            del self.__workers[key]
+            if not self.__pending:
+                self.__idle.set()
@@ -1,20 +1,51 @@
-import json
-from logging import info
+import asyncio
 import os
-import aio_pika
+import signal
+import time
+from collections import deque
+from dataclasses import dataclass
 from typing import Callable
+
+import aio_pika
 from ..auth.credentials import Credential
+from ..logger.logger import console, logger
 from ..models.message import Message
-from ..models.userstate import UserState
+from ..models.userstate import ChatID, UserState
+from ..services.backoff import ExponentialBackoff
+from ..services.concurrency import AdaptiveConcurrencyLimiter
+from ..services.deadline import Deadline
+from ..services.downloads import close_download_client
+from ..services.file_cache import FileCache
+from ..services.rate_limiter import KeyedRateLimiter
+from ..services.resilience import CircuitBreaker, RetryPolicy
 from ..services.router_http_client import RouterHTTPClient
+from ..services.session_writer import SessionStateWriter
 from ..types.usercall import UserCall
-from rich.console import Console
+from .decoder import get_decoder
+from .dispatcher import ChatDispatcher
+from .prefetch import AdaptivePrefetch
 from rich.table import Table
 from rich.text import Text
 from rich.panel import Panel
 from urllib.parse import quote
 
 
+@dataclass
+class ConsumerStats:
+    """
+    Contadores de saúde do consumidor.
+
+    Attributes:
+        reconnects: Quantidade de reconexões realizadas
+        disconnected_seconds: Tempo total (em segundos) sem consumir a fila
+        last_error: Última falha observada no consumo
+    """
+
+    reconnects: int = 0
+    disconnected_seconds: float = 0.0
+    last_error: str = ''
+
+
 class MessageConsumer:
     def __init__(
         self,
@@ -25,15 +56,92 @@ class MessageConsumer:
         queue_consume: str,
         prefetch_count: int = 1,
         virtual_host: str = '/',
+        max_concurrency: int | None = None,
+        backoff: ExponentialBackoff | None = None,
+        max_restarts: int = 20,
+        restart_window: float = 300.0,
+        drain_timeout: float = 30.0,
+        adaptive_prefetch: AdaptivePrefetch | None = None,
+        decoder: str = 'auto',
+        lazy_models: bool = False,
+        send_rate_limiter: KeyedRateLimiter | None = None,
+        write_behind: bool = True,
+        preload_end_actions: list[str] | None = None,
+        file_cache: FileCache | None = None,
+        upload_by_url: bool = False,
+        pipeline_sends: bool = False,
+        send_batch_endpoint: str | None = None,
+        send_batch_size: int = 50,
+        send_batch_delay: float = 0.005,
+        router_max_connections: int | None = 100,
+        router_max_keepalive: int | None = 20,
+        router_keepalive_expiry: float | None = 5.0,
+        router_http2: bool = False,
+        router_retry_policy: RetryPolicy | None = None,
+        router_circuit_breaker: CircuitBreaker | None = None,
+        router_balance_strategy: str = 'p2c',
+        router_timeouts: dict[str, float] | None = None,
+        message_ttl: float | None = 300.0,
+        router_concurrency_limiter: AdaptiveConcurrencyLimiter | None = None,
     ) -> None:
         self.__virtual_host = virtual_host
         self.__prefetch_count = prefetch_count
+        self.__max_concurrency = max_concurrency or prefetch_count
         self.__queue_consume = queue_consume
         self.__amqp_url = amqp_url
         self.__router_url = router_url
         self.__router_token = router_token
         self.__credentials = credential
         self.__router_client = None
+        self.__state_writer: SessionStateWriter | None = None
+        self.__backoff = backoff or ExponentialBackoff()
+        self.__max_restarts = max_restarts
+        self.__restart_window = restart_window
+        self.__stats = ConsumerStats()
+        self.__attempt = 0
+        self.__disconnected_at: float | None = None
+        self.__drain_timeout = drain_timeout
+        self.__dispatcher: ChatDispatcher | None = None
+        self.__queue_iter: aio_pika.abc.AbstractQueueIterator | None = None
+        self.__stop_event = asyncio.Event()
+        self.__stop_task: asyncio.Task | None = None
+        self.__decode = get_decoder(decoder)
+        self.__lazy_models = lazy_models
+        self.__send_rate_limiter = send_rate_limiter
+        self.__write_behind = write_behind
+        self.__preload_end_actions = preload_end_actions or []
+        self.__file_cache = file_cache
+        self.__upload_by_url = upload_by_url
+        self.__pipeline_sends = pipeline_sends
+        self.__send_batch_endpoint = send_batch_endpoint
+        self.__send_batch_size = send_batch_size
+        self.__send_batch_delay = send_batch_delay
+        self.__router_max_connections = router_max_connections
+        self.__router_max_keepalive = router_max_keepalive
+        self.__router_keepalive_expiry = router_keepalive_expiry
+        self.__router_http2 = router_http2
+        self.__router_retry_policy = router_retry_policy
+        self.__router_circuit_breaker = router_circuit_breaker
+        self.__router_balance_strategy = router_balance_strategy
+        self.__router_timeouts = router_timeouts
+        self.__message_ttl = message_ttl
+        self.__router_concurrency_limiter = router_concurrency_limiter
+        self.__adaptive_prefetch = adaptive_prefetch
+        if adaptive_prefetch is not None:
+            self.__prefetch_count = adaptive_prefetch.current
+            # O prefetch só limita a concorrência se o despachante couber
+            # a janela máxima; senão, um prefetch maior apenas enfileira
+            if max_concurrency is None:
+                self.__max_concurrency = adaptive_prefetch.max_prefetch
+            elif max_concurrency < adaptive_prefetch.max_prefetch:
+                logger.warning(
+                    f'RABBIT_CONCURRENCY ({max_concurrency}) menor que o '
+                    f'prefetch máximo ({adaptive_prefetch.max_prefetch}): '
+                    'o prefetch adaptativo acima disso só aumenta a fila.'
+                )
+            # A janela de prefetch é limitada pelo TTL real das mensagens
+            if message_ttl:
+                adaptive_prefetch.message_ttl = message_ttl
 
     @classmethod
     def load_dotenv(
@@ -46,6 +154,37 @@ class MessageConsumer:
         vhost_env: str = 'RABBIT_VHOST',
         router_env: str = 'ROUTER_URL',
         router_token_env: str = 'ROUTER_TOKEN',
+        concurrency_env: str = 'RABBIT_CONCURRENCY',
+        adaptive_env: str = 'RABBIT_PREFETCH_ADAPTIVE',
+        prefetch_min_env: str = 'RABBIT_PREFETCH_MIN',
+        prefetch_max_env: str = 'RABBIT_PREFETCH_MAX',
+        decoder_env: str = 'CHATGRAPH_JSON_DECODER',
+        lazy_models_env: str = 'CHATGRAPH_LAZY_MODELS',
+        send_rate_env: str = 'CHATGRAPH_SEND_RATE',
+        send_burst_env: str = 'CHATGRAPH_SEND_BURST',
+        send_scope_env: str = 'CHATGRAPH_SEND_RATE_SCOPE',
+        write_behind_env: str = 'CHATGRAPH_WRITE_BEHIND',
+        preload_end_actions_env: str = 'CHATGRAPH_END_ACTIONS_PRELOAD',
+        file_cache_env: str = 'CHATGRAPH_FILE_CACHE_PATH',
+        file_revalidate_env: str = 'CHATGRAPH_FILE_REVALIDATE_AFTER',
+        upload_by_url_env: str = 'CHATGRAPH_UPLOAD_BY_URL',
+        pipeline_sends_env: str = 'CHATGRAPH_PIPELINE_SENDS',
+        send_batch_endpoint_env: str = 'CHATGRAPH_SEND_BATCH_ENDPOINT',
+        send_batch_size_env: str = 'CHATGRAPH_SEND_BATCH_SIZE',
+        send_batch_delay_env: str = 'CHATGRAPH_SEND_BATCH_DELAY',
+        router_max_connections_env: str = 'ROUTER_MAX_CONNECTIONS',
+        router_max_keepalive_env: str = 'ROUTER_MAX_KEEPALIVE',
+        router_keepalive_expiry_env: str = 'ROUTER_KEEPALIVE_EXPIRY',
+        router_http2_env: str = 'ROUTER_HTTP2',
+        router_retry_attempts_env: str = 'ROUTER_RETRY_ATTEMPTS',
+        router_breaker_threshold_env: str = 'ROUTER_BREAKER_THRESHOLD',
+        router_breaker_reset_env: str = 'ROUTER_BREAKER_RESET',
+        router_balance_env: str = 'ROUTER_BALANCE_STRATEGY',
+        router_timeouts_env: str = 'ROUTER_TIMEOUTS',
+        message_ttl_env: str = 'CHATGRAPH_MESSAGE_TTL',
+        router_adaptive_concurrency_env: str = 'ROUTER_ADAPTIVE_CONCURRENCY',
+        router_concurrency_max_env: str = 'ROUTER_CONCURRENCY_MAX',
+        router_concurrency_queue_env: str = 'ROUTER_CONCURRENCY_QUEUE',
     ) -> 'MessageConsumer':
         username = os.getenv(user_env)
         password = os.getenv(pass_env)
@@ -55,6 +194,31 @@ class MessageConsumer:
         vhost = os.getenv(vhost_env, '/')
         router_url = os.getenv(router_env)
         router_token = os.getenv(router_token_env)
+        concurrency = os.getenv(concurrency_env)
+        adaptive = os.getenv(adaptive_env, 'false').lower() in ('1', 'true')
+        lazy_models = os.getenv(lazy_models_env, 'false').lower() in (
+            '1',
+            'true',
+        )
+        write_behind = os.getenv(write_behind_env, 'true').lower() in (
+            '1',
+            'true',
+        )
+        upload_by_url = os.getenv(upload_by_url_env, 'false').lower() in (
+            '1',
+            'true',
+        )
+        pipeline_sends = os.getenv(pipeline_sends_env, 'false').lower() in (
+            '1',
+            'true',
+        )
+        router_http2 = os.getenv(router_http2_env, 'false').lower() in (
+            '1',
+            'true',
+        )
+        router_adaptive_concurrency = os.getenv(
+            router_adaptive_concurrency_env, 'false'
+        ).lower() in ('1', 'true')
 
         envs_essentials = {
             username: user_env,
@@ -71,6 +235,46 @@ class MessageConsumer:
                 f'Corrija as variáveis de ambiente: {envs_missing}'
             )
 
+        adaptive_prefetch = None
+        if adaptive:
+            adaptive_prefetch = AdaptivePrefetch(
+                min_prefetch=int(os.getenv(prefetch_min_env, '1')),
+                max_prefetch=int(os.getenv(prefetch_max_env, '200')),
+                current=int(prefetch),
+            )
+
+        file_cache_path = os.getenv(file_cache_env)
+        file_revalidate_after = os.getenv(file_revalidate_env)
+        file_cache = None
+        if file_cache_path or file_revalidate_after:
+            file_cache = FileCache(
+                path=file_cache_path or None,
+                revalidate_after=float(file_revalidate_after or '300'),
+            )
+
+        router_max_connections = int(
+            os.getenv(router_max_connections_env, '100')
+        )
+        router_concurrency_limiter = None
+        if router_adaptive_concurrency:
+            max_limit = int(
+                os.getenv(router_concurrency_max_env) or router_max_connections
+            )
+            router_concurrency_limiter = AdaptiveConcurrencyLimiter(
+                initial_limit=min(20, max_limit),
+                max_limit=max_limit,
+                max_queue=int(os.getenv(router_concurrency_queue_env, '1000')),
+            )
+
+        send_rate = os.getenv(send_rate_env)
+        send_rate_limiter = None
+        if send_rate:
+            send_rate_limiter = KeyedRateLimiter(
+                rate=float(send_rate),
+                burst=int(os.getenv(send_burst_env, '1')),
+                scope=os.getenv(send_scope_env, 'chat'),
+            )
+
         return cls(
             credential=Credential(username=username, password=password),
             amqp_url=url,
@@ -79,114 +283,493 @@ class MessageConsumer:
             virtual_host=vhost,
             router_url=router_url,
             router_token=router_token,
+            max_concurrency=int(concurrency) if concurrency else None,
+            adaptive_prefetch=adaptive_prefetch,
+            decoder=os.getenv(decoder_env, 'auto'),
+            lazy_models=lazy_models,
+            send_rate_limiter=send_rate_limiter,
+            write_behind=write_behind,
+            preload_end_actions=[
+                name.strip()
+                for name in os.getenv(preload_end_actions_env, '').split(',')
+                if name.strip()
+            ],
+            file_cache=file_cache,
+            upload_by_url=upload_by_url,
+            pipeline_sends=pipeline_sends,
+            send_batch_endpoint=os.getenv(send_batch_endpoint_env) or None,
+            send_batch_size=int(os.getenv(send_batch_size_env, '50')),
+            send_batch_delay=float(os.getenv(send_batch_delay_env, '0.005')),
+            router_max_connections=router_max_connections,
+            router_max_keepalive=int(
+                os.getenv(router_max_keepalive_env, '20')
+            ),
+            router_keepalive_expiry=float(
+                os.getenv(router_keepalive_expiry_env, '5')
+            ),
+            router_http2=router_http2,
+            router_retry_policy=RetryPolicy(
+                attempts=int(os.getenv(router_retry_attempts_env, '3'))
+            ),
+            router_circuit_breaker=CircuitBreaker(
+                failure_threshold=int(
+                    os.getenv(router_breaker_threshold_env, '5')
+                ),
+                reset_timeout=float(
+                    os.getenv(router_breaker_reset_env, '10')
+                ),
+            ),
+            router_balance_strategy=os.getenv(router_balance_env, 'p2c'),
+            router_timeouts={
+                operation.strip(): float(timeout)
+                for operation, _, timeout in (
+                    item.partition('=')
+                    for item in os.getenv(router_timeouts_env, '').split(',')
+                    if item.strip()
+                )
+            },
+            message_ttl=float(os.getenv(message_ttl_env, '300')) or None,
+            router_concurrency_limiter=router_concurrency_limiter,
         )
 
     async def __initialize_router(self) -> RouterHTTPClient:
         """Inicializa o cliente HTTP apenas uma vez (singleton)."""
         if self.__router_client is None:
+            # Várias réplicas podem ser informadas separadas por vírgula
+            router_urls = [
+                url.strip() for url in self.__router_url.split(',')
+            ]
             self.__router_client = RouterHTTPClient(
-                base_url=self.__router_url,
+                base_url=[url for url in router_urls if url],
                 username='chatgraph',
                 password=self.__router_token,
+                batch_endpoint=self.__send_batch_endpoint,
+                batch_size=self.__send_batch_size,
+                batch_delay=self.__send_batch_delay,
+                max_connections=self.__router_max_connections,
+                max_keepalive_connections=self.__router_max_keepalive,
+                keepalive_expiry=self.__router_keepalive_expiry,
+                http2=self.__router_http2,
+                retry_policy=self.__router_retry_policy,
+                circuit_breaker=self.__router_circuit_breaker,
+                balance_strategy=self.__router_balance_strategy,
+                timeouts=self.__router_timeouts,
+                concurrency_limiter=self.__router_concurrency_limiter,
             )
+            self.__state_writer = SessionStateWriter(self.__router_client)
         return self.__router_client
 
+    @property
+    def state_writer(self) -> SessionStateWriter | None:
+        """Escritor de observações (e suas métricas), após a conexão."""
+        return self.__state_writer
+
+    @property
+    def stats(self) -> 'ConsumerStats':
+        """Contadores de reconexão do consumidor."""
+        return self.__stats
+
+    @property
+    def send_rate_limiter(self) -> KeyedRateLimiter | None:
+        """Limitador de envio (e suas métricas), se configurado."""
+        return self.__send_rate_limiter
+
+    @property
+    def in_flight(self) -> int:
+        """Quantidade de mensagens recebidas e ainda não confirmadas."""
+        if self.__dispatcher is None:
+            return 0
+        return self.__dispatcher.in_flight
+
+    @property
+    def drain_timeout(self) -> float:
+        """Prazo para drenar as mensagens em processamento no stop()."""
+        return self.__drain_timeout
+
+    @property
+    def stopping(self) -> bool:
+        """Indica se o encerramento do consumidor foi solicitado."""
+        return self.__stop_event.is_set()
+
+    async def stop(self) -> None:
+        """
+        Solicita o encerramento gracioso do consumidor.
+
+        Cancela o consumer da fila (mensagens ainda não entregues ao handler
+        voltam para a fila), aguarda até `drain_timeout` segundos as
+        mensagens em processamento serem confirmadas e fecha o
+        RouterHTTPClient.
+        """
+        self.__stop_event.set()
+        if self.__queue_iter is not None:
+            await self.__queue_iter.close()
+
+    def __on_sigterm(self) -> None:
+        logger.info('SIGTERM recebido, drenando mensagens em processamento.')
+        self.__stop_task = asyncio.create_task(self.stop())
+
     async def start_consume(self, process_message: Callable):
-        try:
-            # Inicializar cliente HTTP uma única vez
-            await self.__initialize_router()
+        """
+        Consome a fila de forma supervisionada.
+
+        Em caso de falha, a conexão, o canal e a fila são recriados após
+        um atraso exponencial com jitter. Se o número de reinícios exceder
+        `max_restarts` dentro de `restart_window`, o erro é propagado.
+
+        Args:
+            process_message: Função chamada para cada mensagem recebida.
 
-            user = quote(self.__credentials.username)
-            pwd = quote(self.__credentials.password)
-            vhost = quote(self.__virtual_host)
-            uri = self.__amqp_url
-            amqp_url = f'amqp://{user}:{pwd}@{uri}/{vhost}'
-            connection = await aio_pika.connect_robust(amqp_url)
+        Raises:
+            RuntimeError: Se o limite de reinícios for excedido.
+        """
+        # Inicializar cliente HTTP uma única vez
+        router_client = await self.__initialize_router()
+        if self.__preload_end_actions:
+            await router_client.preload_end_actions(
+                self.__preload_end_actions
+            )
+        dispatcher = ChatDispatcher(self.__max_concurrency)
+        self.__dispatcher = dispatcher
+        self.__stop_event.clear()
+        restarts: deque[float] = deque()
 
-            async with connection:
-                channel = await connection.channel()
-                await channel.set_qos(prefetch_count=self.__prefetch_count)
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.__on_sigterm)
+        except (NotImplementedError, RuntimeError):
+            # Plataformas sem suporte a sinais no loop (ex: Windows)
+            pass
 
+        try:
+            while not self.__stop_event.is_set():
                 try:
-                    queue = await channel.declare_queue(
-                        self.__queue_consume, passive=True
-                    )
-                except aio_pika.exceptions.ChannelNotFoundEntity:
-                    # O broker fecha o canal após erro AMQP 404 — reabrir antes de declarar
-                    channel = await connection.channel()
-                    await channel.set_qos(prefetch_count=self.__prefetch_count)
-                    arguments = {
-                        'x-dead-letter-exchange': 'log_error',  # Dead Letter Exchange
-                        'x-expires': 86400000,  # Expiração da fila (em milissegundos)
-                        'x-message-ttl': 300000,  # Tempo de vida das mensagens (em milissegundos)
-                    }
-                    queue = await channel.declare_queue(
-                        self.__queue_consume,
-                        durable=True,
-                        arguments=arguments,
-                    )
-                    routing_key = f'chatbot.{self.__queue_consume}'
-                    await queue.bind(
-                        exchange=self.__virtual_host,
-                        routing_key=routing_key,
-                    )
+                    await self.__consume(dispatcher, process_message)
+                    if self.__stop_event.is_set():
+                        break
+                    logger.warning('Consumo da fila finalizado pelo broker.')
+                    self.__stats.last_error = 'consumo finalizado'
+                except Exception as e:
+                    logger.error(f'Erro durante o consumo de mensagens: {e}')
+                    self.__stats.last_error = str(e)
+                    if self.__stop_event.is_set():
+                        break
 
-                info('[x] Server inicializado! Aguardando solicitações RPC')
+                now = time.monotonic()
+                if self.__disconnected_at is None:
+                    self.__disconnected_at = now
 
-                async for message in queue:
-                    async with message.process():
-                        await self.on_request(message.body, process_message)
+                restarts.append(now)
+                while restarts[0] < now - self.__restart_window:
+                    restarts.popleft()
+                if len(restarts) > self.__max_restarts:
+                    raise RuntimeError(
+                        f'Consumidor reiniciado {len(restarts)} vezes em '
+                        f'{self.__restart_window}s: '
+                        f'{self.__stats.last_error}'
+                    )
 
-        except Exception as e:
-            print(f'Erro durante o consumo de mensagens: {e}')
-            # Reiniciar a conexão em caso de falha
-            # await self.start_consume(process_message)
+                delay = self.__backoff.delay(self.__attempt)
+                self.__attempt += 1
+                self.__stats.reconnects += 1
+                logger.info(f'Reconectando ao RabbitMQ em {delay:.2f}s')
+                try:
+                    await asyncio.wait_for(self.__stop_event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
         finally:
+            try:
+                loop.remove_signal_handler(signal.SIGTERM)
+            except (NotImplementedError, RuntimeError):
+                pass
             # Fechar cliente HTTP quando o consumer parar
             await self.cleanup()
 
+    async def __consume(
+        self,
+        dispatcher: ChatDispatcher,
+        process_message: Callable,
+    ) -> None:
+        """Conecta, declara a fila e consome até a conexão cair."""
+        user = quote(self.__credentials.username)
+        pwd = quote(self.__credentials.password)
+        vhost = quote(self.__virtual_host)
+        uri = self.__amqp_url
+        amqp_url = f'amqp://{user}:{pwd}@{uri}/{vhost}'
+        connection = await aio_pika.connect_robust(amqp_url)
+
+        async with connection:
+            queue = await self.__declare_queue(connection)
+
+            # Conexão restabelecida: contabiliza o tempo desconectado
+            if self.__disconnected_at is not None:
+                self.__stats.disconnected_seconds += (
+                    time.monotonic() - self.__disconnected_at
+                )
+                self.__disconnected_at = None
+            self.__attempt = 0
+
+            logger.info('[x] Server inicializado! Aguardando solicitações RPC')
+
+            tuner = None
+            if self.__adaptive_prefetch is not None:
+                tuner = asyncio.create_task(self.__tune_prefetch(queue))
+
+            async with queue.iterator() as queue_iter:
+                self.__queue_iter = queue_iter
+                try:
+                    if self.__stop_event.is_set():
+                        await queue_iter.close()
+
+                    async for message in queue_iter:
+                        self.__dispatch(dispatcher, message, process_message)
+                finally:
+                    self.__queue_iter = None
+                    if tuner is not None:
+                        tuner.cancel()
+
+            # Os acks precisam do canal aberto: drenar antes de desconectar
+            if self.__stop_event.is_set():
+                await self.__drain(dispatcher)
+
+    async def __tune_prefetch(self, queue: aio_pika.abc.AbstractQueue) -> None:
+        """Ajusta periodicamente o prefetch do canal (modo adaptativo)."""
+        controller = self.__adaptive_prefetch
+        loop = asyncio.get_running_loop()
+        router_failures = self.__router_failures()
+
+        while True:
+            started = loop.time()
+            await asyncio.sleep(controller.interval)
+            loop_lag = max(0.0, loop.time() - started - controller.interval)
+
+            # Falhas do roteador também indicam sobrecarga a jusante
+            failures = self.__router_failures()
+            controller.record_errors(failures - router_failures)
+            router_failures = failures
+
+            previous = controller.current
+            # O adjust() reinicia a janela: a taxa precisa ser lida antes
+            error_rate = controller.error_rate
+            current = controller.adjust(
+                min(self.__max_concurrency, previous), loop_lag
+            )
+            if current == previous:
+                continue
+
+            try:
+                await queue.channel.set_qos(prefetch_count=current)
+                self.__prefetch_count = current
+                logger.debug(
+                    f'Prefetch ajustado: {previous} -> {current} '
+                    f'(latência={controller.latency:.3f}s, '
+                    f'erros={error_rate:.1%}, '
+                    f'lag={loop_lag:.3f}s)'
+                )
+            except Exception as e:
+                controller.current = previous
+                logger.warning(f'Erro ao ajustar prefetch: {e}')
+
+    def __router_failures(self) -> int:
+        """Falhas temporárias e recusas do circuito no roteador."""
+        if self.__router_client is None:
+            return 0
+        stats = self.__router_client.resilience_stats
+        return stats.failures + stats.rejected
+
+    async def __drain(self, dispatcher: ChatDispatcher) -> None:
+        """Aguarda as mensagens em processamento até o prazo de drenagem."""
+        logger.info(
+            f'Aguardando {dispatcher.in_flight} mensagens em processamento'
+        )
+        try:
+            await asyncio.wait_for(dispatcher.join(), self.__drain_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f'{dispatcher.in_flight} mensagens não concluídas em '
+                f'{self.__drain_timeout}s serão reentregues pelo broker.'
+            )
+
+    async def __declare_queue(
+        self,
+        connection: aio_pika.abc.AbstractRobustConnection,
+    ) -> aio_pika.abc.AbstractQueue:
+        """Abre o canal e declara (ou cria) a fila de consumo."""
+        channel = await connection.channel()
+        await channel.set_qos(prefetch_count=self.__prefetch_count)
+
+        try:
+            return await channel.declare_queue(
+                self.__queue_consume, passive=True
+            )
+        except aio_pika.exceptions.ChannelNotFoundEntity:
+            pass
+
+        # O broker fecha o canal após erro AMQP 404 — reabrir antes de declarar
+        channel = await connection.channel()
+        await channel.set_qos(prefetch_count=self.__prefetch_count)
+        arguments = {
+            'x-dead-letter-exchange': 'log_error',  # Dead Letter Exchange
+            'x-expires': 86400000,  # Expiração da fila (em milissegundos)
+            'x-message-ttl': 300000,  # Tempo de vida das mensagens (em milissegundos)
+        }
+        queue = await channel.declare_queue(
+            self.__queue_consume,
+            durable=True,
+            arguments=arguments,
+        )
+        routing_key = f'chatbot.{self.__queue_consume}'
+        await queue.bind(
+            exchange=self.__virtual_host,
+            routing_key=routing_key,
+        )
+        return queue
+
+    def __dispatch(
+        self,
+        dispatcher: ChatDispatcher,
+        message: aio_pika.abc.AbstractIncomingMessage,
+        process_message: Callable,
+    ) -> None:
+        """
+        Agenda o processamento de uma entrega no despachante.
+
+        Entregas do mesmo chat são processadas em ordem; chats diferentes
+        rodam em paralelo. Cada entrega é confirmada (ack) somente após a
+        conclusão do seu próprio handler e das escritas de observação do
+        chat.
+        """
+        received = time.monotonic()
+        try:
+            message_json = self.__decode(message.body)
+            key = self.__chat_key(message_json)
+        except Exception as e:
+            logger.error('Erro ao decodificar mensagem: %s', e)
+            message_json, key = None, None
+
+        async def job():
+            ok = True
+            async with message.process():
+                if message_json is not None:
+                    ok = await self.__handle(
+                        message_json,
+                        process_message,
+                        self.__deadline_for(message),
+                    )
+                    if self.__state_writer is not None:
+                        await self.__state_writer.flush(ChatID(*key))
+
+            # Latência da entrega ao ack, incluindo a fila do despachante
+            if self.__adaptive_prefetch is not None:
+                self.__adaptive_prefetch.record(
+                    time.monotonic() - received, ok
+                )
+
+        dispatcher.submit(key, job)
+
+    def __deadline_for(
+        self,
+        message: aio_pika.abc.AbstractIncomingMessage,
+    ) -> Deadline | None:
+        """
+        Calcula o prazo da entrega a partir do TTL da fila e da mensagem.
+
+        O tempo já decorrido desde a publicação (propriedade `timestamp`)
+        é descontado; sem timestamp, o prazo conta a partir de agora.
+        """
+        ttls = [self.__message_ttl, message.expiration]
+        ttls = [float(ttl) for ttl in ttls if ttl]
+        if not ttls:
+            return None
+        return Deadline.from_delivery(min(ttls), message.timestamp)
+
+    @staticmethod
+    def __chat_key(message: dict) -> tuple[str, str]:
+        """Retorna a chave de particionamento (user_id, company_id)."""
+        user_state = message.get('user_state') or {}
+        chat_id = ChatID.from_dict(user_state.get('chat_id') or {})
+        return chat_id.user_id, chat_id.company_id
+
     async def on_request(self, body: bytes, process_message: Callable):
         try:
-            message = body.decode()
-            message_json = json.loads(message)
-            pure_message = await self.__transform_message(message_json)
+            message_json = self.__decode(body)
+        except Exception as e:
+            logger.error('Erro ao decodificar mensagem: %s', e)
+            return
+        await self.__handle(message_json, process_message)
+
+    async def __handle(
+        self,
+        message_json: dict,
+        process_message: Callable,
+        deadline: Deadline | None = None,
+    ) -> bool:
+        """Processa a mensagem e indica se o handler terminou sem erro."""
+        try:
+            pure_message = await self.__transform_message(
+                message_json, deadline
+            )
             await process_message(pure_message)
         except Exception as e:
-            print(f'Erro ao processar mensagem: {e}')
+            logger.exception('Erro ao processar mensagem: %s', e)
+            return False
+        return True
+
+    async def __transform_message(
+        self,
+        message: dict,
+        deadline: Deadline | None = None,
+    ) -> UserCall:
+        # Reutilizar o mesmo cliente para todas as mensagens
+        router_client = await self.__initialize_router()
+
+        if self.__lazy_models:
+            return UserCall.from_dict(
+                message,
+                router_client,
+                rate_limiter=self.__send_rate_limiter,
+                write_behind=self.__write_behind,
+                state_writer=self.__state_writer,
+                file_cache=self.__file_cache,
+                upload_by_url=self.__upload_by_url,
+                pipeline_sends=self.__pipeline_sends,
+                deadline=deadline,
+            )
 
-    async def __transform_message(self, message: dict) -> UserCall:
         user_state = message.get('user_state', {})
         message_data = message.get('message', {})
-        observation = user_state.get('observation', "{}")
-
-        print(observation)
-        if isinstance(observation, str):
-            observation = json.loads(observation)
 
         user_state_models = UserState.from_dict(user_state)
         message_models = Message.from_dict(message_data)
 
-        # Reutilizar o mesmo cliente para todas as mensagens
-        router_client = await self.__initialize_router()
-
         usercall = UserCall(
             user_state=user_state_models,
             message=message_models,
             router_client=router_client,
+            rate_limiter=self.__send_rate_limiter,
+            write_behind=self.__write_behind,
+            state_writer=self.__state_writer,
+            file_cache=self.__file_cache,
+            upload_by_url=self.__upload_by_url,
+            pipeline_sends=self.__pipeline_sends,
+            deadline=deadline,
         )
 
         return usercall
 
     async def cleanup(self):
         """Libera recursos do cliente HTTP."""
+        await close_download_client()
+        if self.__file_cache is not None:
+            await self.__file_cache.flush()
+        if self.__state_writer is not None:
+            await self.__state_writer.flush()
+            self.__state_writer = None
         if self.__router_client:
             await self.__router_client.close()
             self.__router_client = None
-            print('✓ RouterHTTPClient fechado')
+            logger.info('RouterHTTPClient fechado')
 
     def reprer(self):
-        console = Console()
-
         title_text = Text('ChatGraph', style='bold red', justify='center')
         title_panel = Panel.fit(
             title_text, title=' ', border_style='bold red', padding=(1, 4)
@@ -209,12 +792,26 @@ class MessageConsumer:
         table.add_column('Valor', justify='center', style='magenta')
 
         table.add_row('Virtual Host', self.__virtual_host)
-        table.add_row('Prefetch Count', str(self.__prefetch_count))
+        prefetch = str(self.__prefetch_count)
+        if self.__adaptive_prefetch is not None:
+            controller = self.__adaptive_prefetch
+            prefetch = (
+                f'adaptativo ({controller.min_prefetch}-'
+                f'{controller.max_prefetch})'
+            )
+        table.add_row('Prefetch Count', prefetch)
+        table.add_row('Max Concurrency', str(self.__max_concurrency))
         table.add_row('Queue Consume', self.__queue_consume)
         table.add_row('AMQP URL', self.__amqp_url)
         table.add_row('Rabbit Username', self.__credentials.username)
         table.add_row('Rabbit Password', '******')
         table.add_row('Router URL', self.__router_url)
+        if self.__send_rate_limiter is not None:
+            limiter = self.__send_rate_limiter
+            table.add_row(
+                'Send Rate',
+                f'{limiter.rate}/s (burst {limiter.burst}, {limiter.scope})',
+            )
 
         console.print(title_panel, justify='center')
         console.print(separator, justify='center')
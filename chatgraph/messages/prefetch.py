@@ -0,0 +1,136 @@
+"""
+Controle adaptativo de prefetch do consumidor.
+
+Este módulo contém o AdaptivePrefetch, um controlador AIMD (aumento
+aditivo, redução multiplicativa) que ajusta o prefetch do canal AMQP a
+partir da latência das entregas, da taxa de erros e do atraso do event loop.
+"""
+
+from dataclasses import dataclass, field
+
+
+@dataclass
+class AdaptivePrefetch:
+    """
+    Controlador AIMD do prefetch.
+
+    A cada ajuste, se a latência média (da entrega ao ack), a taxa de
+    erros (dos handlers e das chamadas ao roteador) ou o atraso do event
+    loop excederem os limites, o prefetch é multiplicado por
+    `decrease`; caso contrário, é somado `increase`. O valor também é
+    limitado para que a última mensagem da janela seja processada antes
+    de expirar pelo `x-message-ttl` da fila.
+
+    Attributes:
+        min_prefetch: Prefetch mínimo
+        max_prefetch: Prefetch máximo
+        target_latency: Latência média aceitável das entregas (segundos)
+        max_error_rate: Taxa de erros aceitável por entrega (0 a 1)
+        max_loop_lag: Atraso aceitável do event loop (segundos)
+        message_ttl: TTL das mensagens na fila (segundos)
+        ttl_safety: Fração do TTL que a janela de prefetch pode ocupar
+        increase: Incremento aditivo por ajuste
+        decrease: Fator multiplicativo de redução
+        smoothing: Peso da amostra nova na média móvel da latência
+        interval: Intervalo entre ajustes (segundos)
+        current: Prefetch atual (inicial, se informado)
+        latency: Média móvel da latência das entregas (segundos)
+        loop_lag: Último atraso medido do event loop (segundos)
+    """
+
+    min_prefetch: int = 1
+    max_prefetch: int = 200
+    target_latency: float = 2.0
+    max_error_rate: float = 0.05
+    max_loop_lag: float = 0.2
+    message_ttl: float = 300.0
+    ttl_safety: float = 0.5
+    increase: int = 1
+    decrease: float = 0.5
+    smoothing: float = 0.2
+    interval: float = 5.0
+    current: int = 0
+    latency: float = field(default=0.0, init=False)
+    loop_lag: float = field(default=0.0, init=False)
+
+    def __post_init__(self):
+        if self.min_prefetch < 1 or self.max_prefetch < self.min_prefetch:
+            raise ValueError('Limites de prefetch inválidos.')
+
+        self.current = self.__clamp(self.current or self.min_prefetch)
+        self.__samples = 0
+        self.__errors = 0
+
+    @property
+    def error_rate(self) -> float:
+        """Taxa de erros por entrega observada desde o último ajuste."""
+        if not self.__samples:
+            # Falhas do roteador sem entregas concluídas: sobrecarga
+            return 1.0 if self.__errors else 0.0
+        return min(1.0, self.__errors / self.__samples)
+
+    def record(self, latency: float, ok: bool = True) -> None:
+        """
+        Registra o resultado de uma entrega.
+
+        Args:
+            latency: Tempo da entrega ao ack, em segundos (inclui a
+                espera na fila do despachante).
+            ok: Se o handler terminou sem erro.
+        """
+        if self.latency:
+            self.latency += self.smoothing * (latency - self.latency)
+        else:
+            self.latency = latency
+
+        self.__samples += 1
+        if not ok:
+            self.__errors += 1
+
+    def record_errors(self, count: int) -> None:
+        """
+        Registra falhas externas ao handler (ex: chamadas ao roteador).
+
+        Args:
+            count: Quantidade de falhas desde o último registro.
+        """
+        self.__errors += max(count, 0)
+
+    def adjust(self, concurrency: int = 1, loop_lag: float = 0.0) -> int:
+        """
+        Calcula o próximo prefetch e reinicia a janela de amostras.
+
+        Args:
+            concurrency: Handlers executando em paralelo.
+            loop_lag: Atraso medido do event loop em segundos.
+
+        Returns:
+            O novo valor de prefetch.
+        """
+        self.loop_lag = loop_lag
+        overloaded = loop_lag > self.max_loop_lag or (
+            self.__samples > 0 and self.latency > self.target_latency
+        ) or self.error_rate > self.max_error_rate
+
+        if overloaded:
+            target = int(self.current * self.decrease)
+        elif self.__samples:
+            target = self.current + self.increase
+        else:
+            # Sem tráfego não há sinal para aumentar a janela
+            target = self.current
+
+        # Mensagens na janela esperam ~ prefetch * latência / concorrência
+        if self.latency > 0:
+            budget = self.message_ttl * self.ttl_safety
+            target = min(
+                target, int(budget * max(concurrency, 1) / self.latency)
+            )
+
+        self.current = self.__clamp(target)
+        self.__samples = 0
+        self.__errors = 0
+        return self.current
+
+    def __clamp(self, value: int) -> int:
+        return max(self.min_prefetch, min(self.max_prefetch, value))
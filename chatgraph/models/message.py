@@ -9,12 +9,17 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from typing import List, Optional, Union
-import httpx
+import asyncio
 import os
 import hashlib
 
+from ..services.downloads import download
+
 MessageTypes = Union[str, float, int]
 
+# Tamanho dos blocos lidos ao carregar e calcular o hash de arquivos
+CHUNK_SIZE = 1024 * 1024
+
 
 @dataclass
 class File:
@@ -105,18 +110,29 @@ class File:
         return False
 
     async def __deal_with_url(self) -> bytes:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(self.url)
-            response.raise_for_status()
-            return response.content
+        return await download(self.url)
+
+    def __read_path(self, keep_bytes: bool) -> tuple[Optional[bytes], str]:
+        """Lê o arquivo em blocos, atualizando o hash a cada bloco."""
+        digest = hashlib.sha256()
+        chunks = []
+        with open(self.name, 'rb') as file:
+            while chunk := file.read(CHUNK_SIZE):
+                digest.update(chunk)
+                if keep_bytes:
+                    chunks.append(chunk)
+        return (b''.join(chunks) if keep_bytes else None), digest.hexdigest()
 
     async def __deal_with_path(self) -> bytes:
-        """Lê os bytes de um arquivo dado seu caminho."""
+        """Lê os bytes de um arquivo dado seu caminho, fora do event loop."""
         if not await self.__check_file_exists():
             raise ValueError('Arquivo não encontrado para envio.')
 
-        with open(self.name, 'rb') as file:
-            self.bytes_data = file.read()
+        self.bytes_data, hash_id = await asyncio.to_thread(
+            self.__read_path, True
+        )
+        if not self.hash_id:
+            self.hash_id = hash_id
         return self.bytes_data
 
     async def __make_file_hash(
@@ -126,7 +142,46 @@ class File:
         if not self.bytes_data:
             raise ValueError('Dados do arquivo não carregados para hash.')
 
-        self.hash_id = hashlib.sha256(self.bytes_data).hexdigest()
+        if len(self.bytes_data) > CHUNK_SIZE:
+            digest = await asyncio.to_thread(hashlib.sha256, self.bytes_data)
+        else:
+            digest = hashlib.sha256(self.bytes_data)
+        self.hash_id = digest.hexdigest()
+        return self.hash_id
+
+    async def load_hash(self) -> str:
+        """
+        Calcula o hash do arquivo sem manter seus bytes em memória.
+
+        Bytes já em memória são usados diretamente. Arquivos locais são
+        lidos em blocos em uma thread separada; o upload posterior é feito
+        em streaming a partir do disco. Arquivos remotos (url) são
+        carregados por completo com `load_file`.
+
+        Returns:
+            O hash SHA-256 do arquivo.
+        """
+        if self.hash_id:
+            return self.hash_id
+
+        if self.bytes_data:
+            return await self.__make_file_hash()
+
+        if self.url:
+            await self.load_file()
+            return self.hash_id
+
+        if not self.name:
+            raise ValueError(
+                'Nenhum dado de arquivo fornecido para carregamento.'
+            )
+
+        try:
+            if not await self.__check_file_exists():
+                raise ValueError('Arquivo não encontrado para envio.')
+            _, self.hash_id = await asyncio.to_thread(self.__read_path, False)
+        except Exception as e:
+            raise ValueError(f'Erro ao carregar arquivo: {e}')
         return self.hash_id
 
     async def load_file(self):
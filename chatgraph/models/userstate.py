@@ -12,6 +12,7 @@ import json
 from dataclasses import dataclass, field
 from typing import Optional
 from ..container.container import Container
+from ..logger.logger import logger
 
 
 @dataclass
@@ -152,7 +153,10 @@ class UserState:
         user: Informações do usuário (opcional)
         route: Rota atual no fluxo (opcional)
         direction_in: Indica se é mensagem de entrada (opcional)
-        observation: Observações/contexto adicional (opcional)
+        observation: Observações/contexto adicional (opcional). Após
+            `set_observation_dict` ou `update_observation`, só é
+            atualizado em `flush_observation`; `to_dict` já serializa
+            as alterações pendentes, sem limpá-las.
         last_update: Data/hora da última atualização (opcional)
         dt_created: Data/hora de criação (opcional)
     """
@@ -168,8 +172,22 @@ class UserState:
     last_update: Optional[str] = None
     dt_created: Optional[str] = None
 
+    # Observação decodificada uma única vez e chaves alteradas desde então
+    _observation_cache: Optional[dict] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _observation_source: Optional[str] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _observation_dirty: set = field(
+        default_factory=set, init=False, repr=False, compare=False
+    )
+
     def to_dict(self) -> dict:
         """Converte para dicionário."""
+        observation = self.observation
+        if self._observation_dirty:
+            observation = json.dumps(self._observation_cache)
         data = {
             'chat_id': self.chat_id.to_dict(),
             'platform': self.platform,
@@ -185,8 +203,8 @@ class UserState:
             data['route'] = self.route
         if self.direction_in is not None:
             data['direction_in'] = self.direction_in
-        if self.observation is not None:
-            data['observation'] = self.observation
+        if observation is not None:
+            data['observation'] = observation
         if self.last_update is not None:
             data['last_update'] = self.last_update
         if self.dt_created is not None:
@@ -214,16 +232,137 @@ class UserState:
             dt_created=data.get('dt_created'),
         )
 
+    @staticmethod
+    def normalize_dict(data: dict) -> dict:
+        """
+        Retorna `from_dict(data).to_dict()` sem construir os modelos.
+
+        Usado para enviar o estado recebido, ainda não alterado, sem o
+        custo de construir UserState, Menu e User.
+        """
+        chat_id = ChatID.from_dict(data.get('chat_id', {}))
+        menu_data = data.get('menu', {})
+        user_data = data.get('user', {})
+        result = {
+            'chat_id': chat_id.to_dict(),
+            'platform': data.get('platform', ''),
+        }
+
+        if data.get('session_id') is not None:
+            result['session_id'] = data['session_id']
+        result['menu'] = {
+            key: menu_data[key]
+            for key in ('id', 'department_id', 'name', 'description', 'active')
+            if menu_data and menu_data.get(key) is not None
+        }
+        result['user'] = {
+            key: user_data[key]
+            for key in ('cpf', 'name', 'phone', 'email')
+            if user_data and user_data.get(key) is not None
+        }
+        route = data.get('route', 'start')
+        if route is not None:
+            result['route'] = route
+        for key in (
+            'direction_in',
+            'observation',
+            'last_update',
+            'dt_created',
+        ):
+            if data.get(key) is not None:
+                result[key] = data[key]
+
+        return result
+
     @property
     def observation_dict(self) -> dict:
-        """Retorna a observação como dicionário."""
+        """
+        Retorna uma cópia rasa da observação como dicionário.
 
-        if self.observation:
+        O JSON é decodificado apenas uma vez; acessos seguintes reutilizam
+        o dicionário em cache enquanto `observation` não for substituído.
+        """
+        return dict(self.__parsed_observation())
+
+    @property
+    def dirty_observation_keys(self) -> frozenset:
+        """Chaves da observação alteradas desde o último flush."""
+        return frozenset(self._observation_dirty)
+
+    def set_observation_dict(self, observation: dict) -> None:
+        """
+        Substitui a observação, registrando apenas as chaves alteradas.
+
+        Valores contêiner que sejam o mesmo objeto do cache são sempre
+        considerados alterados, pois podem ter sido modificados in-place.
+
+        Args:
+            observation: Nova observação completa.
+        """
+        current = self.__parsed_observation()
+        dirty = self._observation_dirty
+        dirty.update(key for key in current if key not in observation)
+        for key, value in observation.items():
+            if key not in current or self.__changed(current[key], value):
+                dirty.add(key)
+        self._observation_cache = dict(observation)
+
+    def update_observation(self, changes: dict) -> None:
+        """
+        Mescla `changes` na observação, registrando as chaves alteradas.
+
+        Args:
+            changes: Chaves e valores a atualizar.
+        """
+        current = self.__parsed_observation()
+        for key, value in changes.items():
+            if key not in current or self.__changed(current[key], value):
+                self._observation_dirty.add(key)
+            current[key] = value
+
+    def flush_observation(self) -> Optional[str]:
+        """
+        Serializa a observação em `observation` se houver alterações.
+
+        Returns:
+            A observação serializada (JSON).
+        """
+        if self._observation_dirty:
+            self.observation = json.dumps(self._observation_cache)
+            self._observation_source = self.observation
+            self._observation_dirty.clear()
+        return self.observation
+
+    def __parsed_observation(self) -> dict:
+        """Retorna o cache, decodificando `observation` se necessário."""
+        if (
+            self._observation_cache is not None
+            and self._observation_source is self.observation
+        ):
+            return self._observation_cache
+
+        observation = self.observation
+        parsed = {}
+        if isinstance(observation, dict):
+            parsed = dict(observation)
+        elif observation:
             try:
-                return json.loads(self.observation)
+                parsed = json.loads(observation)
             except json.JSONDecodeError:
-                return {}
-        return {}
+                parsed = {}
+            if not isinstance(parsed, dict):
+                parsed = {}
+
+        self._observation_cache = parsed
+        self._observation_source = observation
+        self._observation_dirty.clear()
+        return parsed
+
+    @staticmethod
+    def __changed(old, new) -> bool:
+        if old is new:
+            return isinstance(new, (dict, list, set))
+        return old != new
 
     def insert(self) -> None:
         """Insere o estado do usuário no sistema via RouterHTTPClient."""
@@ -248,7 +387,7 @@ class UserState:
             async with router_client as rc:
                 await rc.start_session(self)
         except Exception as e:
-            print(f'Erro ao inserir UserState assíncrono: {e}')
+            logger.error('Erro ao inserir UserState assíncrono: %s', e)
             raise e
 
     @staticmethod
@@ -278,7 +417,7 @@ class UserState:
                 user_state = await rc.get_session_by_chat_id(chat_id)
                 return user_state
         except Exception as e:
-            print(f'Erro ao recuperar UserState: {e}')
+            logger.error('Erro ao recuperar UserState: %s', e)
             return None
 
     def delete(self) -> Optional['UserState']:
@@ -307,5 +446,5 @@ class UserState:
                 )
                 return result
         except Exception as e:
-            print(f'Erro ao recuperar UserState: {e}')
+            logger.error('Erro ao encerrar UserState: %s', e)
             return None
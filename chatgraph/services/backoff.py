@@ -0,0 +1,47 @@
+"""
+Política de espera exponencial com jitter.
+
+Utilizada para espaçar tentativas de reconexão e de repetição de
+requisições, evitando que vários clientes tentem novamente ao mesmo tempo.
+"""
+
+import random
+from dataclasses import dataclass
+
+
+@dataclass
+class ExponentialBackoff:
+    """
+    Calcula atrasos exponenciais com "full jitter".
+
+    O atraso da tentativa `n` é sorteado entre zero e
+    `min(max_delay, base * factor ** n)`.
+
+    Attributes:
+        base: Atraso base em segundos
+        factor: Fator multiplicativo por tentativa
+        max_delay: Atraso máximo em segundos
+        jitter: Se False, retorna sempre o teto do intervalo
+    """
+
+    base: float = 0.5
+    factor: float = 2.0
+    max_delay: float = 30.0
+    jitter: bool = True
+
+    def delay(self, attempt: int) -> float:
+        """
+        Retorna o atraso para a tentativa informada.
+
+        Args:
+            attempt: Número da tentativa, começando em zero.
+
+        Returns:
+            Atraso em segundos.
+        """
+        # Limita o expoente para evitar overflow em tentativas muito longas
+        exponent = min(attempt, 64)
+        ceiling = min(self.max_delay, self.base * self.factor**exponent)
+        if not self.jitter:
+            return ceiling
+        return random.uniform(0, ceiling)
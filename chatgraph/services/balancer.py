@@ -0,0 +1,150 @@
+"""
+Balanceamento de carga entre réplicas do roteador, no cliente.
+
+Cada requisição escolhe a réplica com menos requisições em andamento,
+entre todas ('least_outstanding') ou entre duas sorteadas ('p2c', power
+of two choices). Réplicas com falhas consecutivas são ejetadas por um
+tempo e, ao voltar, recebem carga gradualmente.
+"""
+
+import random
+import time
+from dataclasses import dataclass
+from typing import Sequence
+
+STRATEGIES = ('p2c', 'least_outstanding')
+
+
+@dataclass
+class Replica:
+    """
+    Estado de uma réplica do roteador.
+
+    Attributes:
+        url: URL base da réplica
+        outstanding: Requisições em andamento
+        requests: Requisições enviadas
+        failures: Falhas consecutivas
+        ejections: Quantidade de vezes em que foi ejetada
+        ejected_until: Instante (monotônico) do fim da ejeção
+        admitted_at: Instante (monotônico) da última readmissão
+    """
+
+    url: str
+    outstanding: int = 0
+    requests: int = 0
+    failures: int = 0
+    ejections: int = 0
+    ejected_until: float = 0.0
+    admitted_at: float | None = None
+
+    @property
+    def ejected(self) -> bool:
+        """Indica se a réplica está fora do balanceamento."""
+        return self.ejected_until > time.monotonic()
+
+
+class LoadBalancer:
+    """
+    Distribui requisições entre réplicas com ejeção passiva.
+
+    Após `failure_threshold` falhas consecutivas a réplica é ejetada por
+    `ejection_time` segundos. Ao ser readmitida, seu peso cresce de 10% a
+    100% ao longo de `warmup` segundos, evitando que receba de uma vez a
+    carga das demais. Se todas estiverem ejetadas, todas são usadas.
+
+    Attributes:
+        replicas: Réplicas, na ordem informada.
+        strategy: 'p2c' ou 'least_outstanding'.
+        failure_threshold: Falhas consecutivas para ejetar a réplica.
+        ejection_time: Tempo de ejeção, em segundos.
+        warmup: Tempo de readmissão gradual, em segundos.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        strategy: str = 'p2c',
+        failure_threshold: int = 3,
+        ejection_time: float = 30.0,
+        warmup: float = 30.0,
+    ) -> None:
+        """
+        Inicializa o balanceador.
+
+        Args:
+            urls: URLs base das réplicas.
+            strategy: 'p2c' ou 'least_outstanding'.
+            failure_threshold: Falhas consecutivas para ejetar a réplica.
+            ejection_time: Tempo de ejeção, em segundos.
+            warmup: Tempo de readmissão gradual, em segundos.
+        """
+        if not urls:
+            raise ValueError('Informe ao menos uma réplica.')
+        if strategy not in STRATEGIES:
+            raise ValueError(
+                f'Estratégia inválida: {strategy}. '
+                f'Opções: {", ".join(STRATEGIES)}'
+            )
+
+        self.replicas = [Replica(url=url.rstrip('/')) for url in urls]
+        self.strategy = strategy
+        self.failure_threshold = failure_threshold
+        self.ejection_time = ejection_time
+        self.warmup = warmup
+
+    def pick(self) -> Replica:
+        """
+        Escolhe a réplica da próxima requisição.
+
+        Returns:
+            A réplica escolhida.
+        """
+        candidates = [r for r in self.replicas if not r.ejected]
+        if not candidates:
+            candidates = self.replicas
+        if len(candidates) > 2 and self.strategy == 'p2c':
+            candidates = random.sample(candidates, 2)
+        # O sorteio desempata réplicas com a mesma carga
+        return min(candidates, key=lambda r: (self.__load(r), random.random()))
+
+    def start(self, replica: Replica) -> None:
+        """Registra o início de uma requisição na réplica."""
+        replica.outstanding += 1
+        replica.requests += 1
+
+    def finish(self, replica: Replica, healthy: bool | None) -> None:
+        """
+        Registra o fim de uma requisição na réplica.
+
+        Args:
+            replica: Réplica da requisição.
+            healthy: Se a réplica respondeu sem falha. None quando não há
+                resultado (ex: requisição cancelada).
+        """
+        replica.outstanding -= 1
+        if healthy is None:
+            return
+        if healthy:
+            replica.failures = 0
+            return
+
+        replica.failures += 1
+        if replica.failures >= self.failure_threshold and not replica.ejected:
+            replica.ejections += 1
+            replica.ejected_until = time.monotonic() + self.ejection_time
+            replica.admitted_at = replica.ejected_until
+            replica.failures = 0
+
+    def __load(self, replica: Replica) -> float:
+        """Carga relativa: requisições em andamento divididas pelo peso."""
+        return (replica.outstanding + 1) / self.__weight(replica)
+
+    def __weight(self, replica: Replica) -> float:
+        if replica.admitted_at is None or self.warmup <= 0:
+            return 1.0
+        elapsed = time.monotonic() - replica.admitted_at
+        if elapsed >= self.warmup:
+            replica.admitted_at = None
+            return 1.0
+        return max(0.1, elapsed / self.warmup)
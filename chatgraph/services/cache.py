@@ -0,0 +1,130 @@
+"""
+Cache assíncrono com expiração (TTL), limite de tamanho (LRU) e
+coalescência de requisições concorrentes (singleflight).
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from .singleflight import SingleFlight
+
+
+@dataclass
+class CacheStats:
+    """
+    Métricas do cache.
+
+    Attributes:
+        hits: Consultas atendidas pelo cache
+        misses: Consultas que executaram o carregamento
+        coalesced: Consultas que aguardaram um carregamento já em andamento
+    """
+
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+
+class AsyncTTLCache:
+    """
+    Cache de valores carregados de forma assíncrona.
+
+    Cada valor expira `ttl` segundos após ser carregado e, com mais de
+    `maxsize` chaves, as menos usadas recentemente são descartadas.
+    Consultas simultâneas da mesma chave compartilham um único
+    carregamento. Erros não são armazenados.
+
+    Attributes:
+        ttl: Tempo de vida de cada valor, em segundos.
+        maxsize: Quantidade máxima de chaves armazenadas.
+        stats: Métricas acumuladas do cache.
+    """
+
+    def __init__(self, ttl: float = 300.0, maxsize: int = 256) -> None:
+        """
+        Inicializa o cache.
+
+        Args:
+            ttl: Tempo de vida de cada valor, em segundos.
+            maxsize: Quantidade máxima de chaves armazenadas.
+        """
+        if ttl <= 0 or maxsize < 1:
+            raise ValueError('ttl e maxsize devem ser maiores que zero.')
+
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.stats = CacheStats()
+        self.__values: OrderedDict[Hashable, tuple[float, Any]] = (
+            OrderedDict()
+        )
+        self.__flight = SingleFlight()
+
+    def __len__(self) -> int:
+        return len(self.__values)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Retorna o valor armazenado e válido para a chave, se houver."""
+        item = self.__values.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self.__values[key]
+            return default
+
+        self.__values.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Armazena o valor para a chave, renovando a expiração."""
+        self.__values[key] = (time.monotonic() + self.ttl, value)
+        self.__values.move_to_end(key)
+        while len(self.__values) > self.maxsize:
+            self.__values.popitem(last=False)
+
+    def invalidate(self, key: Hashable | None = None) -> None:
+        """Remove a chave informada ou, se omitida, todo o cache."""
+        if key is None:
+            self.__values.clear()
+        else:
+            self.__values.pop(key, None)
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Retorna o valor da chave, carregando-o se necessário.
+
+        Args:
+            key: Chave do valor.
+            loader: Função sem argumentos que carrega o valor.
+
+        Returns:
+            O valor armazenado ou recém-carregado.
+        """
+        missing = object()
+        value = self.get(key, missing)
+        if value is not missing:
+            self.stats.hits += 1
+            return value
+
+        loaded = False
+
+        async def load() -> Any:
+            nonlocal loaded
+            loaded = True
+            self.stats.misses += 1
+            value = await loader()
+            self.set(key, value)
+            return value
+
+        try:
+            return await self.__flight.do(key, load)
+        finally:
+            if not loaded:
+                self.stats.coalesced += 1
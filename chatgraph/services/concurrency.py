@@ -0,0 +1,217 @@
+"""
+Limite adaptativo de requisições simultâneas ao roteador.
+
+O limite é ajustado a partir da latência observada, no estilo gradiente
+(Vegas/Gradient2): enquanto a latência recente acompanha a latência de
+referência o limite cresce; quando ela sobe (fila se formando no
+roteador) o limite diminui. Requisições acima do limite aguardam em uma
+fila limitada e, com a fila cheia, são recusadas.
+"""
+
+import asyncio
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+class LimitExceeded(Exception):
+    """Erro gerado quando a fila de espera do limitador está cheia."""
+
+
+@dataclass
+class LimiterStats:
+    """
+    Métricas do limitador.
+
+    Attributes:
+        acquired: Permissões concedidas
+        queued: Requisições que precisaram aguardar na fila
+        rejected: Requisições recusadas com a fila cheia
+        dropped: Falhas que reduziram o limite
+    """
+
+    acquired: int = 0
+    queued: int = 0
+    rejected: int = 0
+    dropped: int = 0
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    Limitador de concorrência com limite ajustado pela latência.
+
+    A cada resposta, o gradiente `tolerance * rtt_longo / rtt_curto`
+    (entre 0.5 e 1.0) multiplica o limite, somado de uma folga de
+    `sqrt(limite)`; o resultado é suavizado por `smoothing`. Falhas
+    (erros de transporte, 5xx) reduzem o limite por `backoff_ratio`. O
+    limite só cresce quando está em uso, para não inflar enquanto a
+    demanda é baixa.
+
+    Attributes:
+        min_limit: Limite mínimo.
+        max_limit: Limite máximo.
+        max_queue: Quantidade máxima de requisições aguardando.
+        stats: Métricas acumuladas do limitador.
+    """
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 100,
+        max_queue: int = 1000,
+        tolerance: float = 1.5,
+        smoothing: float = 0.2,
+        backoff_ratio: float = 0.9,
+        long_window: int = 100,
+        short_window: int = 10,
+    ) -> None:
+        """
+        Inicializa o limitador.
+
+        Args:
+            initial_limit: Limite inicial de requisições simultâneas.
+            min_limit: Limite mínimo.
+            max_limit: Limite máximo.
+            max_queue: Quantidade máxima de requisições aguardando.
+            tolerance: Aumento tolerado da latência antes de reduzir.
+            smoothing: Peso de cada ajuste no limite (0 a 1).
+            backoff_ratio: Fator aplicado ao limite após uma falha.
+            long_window: Amostras da média de referência da latência.
+            short_window: Amostras da média recente da latência.
+        """
+        if not 1 <= min_limit <= initial_limit <= max_limit:
+            raise ValueError(
+                'Os limites devem respeitar '
+                '1 <= min_limit <= initial_limit <= max_limit.'
+            )
+        if max_queue < 0:
+            raise ValueError('max_queue não pode ser negativo.')
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.tolerance = tolerance
+        self.smoothing = smoothing
+        self.backoff_ratio = backoff_ratio
+        self.long_window = long_window
+        self.short_window = short_window
+        self.stats = LimiterStats()
+        self.__limit = float(initial_limit)
+        self.__in_flight = 0
+        self.__waiters: deque[asyncio.Future] = deque()
+        self.__long_rtt: Optional[float] = None
+        self.__short_rtt: Optional[float] = None
+
+    @property
+    def limit(self) -> int:
+        """Limite atual de requisições simultâneas."""
+        return int(self.__limit)
+
+    @property
+    def in_flight(self) -> int:
+        """Requisições em andamento."""
+        return self.__in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Requisições aguardando na fila."""
+        return sum(1 for waiter in self.__waiters if not waiter.done())
+
+    async def acquire(self, timeout: Optional[float] = None) -> None:
+        """
+        Aguarda uma permissão para enviar uma requisição.
+
+        Args:
+            timeout: Espera máxima na fila, em segundos (opcional).
+
+        Raises:
+            LimitExceeded: Se a fila de espera estiver cheia.
+            asyncio.TimeoutError: Se o tempo de espera se esgotar.
+        """
+        if self.__in_flight < self.limit and not self.__waiters:
+            self.__in_flight += 1
+            self.stats.acquired += 1
+            return
+
+        if len(self.__waiters) >= self.max_queue:
+            self.stats.rejected += 1
+            raise LimitExceeded(
+                f'Limite de requisições ao roteador atingido ({self.limit} '
+                f'em andamento, {len(self.__waiters)} aguardando).'
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self.__waiters.append(future)
+        self.stats.queued += 1
+        try:
+            await asyncio.wait_for(future, timeout)
+        except BaseException:
+            if future.done() and not future.cancelled():
+                # A permissão já havia sido repassada: devolve-a
+                self.__in_flight -= 1
+                self.__wake()
+            else:
+                future.cancel()
+                try:
+                    self.__waiters.remove(future)
+                except ValueError:
+                    pass
+            raise
+        self.stats.acquired += 1
+
+    def release(self, rtt: Optional[float] = None, dropped: bool = False):
+        """
+        Libera a permissão e ajusta o limite.
+
+        Args:
+            rtt: Latência da requisição, em segundos. None quando não
+                houve resposta utilizável.
+            dropped: Se a requisição falhou por sobrecarga do roteador.
+        """
+        in_flight = self.__in_flight
+        self.__in_flight -= 1
+        if dropped:
+            self.stats.dropped += 1
+            self.__set_limit(self.__limit * self.backoff_ratio)
+        elif rtt is not None:
+            self.__update(rtt, in_flight)
+        self.__wake()
+
+    def __update(self, rtt: float, in_flight: int) -> None:
+        rtt = max(rtt, 1e-6)
+        if self.__long_rtt is None:
+            self.__long_rtt = self.__short_rtt = rtt
+        else:
+            self.__long_rtt += (rtt - self.__long_rtt) / self.long_window
+            self.__short_rtt += (rtt - self.__short_rtt) / self.short_window
+
+        # Referência muito acima da latência atual: acompanha a melhora
+        if self.__long_rtt / self.__short_rtt > 2:
+            self.__long_rtt *= 0.95
+
+        gradient = max(
+            0.5,
+            min(1.0, self.tolerance * self.__long_rtt / self.__short_rtt),
+        )
+        # Sem demanda suficiente, a latência não diz nada sobre o limite
+        if gradient >= 1.0 and in_flight < self.__limit / 2:
+            return
+
+        target = self.__limit * gradient + math.sqrt(self.__limit)
+        self.__set_limit(
+            (1 - self.smoothing) * self.__limit + self.smoothing * target
+        )
+
+    def __set_limit(self, limit: float) -> None:
+        self.__limit = min(float(self.max_limit), max(self.min_limit, limit))
+
+    def __wake(self) -> None:
+        """Repassa permissões livres às requisições na fila, em ordem."""
+        while self.__waiters and self.__in_flight < self.limit:
+            waiter = self.__waiters.popleft()
+            if waiter.done():
+                continue
+            self.__in_flight += 1
+            waiter.set_result(None)
@@ -0,0 +1,85 @@
+"""
+Prazo (deadline) de processamento de uma mensagem.
+
+O prazo é derivado do instante de publicação e do tempo de vida (TTL) da
+mensagem, de modo que as chamadas ao roteador feitas depois que o
+usuário já desistiu falhem imediatamente, e as demais usem no máximo o
+tempo restante como timeout.
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """Erro gerado quando o prazo da mensagem já se esgotou."""
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """
+    Prazo absoluto, no relógio monotônico.
+
+    Attributes:
+        expires_at: Instante (time.monotonic) em que o prazo se esgota
+    """
+
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> 'Deadline':
+        """Cria um prazo que se esgota após `seconds` segundos."""
+        return cls(time.monotonic() + seconds)
+
+    @classmethod
+    def from_delivery(
+        cls,
+        ttl: float,
+        sent_at: Optional[datetime] = None,
+    ) -> 'Deadline':
+        """
+        Cria o prazo de uma mensagem a partir do seu TTL.
+
+        Args:
+            ttl: Tempo de vida da mensagem, em segundos.
+            sent_at: Instante de publicação. Se omitido, o prazo conta a
+                partir de agora.
+
+        Returns:
+            O prazo restante da mensagem.
+        """
+        age = 0.0
+        if sent_at is not None:
+            if sent_at.tzinfo is None:
+                sent_at = sent_at.replace(tzinfo=timezone.utc)
+            # Relógios desalinhados não devem estender o prazo
+            age = max(0.0, time.time() - sent_at.timestamp())
+        return cls.after(ttl - age)
+
+    def remaining(self) -> float:
+        """Segundos restantes (negativo se já esgotado)."""
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        """Indica se o prazo já se esgotou."""
+        return self.remaining() <= 0
+
+    def check(self, operation: str = '') -> None:
+        """
+        Verifica o prazo antes de uma chamada.
+
+        Args:
+            operation: Nome da operação, usado na mensagem de erro.
+
+        Raises:
+            DeadlineExceeded: Se o prazo já se esgotou.
+        """
+        if self.expired:
+            suffix = f' ({operation})' if operation else ''
+            raise DeadlineExceeded(
+                f'Prazo da mensagem esgotado há {-self.remaining():.1f}s'
+                f'{suffix}.'
+            )
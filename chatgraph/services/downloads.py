@@ -0,0 +1,253 @@
+"""
+Download de arquivos remotos com pool de conexões compartilhado.
+
+Todos os downloads por URL usam um único `httpx.AsyncClient` por event
+loop, reaproveitando conexões TCP/TLS. Opcionalmente, o conteúdo é
+armazenado em disco, endereçado pelo seu hash, e revalidado com
+ETag/Last-Modified em vez de ser baixado novamente.
+
+Configuração por variáveis de ambiente (lidas no primeiro download):
+    CHATGRAPH_DOWNLOAD_MAX_CONNECTIONS: Conexões simultâneas (padrão: 20)
+    CHATGRAPH_DOWNLOAD_TIMEOUT: Timeout em segundos (padrão: 30)
+    CHATGRAPH_DOWNLOAD_CACHE_DIR: Diretório do cache em disco (opcional)
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+from ..logger.logger import logger
+
+
+@dataclass
+class DownloadSettings:
+    """
+    Configuração dos downloads.
+
+    Attributes:
+        max_connections: Conexões simultâneas no pool
+        max_keepalive: Conexões ociosas mantidas abertas
+        timeout: Timeout das requisições, em segundos
+        cache_dir: Diretório do cache em disco (opcional)
+    """
+
+    max_connections: int = 20
+    max_keepalive: int = 10
+    timeout: float = 30.0
+    cache_dir: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> 'DownloadSettings':
+        """Cria a configuração a partir das variáveis de ambiente."""
+        return cls(
+            max_connections=int(
+                os.getenv('CHATGRAPH_DOWNLOAD_MAX_CONNECTIONS', '20')
+            ),
+            timeout=float(os.getenv('CHATGRAPH_DOWNLOAD_TIMEOUT', '30')),
+            cache_dir=os.getenv('CHATGRAPH_DOWNLOAD_CACHE_DIR') or None,
+        )
+
+
+class DownloadCache:
+    """
+    Cache em disco de downloads, revalidado por ETag/Last-Modified.
+
+    Os metadados de cada URL (validadores e hash do conteúdo) ficam em
+    `<diretório>/urls/` e o conteúdo em `<diretório>/blobs/<sha256>`, de
+    modo que URLs diferentes com o mesmo conteúdo compartilham o arquivo.
+
+    Attributes:
+        directory: Diretório do cache.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(os.path.join(directory, 'urls'), exist_ok=True)
+        os.makedirs(os.path.join(directory, 'blobs'), exist_ok=True)
+
+    def lookup(self, url: str) -> Optional[dict]:
+        """Retorna os metadados armazenados da URL, se houver."""
+        try:
+            with open(self.__meta_path(url), 'r', encoding='utf-8') as fp:
+                meta = json.load(fp)
+        except (OSError, ValueError):
+            return None
+
+        if not os.path.isfile(self.__blob_path(meta.get('sha256', ''))):
+            return None
+        return meta
+
+    def read(self, meta: dict) -> bytes:
+        """Lê o conteúdo armazenado para os metadados."""
+        with open(self.__blob_path(meta['sha256']), 'rb') as fp:
+            return fp.read()
+
+    def store(self, url: str, response: httpx.Response) -> None:
+        """Armazena a resposta se ela tiver validadores."""
+        etag = response.headers.get('etag')
+        last_modified = response.headers.get('last-modified')
+        if not etag and not last_modified:
+            return
+
+        sha256 = hashlib.sha256(response.content).hexdigest()
+        blob_path = self.__blob_path(sha256)
+        if not os.path.isfile(blob_path):
+            self.__write(blob_path, response.content)
+
+        meta = {
+            'url': url,
+            'etag': etag,
+            'last_modified': last_modified,
+            'sha256': sha256,
+        }
+        self.__write(self.__meta_path(url), json.dumps(meta).encode())
+
+    def __meta_path(self, url: str) -> str:
+        key = hashlib.sha256(url.encode()).hexdigest()
+        return os.path.join(self.directory, 'urls', f'{key}.json')
+
+    def __blob_path(self, sha256: str) -> str:
+        return os.path.join(self.directory, 'blobs', sha256)
+
+    @staticmethod
+    def __write(path: str, content: bytes) -> None:
+        """Escreve de forma atômica (arquivo temporário + rename)."""
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(content)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+
+_settings: Optional[DownloadSettings] = None
+_cache: Optional[DownloadCache] = None
+_clients: dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+
+def configure_downloads(settings: Optional[DownloadSettings] = None) -> None:
+    """
+    Define a configuração dos downloads.
+
+    Os clientes já criados são descartados e recriados no próximo
+    download com a nova configuração.
+
+    Args:
+        settings: Nova configuração. Padrão: variáveis de ambiente.
+    """
+    global _settings, _cache
+    _settings = settings or DownloadSettings.from_env()
+    _cache = None
+    if _settings.cache_dir:
+        _cache = DownloadCache(_settings.cache_dir)
+    _clients.clear()
+
+
+def get_download_client() -> httpx.AsyncClient:
+    """Retorna o cliente de downloads compartilhado do event loop atual."""
+    if _settings is None:
+        configure_downloads()
+
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        # Remove clientes de loops já encerrados (ex: asyncio.run anterior)
+        for other in [lp for lp in _clients if lp.is_closed()]:
+            del _clients[other]
+
+        client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=_settings.max_connections,
+                max_keepalive_connections=_settings.max_keepalive,
+            ),
+            timeout=httpx.Timeout(_settings.timeout),
+            follow_redirects=True,
+        )
+        _clients[loop] = client
+    return client
+
+
+async def close_download_client() -> None:
+    """Fecha o cliente de downloads do event loop atual, se existir."""
+    client = _clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def download(url: str) -> bytes:
+    """
+    Baixa o conteúdo da URL usando o pool compartilhado.
+
+    Com o cache em disco habilitado, a URL já conhecida é revalidada com
+    If-None-Match/If-Modified-Since e, se não mudou (304), o conteúdo é
+    lido do disco.
+
+    Args:
+        url: URL do arquivo.
+
+    Returns:
+        Os bytes do arquivo.
+
+    Raises:
+        httpx.HTTPStatusError: Se o servidor responder com erro.
+    """
+    client = get_download_client()
+    cache = _cache
+
+    headers = {}
+    meta = None
+    if cache is not None:
+        meta = await asyncio.to_thread(cache.lookup, url)
+        if meta is not None:
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+
+    response = await client.get(url, headers=headers)
+    if response.status_code == 304 and meta is not None:
+        return await asyncio.to_thread(cache.read, meta)
+
+    response.raise_for_status()
+    if cache is not None:
+        try:
+            await asyncio.to_thread(cache.store, url, response)
+        except OSError as e:
+            logger.error('Erro ao armazenar download em cache: %s', e)
+    return response.content
+
+
+async def fetch_etag(url: str, etag: Optional[str] = None) -> Optional[str]:
+    """
+    Consulta o ETag atual da URL com uma requisição HEAD.
+
+    Com `etag` informado, a consulta é condicional (If-None-Match) e a
+    resposta 304 confirma que o conteúdo não mudou.
+
+    Args:
+        url: URL do arquivo.
+        etag: ETag já conhecido da URL (opcional).
+
+    Returns:
+        O ETag atual ou None se o servidor não informar ou falhar.
+    """
+    headers = {'If-None-Match': etag} if etag else {}
+    try:
+        response = await get_download_client().head(url, headers=headers)
+    except httpx.HTTPError as e:
+        logger.warning('Erro ao consultar ETag de %s: %s', url, e)
+        return None
+
+    if response.status_code == 304:
+        return response.headers.get('etag') or etag
+    if response.is_error:
+        return None
+    return response.headers.get('etag')
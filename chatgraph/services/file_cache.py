@@ -0,0 +1,364 @@
+"""
+Cache de arquivos endereçado por conteúdo.
+
+Associa a identidade de um arquivo local (caminho, tamanho e data de
+modificação) ao seu hash SHA-256 e o hash ao File já existente no
+servidor, evitando reler, recalcular o hash e consultar o roteador a cada
+envio da mesma mídia. Arquivos importados pelo servidor a partir de uma
+URL também são lembrados, junto ao ETag da origem quando informado.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from dataclasses import replace
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+from ..logger.logger import logger
+from ..models.message import File
+from .singleflight import SingleFlight
+
+Fingerprint = tuple[str, int, int]
+
+# Gravado em, File do servidor, ETag da origem e última revalidação
+UrlEntry = tuple[float, File, Optional[str], float]
+
+
+class FileCache:
+    """
+    Cache de hashes e arquivos do servidor, por processo.
+
+    Os arquivos conhecidos do servidor, por hash ou por URL, ficam
+    válidos por `file_ttl` segundos; hashes ausentes no servidor são
+    lembrados por `negative_ttl` segundos. Se `path` for informado,
+    hashes e arquivos são persistidos em JSON e recarregados após
+    reinícios. Dentro do event loop, a gravação é agrupada por
+    `save_delay` segundos e feita fora dele; `flush()` grava as
+    alterações pendentes imediatamente.
+
+    Attributes:
+        path: Arquivo JSON de persistência (opcional).
+        file_ttl: Validade dos arquivos do servidor, em segundos.
+        negative_ttl: Validade dos hashes ausentes, em segundos.
+        maxsize: Quantidade máxima de entradas de cada tipo.
+        save_delay: Espera para agrupar gravações, em segundos.
+        revalidate_after: Intervalo, em segundos, entre as revalidações
+            do ETag de um arquivo importado por URL (0 = a cada envio).
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        file_ttl: float = 86400.0,
+        negative_ttl: float = 60.0,
+        maxsize: int = 4096,
+        save_delay: float = 1.0,
+        revalidate_after: float = 300.0,
+    ) -> None:
+        """
+        Inicializa o cache.
+
+        Args:
+            path: Arquivo JSON de persistência (opcional).
+            file_ttl: Validade dos arquivos do servidor, em segundos.
+            negative_ttl: Validade dos hashes ausentes, em segundos.
+            maxsize: Quantidade máxima de entradas de cada tipo.
+            save_delay: Espera para agrupar gravações, em segundos.
+            revalidate_after: Intervalo entre revalidações de URLs.
+        """
+        self.path = path
+        self.file_ttl = file_ttl
+        self.negative_ttl = negative_ttl
+        self.maxsize = maxsize
+        self.save_delay = save_delay
+        self.revalidate_after = revalidate_after
+        self.__hashes: OrderedDict[Fingerprint, str] = OrderedDict()
+        self.__files: OrderedDict[str, tuple[float, File]] = OrderedDict()
+        self.__urls: OrderedDict[str, UrlEntry] = OrderedDict()
+        self.__missing: dict[str, float] = {}
+        self.__loaded = False
+        self.__dirty = False
+        self.__save_task: Optional[asyncio.Task] = None
+        self.__save_lock = asyncio.Lock()
+        self.__flight = SingleFlight()
+
+    @staticmethod
+    def fingerprint(path: str) -> Optional[Fingerprint]:
+        """
+        Retorna a identidade (caminho, tamanho, mtime) do arquivo local.
+
+        Args:
+            path: Caminho do arquivo.
+
+        Returns:
+            A identidade do arquivo ou None se ele não existir.
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return os.path.abspath(path), stat.st_size, stat.st_mtime_ns
+
+    def hash_for(self, fingerprint: Fingerprint) -> Optional[str]:
+        """Retorna o hash já calculado para a identidade do arquivo."""
+        self.__load()
+        hash_id = self.__hashes.get(fingerprint)
+        if hash_id is not None:
+            self.__hashes.move_to_end(fingerprint)
+        return hash_id
+
+    def remember_hash(self, fingerprint: Fingerprint, hash_id: str) -> None:
+        """Associa a identidade do arquivo ao seu hash."""
+        self.__load()
+        if self.__hashes.get(fingerprint) == hash_id:
+            return
+        self.__hashes[fingerprint] = hash_id
+        self.__trim(self.__hashes)
+        self.__save()
+
+    def get_file(self, hash_id: str) -> Optional[File]:
+        """Retorna uma cópia do File do servidor para o hash, se válido."""
+        self.__load()
+        item = self.__files.get(hash_id)
+        if item is None:
+            return None
+
+        stored_at, file = item
+        if time.time() - stored_at > self.file_ttl:
+            del self.__files[hash_id]
+            return None
+
+        self.__files.move_to_end(hash_id)
+        return replace(file)
+
+    def remember_file(self, hash_id: str, file: File) -> None:
+        """Associa o hash ao File existente no servidor."""
+        self.__load()
+        self.__missing.pop(hash_id, None)
+        self.__files[hash_id] = (
+            time.time(),
+            replace(file, bytes_data=None, hash_id=hash_id),
+        )
+        self.__trim(self.__files)
+        self.__save()
+
+    def get_url_file(self, url: str) -> Optional[tuple[File, Optional[str]]]:
+        """
+        Retorna o File importado da URL e o ETag da origem, se válido.
+
+        Args:
+            url: URL de origem do arquivo.
+
+        Returns:
+            Uma cópia do File do servidor e o ETag (ou None), ou None se
+            a URL não estiver no cache.
+        """
+        self.__load()
+        item = self.__urls.get(url)
+        if item is None:
+            return None
+
+        stored_at, file, etag, _ = item
+        if time.time() - stored_at > self.file_ttl:
+            del self.__urls[url]
+            return None
+
+        self.__urls.move_to_end(url)
+        return replace(file), etag
+
+    def remember_url_file(
+        self, url: str, file: File, etag: Optional[str] = None
+    ) -> None:
+        """Associa a URL (e o ETag da origem) ao File importado."""
+        self.__load()
+        now = time.time()
+        self.__urls[url] = (now, replace(file, bytes_data=None), etag, now)
+        self.__trim(self.__urls)
+        self.__save()
+
+    def needs_revalidation(self, url: str) -> bool:
+        """
+        Indica se o ETag da URL deve ser conferido com a origem.
+
+        URLs sem ETag não são revalidadas; as demais, apenas após
+        `revalidate_after` segundos desde a última conferência.
+
+        Args:
+            url: URL de origem do arquivo.
+        """
+        self.__load()
+        item = self.__urls.get(url)
+        if item is None or item[2] is None:
+            return False
+        return time.time() - item[3] >= self.revalidate_after
+
+    def mark_revalidated(self, url: str) -> None:
+        """Registra que o arquivo da URL foi conferido com a origem."""
+        item = self.__urls.get(url)
+        if item is not None:
+            self.__urls[url] = (*item[:3], time.time())
+
+    def is_missing(self, hash_id: str) -> bool:
+        """Indica se o hash foi consultado recentemente sem sucesso."""
+        missing_at = self.__missing.get(hash_id)
+        if missing_at is None:
+            return False
+        if time.monotonic() - missing_at > self.negative_ttl:
+            del self.__missing[hash_id]
+            return False
+        return True
+
+    def remember_missing(self, hash_id: str) -> None:
+        """Registra que o hash não existe no servidor."""
+        self.__missing[hash_id] = time.monotonic()
+        if len(self.__missing) > self.maxsize:
+            del self.__missing[next(iter(self.__missing))]
+
+    async def load_once(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Executa `loader` uma única vez entre chamadas simultâneas.
+
+        Evita que envios concorrentes do mesmo arquivo, antes de ele
+        estar no cache, calculem o hash e façam o upload em paralelo.
+
+        Args:
+            key: Identidade do arquivo (ex: fingerprint ou hash).
+            loader: Função sem argumentos que obtém o File do servidor.
+
+        Returns:
+            O resultado de `loader`, compartilhado entre as chamadas.
+        """
+        return await self.__flight.do(key, loader)
+
+    async def flush(self) -> None:
+        """Grava imediatamente as alterações pendentes, se houver."""
+        async with self.__save_lock:
+            # Com o lock, a gravação agendada não está em andamento
+            task = self.__save_task
+            if task is not None and task is not asyncio.current_task():
+                task.cancel()
+            if not self.__dirty:
+                return
+            self.__dirty = False
+            hashes = list(self.__hashes.items())
+            files = list(self.__files.items())
+            urls = list(self.__urls.items())
+            try:
+                await asyncio.to_thread(self.__write, hashes, files, urls)
+            except BaseException:
+                self.__dirty = True
+                raise
+
+    def clear(self) -> None:
+        """Remove todas as entradas em memória."""
+        self.__hashes.clear()
+        self.__files.clear()
+        self.__urls.clear()
+        self.__missing.clear()
+
+    def __trim(self, entries: OrderedDict) -> None:
+        while len(entries) > self.maxsize:
+            entries.popitem(last=False)
+
+    def __load(self) -> None:
+        """Carrega as entradas persistidas, uma única vez."""
+        if self.__loaded:
+            return
+        self.__loaded = True
+        if not self.path or not os.path.isfile(self.path):
+            return
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as fp:
+                data = json.load(fp)
+            for path, size, mtime, hash_id in data.get('hashes', []):
+                self.__hashes[(path, size, mtime)] = hash_id
+            for hash_id, (stored_at, file) in data.get('files', {}).items():
+                self.__files[hash_id] = (
+                    stored_at,
+                    replace(File.from_dict(file), hash_id=hash_id),
+                )
+            for url, (stored_at, file, etag, *checked) in data.get(
+                'urls', {}
+            ).items():
+                checked_at = checked[0] if checked else stored_at
+                self.__urls[url] = (
+                    stored_at,
+                    File.from_dict(file),
+                    etag,
+                    checked_at,
+                )
+        except (OSError, ValueError, TypeError) as e:
+            logger.error('Erro ao carregar cache de arquivos: %s', e)
+
+    def __save(self) -> None:
+        """Agenda a persistência das entradas, se configurada."""
+        if not self.path:
+            return
+
+        self.__dirty = True
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # Fora do event loop (ex: scripts) a gravação é imediata
+            self.__dirty = False
+            self.__write(
+                list(self.__hashes.items()),
+                list(self.__files.items()),
+                list(self.__urls.items()),
+            )
+            return
+
+        if self.__save_task is None or self.__save_task.done():
+            self.__save_task = loop.create_task(self.__save_later())
+
+    async def __save_later(self) -> None:
+        await asyncio.sleep(self.save_delay)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.error('Erro ao salvar cache de arquivos: %s', e)
+
+    def __write(
+        self,
+        hashes: list[tuple[Fingerprint, str]],
+        files: list[tuple[str, tuple[float, File]]],
+        urls: list[tuple[str, UrlEntry]],
+    ) -> None:
+        """Grava as entradas de forma atômica (arquivo temporário)."""
+        data = {
+            'hashes': [
+                [*fingerprint, hash_id] for fingerprint, hash_id in hashes
+            ],
+            'files': {
+                hash_id: [stored_at, file.to_dict()]
+                for hash_id, (stored_at, file) in files
+            },
+            'urls': {
+                url: [stored_at, file.to_dict(), etag, checked_at]
+                for url, (stored_at, file, etag, checked_at) in urls
+            },
+        }
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+                    json.dump(data, fp)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.error('Erro ao salvar cache de arquivos: %s', e)
+
+
+# Cache em memória compartilhado por padrão entre os UserCall do processo
+FILE_CACHE = FileCache()
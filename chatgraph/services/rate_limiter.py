@@ -0,0 +1,139 @@
+"""
+Limitador de taxa por chave (token bucket).
+
+Utilizado para espaçar o envio de mensagens apenas quando a taxa
+configurada do canal seria excedida, em vez de aguardar um intervalo fixo
+após cada envio.
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Hashable
+
+from ..models.userstate import ChatID, UserState
+
+SCOPES = ('chat', 'company', 'platform')
+
+
+@dataclass
+class RateLimiterStats:
+    """
+    Métricas do limitador.
+
+    Attributes:
+        acquired: Quantidade de permissões concedidas
+        throttled: Quantidade de permissões que precisaram aguardar
+        throttled_seconds: Tempo total aguardado (em segundos)
+    """
+
+    acquired: int = 0
+    throttled: int = 0
+    throttled_seconds: float = 0.0
+
+
+class KeyedRateLimiter:
+    """
+    Token bucket independente por chave.
+
+    Cada chave acumula até `burst` permissões, repostas à taxa de `rate`
+    por segundo. Chamadas concorrentes da mesma chave reservam permissões
+    futuras, de modo que a ordem de chegada é respeitada.
+
+    Attributes:
+        rate: Permissões por segundo para cada chave.
+        burst: Quantidade máxima de permissões acumuladas.
+        scope: Granularidade da chave ('chat', 'company' ou 'platform').
+        stats: Métricas acumuladas do limitador.
+    """
+
+    PRUNE_EVERY = 1024
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        scope: str = 'chat',
+    ) -> None:
+        """
+        Inicializa o limitador.
+
+        Args:
+            rate: Permissões por segundo para cada chave.
+            burst: Quantidade máxima de permissões acumuladas.
+            scope: Granularidade da chave ('chat', 'company' ou 'platform').
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError('rate e burst devem ser maiores que zero.')
+        if scope not in SCOPES:
+            raise ValueError(
+                f'Escopo inválido: {scope}. Opções: {", ".join(SCOPES)}'
+            )
+
+        self.rate = rate
+        self.burst = burst
+        self.scope = scope
+        self.stats = RateLimiterStats()
+        self.__buckets: dict[Hashable, tuple[float, float]] = {}
+
+    def key_for(self, user_state: UserState) -> Hashable:
+        """Retorna a chave do limitador para o estado do usuário."""
+        return self.key_for_chat(user_state.chat_id, user_state.platform)
+
+    def key_for_chat(self, chat_id: ChatID, platform: str) -> Hashable:
+        """Retorna a chave do limitador para o chat e a plataforma."""
+        if self.scope == 'company':
+            return chat_id.company_id
+        if self.scope == 'platform':
+            return platform
+        return chat_id.user_id, chat_id.company_id
+
+    def reserve(self, key: Hashable) -> float:
+        """
+        Reserva uma permissão para a chave.
+
+        Args:
+            key: Chave do bucket.
+
+        Returns:
+            Tempo (em segundos) a aguardar antes de usar a permissão.
+        """
+        now = time.monotonic()
+        tokens, updated = self.__buckets.get(key, (self.burst, now))
+        tokens = min(self.burst, tokens + (now - updated) * self.rate) - 1
+        self.__buckets[key] = (tokens, now)
+
+        self.stats.acquired += 1
+        if self.stats.acquired % self.PRUNE_EVERY == 0:
+            self.__prune(now)
+
+        if tokens >= 0:
+            return 0.0
+
+        delay = -tokens / self.rate
+        self.stats.throttled += 1
+        self.stats.throttled_seconds += delay
+        return delay
+
+    async def acquire(self, key: Hashable) -> float:
+        """
+        Aguarda, se necessário, até haver permissão para a chave.
+
+        Args:
+            key: Chave do bucket.
+
+        Returns:
+            Tempo aguardado em segundos.
+        """
+        delay = self.reserve(key)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return delay
+
+    def __prune(self, now: float) -> None:
+        """Remove buckets cheios, equivalentes a um bucket novo."""
+        self.__buckets = {
+            key: (tokens, updated)
+            for key, (tokens, updated) in self.__buckets.items()
+            if tokens + (now - updated) * self.rate < self.burst
+        }
@@ -0,0 +1,187 @@
+"""
+Políticas de resiliência para as chamadas ao roteador.
+
+Reúne a repetição de requisições idempotentes com espera exponencial, o
+orçamento de repetições (que impede que as repetições multipliquem a
+carga durante uma queda) e o disjuntor (circuit breaker), que falha
+imediatamente enquanto o roteador estiver fora do ar.
+"""
+
+import time
+from dataclasses import dataclass, field
+
+from .backoff import ExponentialBackoff
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """Erro gerado quando o disjuntor está aberto."""
+
+
+@dataclass
+class ResilienceStats:
+    """
+    Métricas das políticas de resiliência.
+
+    Attributes:
+        failures: Falhas temporárias (erro de transporte ou status 5xx)
+        retries: Tentativas repetidas
+        budget_exhausted: Repetições negadas pelo orçamento
+        rejected: Chamadas recusadas com o circuito aberto
+    """
+
+    failures: int = 0
+    retries: int = 0
+    budget_exhausted: int = 0
+    rejected: int = 0
+
+
+@dataclass
+class RetryPolicy:
+    """
+    Política de repetição de uma chamada idempotente.
+
+    Attributes:
+        attempts: Quantidade máxima de tentativas (1 = sem repetição)
+        backoff: Espera entre as tentativas
+        retry_statuses: Status HTTP que indicam falha temporária
+    """
+
+    attempts: int = 3
+    backoff: ExponentialBackoff = field(
+        default_factory=lambda: ExponentialBackoff(base=0.1, max_delay=2.0)
+    )
+    retry_statuses: tuple[int, ...] = (502, 503, 504)
+
+    def __post_init__(self) -> None:
+        if self.attempts < 1:
+            raise ValueError('attempts deve ser maior que zero.')
+
+
+class RetryBudget:
+    """
+    Limita as repetições a uma fração das requisições.
+
+    Cada requisição deposita `ratio` fichas e cada repetição consome uma,
+    até o máximo de `max_tokens` acumuladas. Com o roteador fora do ar,
+    as repetições cessam assim que as fichas acabam, em vez de
+    multiplicar a carga por `attempts`.
+
+    Attributes:
+        ratio: Fichas depositadas por requisição.
+        max_tokens: Quantidade máxima de fichas acumuladas.
+        tokens: Fichas disponíveis.
+    """
+
+    def __init__(self, ratio: float = 0.1, max_tokens: float = 10.0) -> None:
+        """
+        Inicializa o orçamento, já com todas as fichas disponíveis.
+
+        Args:
+            ratio: Fichas depositadas por requisição.
+            max_tokens: Quantidade máxima de fichas acumuladas.
+        """
+        if ratio < 0 or max_tokens < 0:
+            raise ValueError('ratio e max_tokens não podem ser negativos.')
+
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self.tokens = max_tokens
+
+    def deposit(self) -> None:
+        """Registra uma requisição original."""
+        self.tokens = min(self.max_tokens, self.tokens + self.ratio)
+
+    def try_withdraw(self) -> bool:
+        """Consome uma ficha para repetir, se houver."""
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por falhas consecutivas.
+
+    Após `failure_threshold` falhas seguidas o circuito abre e as
+    chamadas falham imediatamente por `reset_timeout` segundos. Depois
+    disso, uma única chamada de teste é liberada: se tiver sucesso o
+    circuito fecha, caso contrário volta a abrir.
+
+    Attributes:
+        failure_threshold: Falhas consecutivas para abrir o circuito.
+        reset_timeout: Tempo aberto antes da chamada de teste, em segundos.
+        failures: Falhas consecutivas registradas.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 10.0,
+    ) -> None:
+        """
+        Inicializa o disjuntor fechado.
+
+        Args:
+            failure_threshold: Falhas consecutivas para abrir o circuito.
+            reset_timeout: Tempo aberto antes da chamada de teste.
+        """
+        if failure_threshold < 1 or reset_timeout <= 0:
+            raise ValueError(
+                'failure_threshold e reset_timeout devem ser maiores que zero.'
+            )
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.__opened_at: float | None = None
+        self.__probing = False
+
+    @property
+    def state(self) -> str:
+        """Estado atual: 'closed', 'open' ou 'half_open'."""
+        if self.__opened_at is None:
+            return CLOSED
+        if time.monotonic() - self.__opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def before_call(self) -> None:
+        """
+        Verifica se a chamada pode ser feita.
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto ou se a chamada
+                de teste já estiver em andamento.
+        """
+        state = self.state
+        if state == CLOSED:
+            return
+        if state == HALF_OPEN and not self.__probing:
+            self.__probing = True
+            return
+        raise CircuitOpenError(
+            'Roteador indisponível: circuito aberto após '
+            f'{self.failures} falhas consecutivas.'
+        )
+
+    def record_success(self) -> None:
+        """Registra uma chamada bem-sucedida e fecha o circuito."""
+        self.failures = 0
+        self.__opened_at = None
+        self.__probing = False
+
+    def abandon(self) -> None:
+        """Libera a chamada de teste sem resultado (ex: cancelamento)."""
+        self.__probing = False
+
+    def record_failure(self) -> None:
+        """Registra uma falha e abre o circuito, se necessário."""
+        self.failures += 1
+        if self.__probing or self.failures >= self.failure_threshold:
+            self.__opened_at = time.monotonic()
+        self.__probing = False
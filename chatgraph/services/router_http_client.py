@@ -1,11 +1,111 @@
-from typing import Any, Dict, Optional
+import asyncio
+import os
+import time
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Iterable, Optional, Sequence, Union
 
 import httpx
 
+from ..logger.logger import logger
 from ..models.http_responses import RouterResponses
 from ..models.userstate import UserState, ChatID, Menu
-from ..models.message import Message, File
+from ..models.message import CHUNK_SIZE, Message, File
 from ..models.actions import EndAction
+from .balancer import LoadBalancer
+from .cache import AsyncTTLCache
+from .concurrency import AdaptiveConcurrencyLimiter
+from .deadline import Deadline, DeadlineExceeded
+from .resilience import (
+    CircuitBreaker,
+    ResilienceStats,
+    RetryBudget,
+    RetryPolicy,
+)
+from .send_batcher import SendBatcher
+from .singleflight import SingleFlight
+
+# Compartilhado entre instâncias: as ações de encerramento raramente mudam
+END_ACTION_CACHE = AsyncTTLCache(
+    ttl=float(os.getenv('CHATGRAPH_END_ACTION_TTL', '300'))
+)
+
+# Operações idempotentes (GET) que podem ser repetidas com segurança
+IDEMPOTENT_OPERATIONS = (
+    'get_all_sessions',
+    'get_session',
+    'get_file',
+    'get_end_action',
+)
+
+# Timeouts por operação, em segundos; as demais usam o timeout do cliente
+DEFAULT_TIMEOUTS = {
+    'upload_file': 120.0,
+    'upload_file_from_url': 120.0,
+}
+
+
+@dataclass
+class PoolStats:
+    """
+    Estado do pool de conexões do cliente.
+
+    Attributes:
+        connections: Conexões abertas
+        active: Conexões com requisições em andamento
+        idle: Conexões ociosas (keep-alive)
+        http2: Conexões multiplexadas em HTTP/2
+        in_flight: Requisições com conexão atribuída
+        waiters: Requisições aguardando uma conexão livre
+    """
+
+    connections: int = 0
+    active: int = 0
+    idle: int = 0
+    http2: int = 0
+    in_flight: int = 0
+    waiters: int = 0
+
+
+class _MultipartFileStream:
+    """
+    Corpo multipart/form-data de um arquivo local, lido sob demanda.
+
+    Os blocos são lidos do disco em uma thread separada, sem bloquear o
+    event loop. Cada iteração reabre o arquivo, permitindo que a
+    requisição seja repetida pelas retentativas.
+    """
+
+    def __init__(
+        self, path: str, field: str, filename: str, mime_type: str
+    ) -> None:
+        self.path = path
+        self.boundary = os.urandom(16).hex()
+        self.head = (
+            f'--{self.boundary}\r\n'
+            f'Content-Disposition: form-data; name="{field}"; '
+            f'filename="{os.path.basename(filename)}"\r\n'
+            f'Content-Type: {mime_type}\r\n\r\n'
+        ).encode()
+        self.tail = f'\r\n--{self.boundary}--\r\n'.encode()
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Cabeçalhos da requisição com o boundary e o tamanho do corpo."""
+        size = len(self.head) + os.path.getsize(self.path) + len(self.tail)
+        return {
+            'Content-Type': f'multipart/form-data; boundary={self.boundary}',
+            'Content-Length': str(size),
+        }
+
+    async def __aiter__(self):
+        yield self.head
+        fp = await asyncio.to_thread(open, self.path, 'rb')
+        try:
+            while chunk := await asyncio.to_thread(fp.read, CHUNK_SIZE):
+                yield chunk
+        finally:
+            await asyncio.to_thread(fp.close)
+        yield self.tail
 
 
 class RouterHTTPClient:
@@ -19,22 +119,110 @@ class RouterHTTPClient:
 
     def __init__(
         self,
-        base_url: str,
+        base_url: Union[str, Sequence[str]],
         username: Optional[str] = None,
         password: Optional[str] = None,
         timeout: float = 30.0,
+        end_action_cache: Optional[AsyncTTLCache] = None,
+        batch_endpoint: Optional[str] = None,
+        batch_size: int = 50,
+        batch_delay: float = 0.005,
+        max_connections: Optional[int] = 100,
+        max_keepalive_connections: Optional[int] = 20,
+        keepalive_expiry: Optional[float] = 5.0,
+        http2: bool = False,
+        retry_policy: Optional[RetryPolicy] = None,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        retry_budget: Optional[RetryBudget] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        balance_strategy: str = 'p2c',
+        timeouts: Optional[Dict[str, float]] = None,
+        concurrency_limiter: Optional[AdaptiveConcurrencyLimiter] = None,
+        coalesce_reads: bool = True,
     ):
         """
         Inicializa o cliente HTTP.
 
         Args:
-            base_url: URL base da API (ex: "https://api.example.com")
+            base_url: URL base da API (ex: "https://api.example.com") ou
+                lista de URLs de réplicas, balanceadas no cliente
             username: Nome de usuário para autenticação (opcional)
             password: Senha para autenticação (opcional)
             timeout: Timeout para requisições em segundos (padrão: 30.0)
+            timeouts: Timeouts por operação (ex: {'get_file': 5.0}),
+                sobre DEFAULT_TIMEOUTS. As chaves são os nomes dos
+                métodos públicos e 'get_session' (opcional)
+            end_action_cache: Cache das ações de encerramento
+                (padrão: cache compartilhado END_ACTION_CACHE)
+            batch_endpoint: Endpoint de envio em lote. Se informado, os
+                envios de mensagens são agrupados (opcional)
+            batch_size: Quantidade máxima de mensagens por lote
+            batch_delay: Espera máxima para formar um lote, em segundos
+            max_connections: Conexões simultâneas no pool
+                (None = sem limite)
+            max_keepalive_connections: Conexões ociosas mantidas abertas
+                (None = sem limite)
+            keepalive_expiry: Tempo máximo de uma conexão ociosa, em
+                segundos (None = sem expiração)
+            http2: Multiplexa as requisições em HTTP/2 quando o servidor
+                suportar. Requer o extra `chatgraph[http2]`
+            retry_policy: Política de repetição das operações idempotentes
+                (padrão: RetryPolicy(); RetryPolicy(attempts=1) desabilita)
+            retry_policies: Políticas específicas por operação, com as
+                chaves de IDEMPOTENT_OPERATIONS (opcional)
+            retry_budget: Orçamento de repetições (padrão: RetryBudget())
+            circuit_breaker: Disjuntor das chamadas ao roteador
+                (padrão: CircuitBreaker())
+            balance_strategy: Escolha da réplica com várias URLs: 'p2c'
+                ou 'least_outstanding'
+            concurrency_limiter: Limitador adaptativo de requisições
+                simultâneas ao roteador. Sem ele, o limite é apenas o do
+                pool de conexões (opcional)
+            coalesce_reads: Compartilha a resposta entre GETs idênticos
+                simultâneos (padrão: True). As métricas ficam em
+                `singleflight.stats`
+
+        Raises:
+            ImportError: Se http2 for solicitado sem o pacote `h2`.
         """
-        self.base_url = base_url.rstrip('/')
+        urls = [base_url] if isinstance(base_url, str) else list(base_url)
+        if not urls:
+            raise ValueError('Informe ao menos uma URL do roteador.')
+        self.base_url = urls[0].rstrip('/')
+        self.balancer: Optional[LoadBalancer] = None
+        if len(urls) > 1:
+            self.balancer = LoadBalancer(urls, strategy=balance_strategy)
         self.timeout = timeout
+        self.timeouts = {**DEFAULT_TIMEOUTS, **(timeouts or {})}
+        if end_action_cache is None:
+            end_action_cache = END_ACTION_CACHE
+        self.end_action_cache = end_action_cache
+        self.batch_endpoint = batch_endpoint
+        if retry_policy is None:
+            retry_policy = RetryPolicy()
+        self.retry_policies = dict.fromkeys(
+            IDEMPOTENT_OPERATIONS, retry_policy
+        )
+        self.retry_policies.update(retry_policies or {})
+        if retry_budget is None:
+            retry_budget = RetryBudget()
+        self.retry_budget = retry_budget
+        if circuit_breaker is None:
+            circuit_breaker = CircuitBreaker()
+        self.circuit_breaker = circuit_breaker
+        self.resilience_stats = ResilienceStats()
+        self.concurrency_limiter = concurrency_limiter
+        self.singleflight: Optional[SingleFlight] = None
+        if coalesce_reads:
+            self.singleflight = SingleFlight()
+        self.batcher: Optional[SendBatcher] = None
+        if batch_endpoint:
+            self.batcher = SendBatcher(
+                self.__post_message,
+                self.__post_messages,
+                max_batch=batch_size,
+                max_delay=batch_delay,
+            )
 
         # Configurar autenticação básica se fornecida
         auth = None
@@ -46,10 +234,16 @@ class RouterHTTPClient:
             base_url=self.base_url,
             auth=auth,
             timeout=httpx.Timeout(timeout),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
             headers={
                 'Accept': 'application/json',
                 # 'Content-Type': 'application/json',
             },
+            http2=http2,
             verify=False,
             trust_env=True,
             follow_redirects=True,
@@ -57,8 +251,290 @@ class RouterHTTPClient:
 
     async def close(self):
         """Fecha a conexão do cliente HTTP."""
+        if self.batcher is not None:
+            await self.batcher.flush()
         await self._client.aclose()
 
+    def pool_stats(self) -> PoolStats:
+        """
+        Retorna o estado atual do pool de conexões.
+
+        Lido do pool do httpcore usado pelo transporte padrão; se ele não
+        estiver disponível (ex: transporte customizado), retorna zeros.
+
+        Returns:
+            PoolStats com conexões e requisições do pool.
+        """
+        stats = PoolStats()
+        transport = getattr(self._client, '_transport', None)
+        pool = getattr(transport, '_pool', None)
+        if pool is None:
+            return stats
+
+        for connection in list(getattr(pool, 'connections', [])):
+            stats.connections += 1
+            if connection.is_idle():
+                stats.idle += 1
+            else:
+                stats.active += 1
+            if 'HTTP/2' in connection.info():
+                stats.http2 += 1
+
+        for request in list(getattr(pool, '_requests', [])):
+            if request.is_queued():
+                stats.waiters += 1
+            else:
+                stats.in_flight += 1
+        return stats
+
+    async def __request(
+        self,
+        method: str,
+        endpoint: str,
+        operation: str = '',
+        deadline: Optional[Deadline] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Executa a requisição, coalescendo GETs concorrentes idênticos.
+
+        GETs com o mesmo endpoint e parâmetros em andamento ao mesmo
+        tempo compartilham uma única requisição e a mesma resposta. Cada
+        chamada aguarda no máximo o seu próprio prazo; se a requisição
+        compartilhada falhar pelo prazo de outra chamada, a requisição é
+        refeita.
+
+        Args:
+            method: Método HTTP.
+            endpoint: Endpoint relativo à URL base.
+            operation: Nome da operação em `retry_policies` e `timeouts`.
+            deadline: Prazo da mensagem que originou a chamada (opcional).
+            **kwargs: Argumentos repassados a `httpx.AsyncClient.request`.
+
+        Returns:
+            A resposta do roteador.
+        """
+        if (
+            self.singleflight is None
+            or method != 'GET'
+            or set(kwargs) - {'params'}
+        ):
+            return await self.__execute(
+                method, endpoint, operation, deadline, **kwargs
+            )
+
+        params = httpx.QueryParams(kwargs.get('params'))
+        key = (method, endpoint, tuple(sorted(params.multi_items())))
+        timeout = None
+        if deadline is not None:
+            deadline.check(operation)
+            timeout = max(0.0, deadline.remaining())
+
+        try:
+            return await self.singleflight.do(
+                key,
+                lambda: self.__execute(
+                    method, endpoint, operation, deadline, **kwargs
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded(
+                f'Prazo da mensagem esgotado ({operation or endpoint}).'
+            ) from e
+        except DeadlineExceeded:
+            if deadline is not None and deadline.expired:
+                raise
+            # O prazo esgotado era o de outra chamada coalescida
+            return await self.__request(
+                method, endpoint, operation, deadline, **kwargs
+            )
+
+    async def __execute(
+        self,
+        method: str,
+        endpoint: str,
+        operation: str = '',
+        deadline: Optional[Deadline] = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Executa a requisição pelo disjuntor, repetindo-a se for idempotente.
+
+        Erros de transporte e status 5xx contam como falhas do roteador.
+        Apenas operações com política de repetição são repetidas, e só
+        enquanto houver orçamento. Cada tentativa usa o timeout da
+        operação, limitado ao tempo restante do prazo. Com limitador de
+        concorrência, cada tentativa aguarda uma permissão antes do envio.
+
+        Args:
+            method: Método HTTP.
+            endpoint: Endpoint relativo à URL base.
+            operation: Nome da operação em `retry_policies` e `timeouts`.
+            deadline: Prazo da mensagem que originou a chamada (opcional).
+            **kwargs: Argumentos repassados a `httpx.AsyncClient.request`.
+
+        Returns:
+            A resposta do roteador.
+
+        Raises:
+            CircuitOpenError: Se o circuito estiver aberto.
+            LimitExceeded: Se a fila do limitador de concorrência estiver
+                cheia.
+            DeadlineExceeded: Se o prazo se esgotar antes da resposta.
+            httpx.TransportError: Se todas as tentativas falharem.
+        """
+        policy = self.retry_policies.get(operation)
+        attempts = policy.attempts if policy is not None else 1
+        self.retry_budget.deposit()
+
+        attempt = 0
+        while True:
+            await self.__acquire(operation, deadline)
+            started = time.monotonic()
+            rtt, dropped = None, False
+            try:
+                timeout = self.timeouts.get(operation, self.timeout)
+                bounded = False
+                if deadline is not None:
+                    deadline.check(operation)
+                    if deadline.remaining() < timeout:
+                        timeout, bounded = deadline.remaining(), True
+
+                try:
+                    self.circuit_breaker.before_call()
+                except Exception:
+                    self.resilience_stats.rejected += 1
+                    raise
+
+                response = None
+                try:
+                    response = await self.__send(
+                        method,
+                        endpoint,
+                        bounded,
+                        timeout=httpx.Timeout(timeout),
+                        **kwargs,
+                    )
+                except httpx.TimeoutException as e:
+                    if not bounded:
+                        dropped = True
+                        self.__record_failure()
+                        if not self.__should_retry(attempt, attempts):
+                            raise
+                    else:
+                        # O prazo acabou, não o roteador: não é falha
+                        self.circuit_breaker.abandon()
+                        raise DeadlineExceeded(
+                            'Prazo da mensagem esgotado '
+                            f'({operation or endpoint}).'
+                        ) from e
+                except httpx.TransportError:
+                    dropped = True
+                    self.__record_failure()
+                    if not self.__should_retry(attempt, attempts):
+                        raise
+                except BaseException:
+                    self.circuit_breaker.abandon()
+                    raise
+                else:
+                    if response.status_code < 500:
+                        rtt = time.monotonic() - started
+                        self.circuit_breaker.record_success()
+                        return response
+
+                    dropped = True
+                    self.__record_failure()
+                    retryable = (
+                        policy is not None
+                        and response.status_code in policy.retry_statuses
+                    )
+                    if not retryable or not self.__should_retry(
+                        attempt, attempts
+                    ):
+                        return response
+            finally:
+                if self.concurrency_limiter is not None:
+                    self.concurrency_limiter.release(rtt, dropped)
+
+            if response is not None:
+                await response.aclose()
+            delay = policy.backoff.delay(attempt)
+            if deadline is not None:
+                delay = min(delay, max(0.0, deadline.remaining()))
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def __acquire(
+        self,
+        operation: str,
+        deadline: Optional[Deadline],
+    ) -> None:
+        """
+        Aguarda uma permissão do limitador de concorrência, se houver.
+
+        A espera na fila é limitada ao tempo restante do prazo.
+        """
+        if self.concurrency_limiter is None:
+            return
+        timeout = None
+        if deadline is not None:
+            deadline.check(operation)
+            timeout = max(0.0, deadline.remaining())
+        try:
+            await self.concurrency_limiter.acquire(timeout)
+        except asyncio.TimeoutError as e:
+            raise DeadlineExceeded(
+                f'Prazo da mensagem esgotado na fila ({operation}).'
+            ) from e
+
+    async def __send(
+        self,
+        method: str,
+        endpoint: str,
+        bounded: bool,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        """
+        Envia a requisição à réplica escolhida pelo balanceador.
+
+        Timeouts encurtados pelo prazo da mensagem (`bounded`) não contam
+        contra a saúde da réplica.
+        """
+        if self.balancer is None:
+            return await self._client.request(method, endpoint, **kwargs)
+
+        replica = self.balancer.pick()
+        url = f'{replica.url}/{endpoint.lstrip("/")}'
+        self.balancer.start(replica)
+        healthy = None
+        try:
+            response = await self._client.request(method, url, **kwargs)
+            healthy = response.status_code < 500
+            return response
+        except httpx.TimeoutException:
+            healthy = None if bounded else False
+            raise
+        except httpx.TransportError:
+            healthy = False
+            raise
+        finally:
+            self.balancer.finish(replica, healthy)
+
+    def __record_failure(self) -> None:
+        self.resilience_stats.failures += 1
+        self.circuit_breaker.record_failure()
+
+    def __should_retry(self, attempt: int, attempts: int) -> bool:
+        """Indica se ainda há tentativas e orçamento para repetir."""
+        if attempt + 1 >= attempts:
+            return False
+        if not self.retry_budget.try_withdraw():
+            self.resilience_stats.budget_exhausted += 1
+            return False
+        self.resilience_stats.retries += 1
+        return True
+
     async def __aenter__(self):
         """Context manager entry."""
         return self
@@ -80,7 +556,9 @@ class RouterHTTPClient:
         """
         endpoint = '/session/'
 
-        response = await self._client.get(endpoint)
+        response = await self.__request(
+            'GET', endpoint, operation='get_all_sessions'
+        )
         response_data = RouterResponses.from_dict(response.json())
 
         if not response_data.status:
@@ -104,7 +582,9 @@ class RouterHTTPClient:
             'company_id': chat_id.company_id,
         }
 
-        response = await self._client.get(endpoint, params=params)
+        response = await self.__request(
+            'GET', endpoint, operation='get_session', params=params
+        )
         response_data = RouterResponses.from_dict(response.json())
 
         if not response_data.status:
@@ -132,8 +612,10 @@ class RouterHTTPClient:
         """
         endpoint = '/session/start/'
 
-        response = await self._client.post(
+        response = await self.__request(
+            'POST',
             endpoint,
+            operation='start_session',
             json=user_state.to_dict(),
         )
         response_data = RouterResponses.from_dict(response.json())
@@ -164,8 +646,10 @@ class RouterHTTPClient:
             'route': route,
         }
 
-        response = await self._client.post(
+        response = await self.__request(
+            'POST',
             endpoint,
+            operation='set_session_route',
             json=payload,
         )
         response_data = RouterResponses.from_dict(response.json())
@@ -202,8 +686,10 @@ class RouterHTTPClient:
             'observation': observation,
         }
 
-        response = await self._client.post(
+        response = await self.__request(
+            'POST',
             endpoint,
+            operation='update_session_observation',
             json=payload,
         )
         response_data = RouterResponses.from_dict(response.json())
@@ -220,31 +706,60 @@ class RouterHTTPClient:
     async def send_message(
         self,
         message_data: Message,
-        user_state: UserState,
+        user_state: Union[UserState, dict],
+        deadline: Optional[Deadline] = None,
     ) -> Any:
         """
         Envia uma mensagem de texto ao usuário.
 
+        Com o envio em lote habilitado, a mensagem é agrupada com as de
+        outros chats e o retorno ocorre quando o lote for confirmado; o
+        prazo é verificado apenas antes do agrupamento.
+
         Args:
             message_data: Dicionário contendo os dados da mensagem:
                 - chat_id: ID do chat (user_id, company_id)
                 - type: Tipo da mensagem
                 - detail: Conteúdo da mensagem
+            user_state: Estado do usuário destinatário, ou o dicionário
+                já no formato de `UserState.to_dict()`.
+            deadline: Prazo da mensagem que originou o envio (opcional).
 
         Returns:
             Objeto de resposta com atributo 'status' indicando sucesso/falha.
 
         Raises:
             Exception: Se houver erro na comunicação.
+            DeadlineExceeded: Se o prazo se esgotar.
         """
-        endpoint = '/messages/send/'
-
+        if isinstance(user_state, UserState):
+            user_state = user_state.to_dict()
         payload = {
             'message': message_data.to_dict(),
-            'user_state': user_state.to_dict(),
+            'user_state': user_state,
         }
-        response = await self._client.post(
+
+        if self.batcher is not None:
+            if deadline is not None:
+                deadline.check('send_message')
+            chat_id = user_state['chat_id']
+            key = (chat_id['user_id'], chat_id['company_id'])
+            return await self.batcher.submit(key, payload)
+
+        return await self.__post_message(payload, deadline)
+
+    async def __post_message(
+        self,
+        payload: dict,
+        deadline: Optional[Deadline] = None,
+    ) -> Any:
+        endpoint = '/messages/send/'
+
+        response = await self.__request(
+            'POST',
             endpoint,
+            operation='send_message',
+            deadline=deadline,
             json=payload,
         )
         response_data = RouterResponses.from_dict(response.json())
@@ -256,13 +771,52 @@ class RouterHTTPClient:
 
         return response_data
 
+    async def __post_messages(self, payloads: list[dict]) -> list[Any]:
+        """
+        Envia várias mensagens em uma única requisição.
+
+        O endpoint recebe {"messages": [...]} e responde em `data` uma
+        lista, na mesma ordem, com {"status", "message"} de cada item.
+        """
+        response = await self.__request(
+            'POST',
+            self.batch_endpoint,
+            operation='send_message',
+            json={'messages': payloads},
+        )
+        response_data = RouterResponses.from_dict(response.json())
+
+        if not response_data.status:
+            raise Exception(
+                f'Erro ao enviar mensagens: {response_data.message}'
+            )
+
+        if not isinstance(response_data.data, list):
+            raise Exception('Resposta de envio em lote mal formatada.')
+
+        results = []
+        for item in response_data.data:
+            item_data = RouterResponses.from_dict(item)
+            if item_data.status:
+                results.append(item_data)
+            else:
+                results.append(
+                    Exception(f'Erro ao enviar mensagem: {item_data.message}')
+                )
+        return results
+
     # Files Methods
-    async def get_file(self, file_id: str) -> File:
+    async def get_file(
+        self,
+        file_id: str,
+        deadline: Optional[Deadline] = None,
+    ) -> File:
         """
         Obtém um arquivo (imagem) pelo ID.
 
         Args:
             file_id: ID único do arquivo.
+            deadline: Prazo da mensagem que originou a chamada (opcional).
 
         Returns:
             Objeto de resposta com atributos 'status' e 'file_content'.
@@ -272,7 +826,9 @@ class RouterHTTPClient:
         """
         endpoint = f'/files/{file_id}/'
 
-        response = await self._client.get(endpoint)
+        response = await self.__request(
+            'GET', endpoint, operation='get_file', deadline=deadline
+        )
         response_data = RouterResponses.from_dict(response.json())
 
         if not response_data.status:
@@ -283,16 +839,22 @@ class RouterHTTPClient:
 
         return File.from_dict(response_data.data)
 
-    async def upload_file(self, file: File) -> File:
+    async def upload_file(
+        self,
+        file: File,
+        deadline: Optional[Deadline] = None,
+    ) -> File:
         """
         Faz upload de um arquivo para o servidor.
 
         Args:
             file: Instância de File contendo:
-                - name: Nome do arquivo
-                - bytes_data: Bytes do arquivo
+                - name: Nome (caminho) do arquivo
+                - bytes_data: Bytes do arquivo. Se não carregados, o
+                  arquivo local `name` é enviado em streaming do disco
                 - mime_type: Tipo MIME (opcional)
                 - expires_after_days: Dias para expiração (opcional)
+            deadline: Prazo da mensagem que originou a chamada (opcional).
 
         Returns:
             Objeto File com dados do upload realizado.
@@ -300,25 +862,98 @@ class RouterHTTPClient:
         Raises:
             Exception: Se houver erro na comunicação.
         """
-        endpoint = '/files/upload/'
-
-        if not file.bytes_data:
+        if not file.bytes_data and not (
+            file.name and os.path.isfile(file.name)
+        ):
             raise ValueError(
                 'Arquivo não carregado. Execute file.load_file() primeiro.'
             )
 
-        # Extrair nome e extensão do arquivo
         filename = file.name if file.name else 'arquivo'
+        if file.bytes_data:
+            return await self.__post_upload(
+                file, filename, file.bytes_data, deadline
+            )
+
+        # Sem bytes em memória: o arquivo é lido em blocos fora do loop
+        return await self.__post_upload(file, filename, None, deadline)
+
+    async def upload_file_from_url(
+        self,
+        file: File,
+        deadline: Optional[Deadline] = None,
+    ) -> File:
+        """
+        Solicita ao servidor que importe o arquivo diretamente da URL.
+
+        Os bytes não passam pelo bot: apenas a URL é enviada, no campo
+        `file_url` (o mesmo do UploadFileRequest do gRPC).
+
+        Args:
+            file: Instância de File com `url` preenchida.
+            deadline: Prazo da mensagem que originou a chamada (opcional).
+
+        Returns:
+            Objeto File com dados do upload realizado.
+
+        Raises:
+            Exception: Se houver erro na comunicação.
+        """
+        endpoint = '/files/upload/'
+
+        if not file.url:
+            raise ValueError('URL do arquivo não informada.')
+
+        data = {
+            'file_url': file.url,
+            'file_type': 'file',
+            'file_extension': file.extension() if file.extension() else '',
+        }
+        if file.name:
+            data['file_name'] = file.name
+        if file.expires_after_days > 0:
+            data['expiration'] = str(file.expires_after_days)
+
+        response = await self.__request(
+            'POST',
+            endpoint,
+            operation='upload_file_from_url',
+            deadline=deadline,
+            data=data,
+        )
+        response_data = RouterResponses.from_dict(response.json())
+
+        if not response_data.status:
+            raise Exception(
+                f'Erro ao importar arquivo da URL: {response_data.message}'
+            )
+
+        if not isinstance(response_data.data, dict):
+            raise Exception('Resposta de upload de arquivo mal formatada.')
+
+        return File.from_dict(response_data.data)
+
+    async def __post_upload(
+        self,
+        file: File,
+        filename: str,
+        content: Optional[bytes],
+        deadline: Optional[Deadline] = None,
+    ) -> File:
+        endpoint = '/files/upload/'
+
+        # Extrair extensão do arquivo
         extension = file.extension() if file.extension() else ''
 
         # Preparar dados como multipart/form-data
-        files = {
-            'content': (
-                filename,
-                file.bytes_data,
-                file.mime_type or 'application/octet-stream',
+        mime_type = file.mime_type or 'application/octet-stream'
+        if content is not None:
+            body = {'files': {'content': (filename, content, mime_type)}}
+        else:
+            stream = _MultipartFileStream(
+                file.name, 'content', filename, mime_type
             )
-        }
+            body = {'content': stream, 'headers': stream.headers}
 
         # Dados adicionais como form data
         data = {
@@ -330,9 +965,12 @@ class RouterHTTPClient:
         if file.expires_after_days > 0:
             data['expiration'] = str(file.expires_after_days)
 
-        response = await self._client.post(
+        response = await self.__request(
+            'POST',
             endpoint,
-            files=files,
+            operation='upload_file',
+            deadline=deadline,
+            **body,
             # data=data,
         )
         response_data = RouterResponses.from_dict(response.json())
@@ -363,7 +1001,9 @@ class RouterHTTPClient:
         """
         endpoint = f'/files/{file_id}'
 
-        response = await self._client.delete(endpoint)
+        response = await self.__request(
+            'DELETE', endpoint, operation='delete_file'
+        )
         response_data = RouterResponses.from_dict(response.json())
 
         if not response_data.status:
@@ -402,8 +1042,10 @@ class RouterHTTPClient:
             'origin': origin,
         }
 
-        response = await self._client.post(
+        response = await self.__request(
+            'POST',
             endpoint,
+            operation='end_chat',
             json=payload,
         )
         response_data = RouterResponses.from_dict(response.json())
@@ -419,24 +1061,70 @@ class RouterHTTPClient:
         end_action_name: str = '',
     ) -> Any:
         """
-        Obtém uma ação de encerramento pelo ID.
+        Obtém uma ação de encerramento pelo ID ou nome.
+
+        O resultado é mantido em cache (TTL/LRU) e consultas simultâneas
+        da mesma ação compartilham uma única requisição.
 
         Args:
             end_action_id: ID único da ação de encerramento.
+            end_action_name: Nome da ação de encerramento.
 
         Returns:
-            Objeto de resposta com atributos 'status' e 'end_action'.
+            Cópia da EndAction, que pode ser alterada livremente.
 
         Raises:
             Exception: Se houver erro na comunicação.
         """
+        key = (self.base_url, end_action_id, end_action_name)
+        end_action = await self.end_action_cache.get_or_load(
+            key,
+            lambda: self.__fetch_end_action(end_action_id, end_action_name),
+        )
+        return replace(end_action)
+
+    async def preload_end_actions(self, names: Iterable[str]) -> int:
+        """
+        Carrega antecipadamente as ações de encerramento no cache.
+
+        Args:
+            names: Nomes das ações de encerramento.
+
+        Returns:
+            Quantidade de ações carregadas com sucesso.
+        """
+        names = [name for name in names if name]
+        results = await asyncio.gather(
+            *(self.get_end_action(end_action_name=name) for name in names),
+            return_exceptions=True,
+        )
+
+        loaded = 0
+        for name, result in zip(names, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    'Erro ao pré-carregar ação de encerramento %s: %s',
+                    name,
+                    result,
+                )
+            else:
+                loaded += 1
+        return loaded
+
+    async def __fetch_end_action(
+        self,
+        end_action_id: str,
+        end_action_name: str,
+    ) -> EndAction:
         endpoint = '/end_actions/'
         params = {
             'id': end_action_id,
             'name': end_action_name,
         }
 
-        response = await self._client.get(endpoint, params=params)
+        response = await self.__request(
+            'GET', endpoint, operation='get_end_action', params=params
+        )
         response_data = RouterResponses.from_dict(response.json())
 
         if not response_data.status:
@@ -447,11 +1135,26 @@ class RouterHTTPClient:
         if not isinstance(response_data.data, dict):
             raise Exception('Resposta de ação de encerramento mal formatada.')
 
-        return EndAction.from_dict(response_data.data)
+        end_action = EndAction.from_dict(response_data.data)
+
+        # A mesma ação também fica disponível pelo ID e pelo nome
+        if end_action.id:
+            self.end_action_cache.set(
+                (self.base_url, end_action.id, ''), end_action
+            )
+        if end_action.name:
+            self.end_action_cache.set(
+                (self.base_url, '', end_action.name), end_action
+            )
+        return end_action
 
     # ToDo Methods
     async def transfer_to_menu(
-        self, chat_id: ChatID, menu: Menu, mensagem: Message
+        self,
+        chat_id: ChatID,
+        menu: Menu,
+        mensagem: Message,
+        deadline: Optional[Deadline] = None,
     ) -> Any:
         """
         Transfere o chat para outro menu do fluxo.
@@ -461,6 +1164,7 @@ class RouterHTTPClient:
                 - chat_id: ID do chat (user_id, company_id)
                 - menu: Nome do menu de destino
                 - user_message: Mensagem do usuário
+            deadline: Prazo da mensagem que originou a chamada (opcional).
 
         Returns:
             Objeto de resposta com atributo 'status' indicando sucesso/falha.
@@ -476,11 +1180,16 @@ class RouterHTTPClient:
             'mensagem': mensagem.to_dict(),
         }
 
-        response = await self._client.post(
+        response = await self.__request(
+            'POST',
             endpoint,
+            operation='transfer_to_menu',
+            deadline=deadline,
             json=payload,
         )
-        print(f'Status: {response.status_code} | Body: {response.text!r}')
+        logger.debug(
+            'Status: %s | Body: %r', response.status_code, response.text
+        )
         response_data = RouterResponses.from_dict(response.json())
 
         if not response_data.status:
@@ -0,0 +1,193 @@
+"""
+Agrupamento (micro-batching) de envios ao roteador.
+
+Envios de vários handlers concorrentes são reunidos em uma janela curta
+de tempo ou tamanho e enviados em uma única requisição. Cada chamador
+recebe o seu próprio resultado.
+"""
+
+import asyncio
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+SendOne = Callable[[dict], Awaitable[Any]]
+SendMany = Callable[[list[dict]], Awaitable[list[Any]]]
+
+
+@dataclass
+class BatcherStats:
+    """
+    Métricas do agrupador.
+
+    Attributes:
+        submitted: Itens recebidos
+        batches: Requisições em lote enviadas
+        singles: Itens enviados individualmente (lote de um item)
+        deferred: Itens adiados para preservar a ordem do chat
+    """
+
+    submitted: int = 0
+    batches: int = 0
+    singles: int = 0
+    deferred: int = 0
+
+
+class SendBatcher:
+    """
+    Agrupa itens em lotes, preservando a ordem por chave (chat).
+
+    Um lote é enviado quando atinge `max_batch` itens ou `max_delay`
+    segundos após o primeiro item. Enquanto um item de um chat está em um
+    lote em andamento, os próximos itens do mesmo chat aguardam, de modo
+    que lotes concorrentes nunca invertem a ordem de um chat.
+
+    Attributes:
+        max_batch: Quantidade máxima de itens por lote.
+        max_delay: Espera máxima antes de enviar um lote, em segundos.
+        stats: Métricas acumuladas do agrupador.
+    """
+
+    def __init__(
+        self,
+        send_one: SendOne,
+        send_many: SendMany,
+        max_batch: int = 50,
+        max_delay: float = 0.005,
+    ) -> None:
+        """
+        Inicializa o agrupador.
+
+        Args:
+            send_one: Envia um único item e retorna seu resultado.
+            send_many: Envia uma lista de itens e retorna um resultado
+                por item, na mesma ordem. Resultados que sejam exceções
+                são repassados apenas ao chamador correspondente.
+            max_batch: Quantidade máxima de itens por lote.
+            max_delay: Espera máxima antes de enviar um lote, em segundos.
+        """
+        if max_batch < 1:
+            raise ValueError('max_batch deve ser maior que zero.')
+
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.stats = BatcherStats()
+        self.__send_one = send_one
+        self.__send_many = send_many
+        self.__buffer: list[tuple[Hashable, dict, asyncio.Future]] = []
+        self.__deferred: dict[Hashable, deque] = {}
+        self.__in_flight: dict[Hashable, int] = {}
+        self.__timer: asyncio.TimerHandle | None = None
+        self.__tasks: set[asyncio.Task] = set()
+
+    async def submit(self, key: Hashable, item: dict) -> Any:
+        """
+        Agenda o envio do item e aguarda o seu resultado.
+
+        Args:
+            key: Chave de ordenação (ex: user_id + company_id).
+            item: Item a enviar.
+
+        Returns:
+            O resultado do envio do item.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self.stats.submitted += 1
+
+        if key in self.__in_flight or key in self.__deferred:
+            self.__deferred.setdefault(key, deque()).append((item, future))
+            self.stats.deferred += 1
+        else:
+            self.__add(key, item, future)
+
+        return await future
+
+    async def flush(self) -> None:
+        """Envia o lote pendente e aguarda os lotes em andamento."""
+        while self.__buffer or self.__tasks:
+            if self.__buffer:
+                self.__flush()
+            if self.__tasks:
+                await asyncio.gather(*self.__tasks, return_exceptions=True)
+
+    def __add(self, key: Hashable, item: dict, future: asyncio.Future):
+        self.__buffer.append((key, item, future))
+        if len(self.__buffer) >= self.max_batch:
+            self.__flush()
+        elif self.__timer is None:
+            loop = asyncio.get_running_loop()
+            self.__timer = loop.call_later(self.max_delay, self.__flush)
+
+    def __flush(self) -> None:
+        if self.__timer is not None:
+            self.__timer.cancel()
+            self.__timer = None
+        if not self.__buffer:
+            return
+
+        batch, self.__buffer = self.__buffer, []
+        for key, _, _ in batch:
+            self.__in_flight[key] = self.__in_flight.get(key, 0) + 1
+
+        task = asyncio.create_task(self.__send(batch))
+        self.__tasks.add(task)
+        task.add_done_callback(self.__tasks.discard)
+
+    async def __send(self, batch: list) -> None:
+        results = None
+        try:
+            if len(batch) == 1:
+                self.stats.singles += 1
+                results = [await self.__capture(batch[0][1])]
+            else:
+                self.stats.batches += 1
+                items = [item for _, item, _ in batch]
+                results = await self.__send_many(items)
+                if len(results) != len(batch):
+                    raise Exception(
+                        f'Resposta em lote com {len(results)} itens, '
+                        f'esperado {len(batch)}.'
+                    )
+        except Exception as e:
+            results = [e] * len(batch)
+        finally:
+            # Cancelado (ex: encerramento): os chamadores são cancelados e
+            # o chat é liberado, sem travar os próximos envios
+            if results is None:
+                for _, _, future in batch:
+                    future.cancel()
+            self.__resolve(batch, results or [])
+            for key, _, _ in batch:
+                self.__release(key)
+
+    @staticmethod
+    def __resolve(batch: list, results: list) -> None:
+        """Entrega a cada chamador o resultado do seu item."""
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    async def __capture(self, item: dict) -> Any:
+        try:
+            return await self.__send_one(item)
+        except Exception as e:
+            return e
+
+    def __release(self, key: Hashable) -> None:
+        """Libera o próximo item adiado do chat após o fim do lote."""
+        remaining = self.__in_flight[key] - 1
+        if remaining:
+            self.__in_flight[key] = remaining
+            return
+        del self.__in_flight[key]
+
+        deferred = self.__deferred.get(key)
+        if deferred:
+            item, future = deferred.popleft()
+            if not deferred:
+                del self.__deferred[key]
+            self.__add(key, item, future)
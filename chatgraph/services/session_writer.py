@@ -0,0 +1,150 @@
+"""
+Escrita ordenada do estado da sessão no roteador.
+
+Este módulo contém o SessionStateWriter, que substitui as tarefas
+"fire-and-forget" de atualização de observação por uma fila limitada e
+ordenada por chat, que pode ser aguardada antes do ack da mensagem.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Hashable
+
+from ..logger.logger import logger
+from ..models.userstate import ChatID
+from .router_http_client import RouterHTTPClient
+
+
+@dataclass
+class SessionWriterStats:
+    """
+    Métricas do escritor de sessão.
+
+    Attributes:
+        written: Observações enviadas ao roteador
+        coalesced: Observações substituídas por uma mais recente na fila
+        failed: Envios que terminaram em erro
+    """
+
+    written: int = 0
+    coalesced: int = 0
+    failed: int = 0
+
+
+class SessionStateWriter:
+    """
+    Escritor de observações com uma fila FIFO limitada por chat.
+
+    As escritas de um mesmo chat são enviadas em ordem por um único
+    worker. Como o endpoint de observação substitui o documento inteiro,
+    apenas o snapshot mais recente da fila precisa ser enviado: os
+    anteriores, ainda não enviados, são descartados. Snapshots já
+    enviados não são lembrados, pois o valor no roteador pode ter mudado
+    desde então (nova sessão, outro processo).
+
+    Attributes:
+        max_pending: Tamanho máximo da fila de cada chat.
+        stats: Métricas acumuladas do escritor.
+    """
+
+    def __init__(
+        self,
+        router_client: RouterHTTPClient,
+        max_pending: int = 64,
+    ) -> None:
+        """
+        Inicializa o escritor.
+
+        Args:
+            router_client: Cliente HTTP do roteador.
+            max_pending: Tamanho máximo da fila de cada chat.
+        """
+        if max_pending < 1:
+            raise ValueError('max_pending deve ser maior que zero.')
+
+        self.max_pending = max_pending
+        self.stats = SessionWriterStats()
+        self.__router_client = router_client
+        self.__queues: dict[Hashable, asyncio.Queue] = {}
+        self.__workers: dict[Hashable, asyncio.Task] = {}
+
+    @property
+    def pending(self) -> int:
+        """Quantidade de observações aguardando envio."""
+        return sum(queue.qsize() for queue in self.__queues.values())
+
+    def write_observation(self, chat_id: ChatID, observation: str) -> None:
+        """
+        Enfileira a observação do chat para envio.
+
+        Com a fila cheia, o snapshot mais antigo é descartado: o novo o
+        substitui por completo.
+
+        Args:
+            chat_id: Identificador do chat.
+            observation: Observação completa (JSON) da sessão.
+        """
+        key = self.__key(chat_id)
+        queue = self.__queues.get(key)
+        if queue is None:
+            queue = self.__queues[key] = asyncio.Queue(self.max_pending)
+
+        if queue.full():
+            queue.get_nowait()
+            queue.task_done()
+            self.stats.coalesced += 1
+        queue.put_nowait((chat_id, observation))
+
+        if key not in self.__workers:
+            self.__workers[key] = asyncio.create_task(self.__drain(key))
+
+    async def flush(self, chat_id: ChatID | None = None) -> None:
+        """
+        Aguarda o envio das observações enfileiradas.
+
+        Args:
+            chat_id: Chat a aguardar. Se omitido, aguarda todos.
+        """
+        if chat_id is None:
+            queues = list(self.__queues.values())
+        else:
+            queues = [self.__queues.get(self.__key(chat_id))]
+
+        for queue in queues:
+            if queue is not None:
+                await queue.join()
+
+    async def __drain(self, key: Hashable) -> None:
+        """Envia, em ordem, as observações enfileiradas para um chat."""
+        queue = self.__queues[key]
+        try:
+            while not queue.empty():
+                chat_id, observation = queue.get_nowait()
+                taken = 1
+                while not queue.empty():
+                    chat_id, observation = queue.get_nowait()
+                    taken += 1
+                self.stats.coalesced += taken - 1
+
+                try:
+                    await self.__router_client.update_session_observation(
+                        chat_id, observation
+                    )
+                    self.stats.written += 1
+                except Exception as e:
+                    self.stats.failed += 1
+                    logger.error('Erro ao atualizar observação: %s', e)
+                finally:
+                    for _ in range(taken):
+                        queue.task_done()
+        finally:
+            # Itens não enviados (ex: worker cancelado) liberam o flush
+            while not queue.empty():
+                queue.get_nowait()
+                queue.task_done()
+            del self.__queues[key]
+            del self.__workers[key]
+
+    @staticmethod
+    def __key(chat_id: ChatID) -> tuple[str, str]:
+        return chat_id.user_id, chat_id.company_id
@@ -0,0 +1,105 @@
+"""
+Coalescência de chamadas concorrentes idênticas (singleflight).
+
+Enquanto uma chamada de uma chave está em andamento, as demais chamadas
+da mesma chave aguardam e recebem o mesmo resultado, em vez de repetir
+o trabalho.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+@dataclass
+class SingleFlightStats:
+    """
+    Métricas da coalescência.
+
+    Attributes:
+        hits: Chamadas que aproveitaram uma chamada já em andamento
+        misses: Chamadas executadas de fato
+    """
+
+    hits: int = 0
+    misses: int = 0
+
+
+class SingleFlight:
+    """
+    Compartilha o resultado de chamadas concorrentes da mesma chave.
+
+    Nada é armazenado após o término da chamada: apenas chamadas
+    simultâneas são coalescidas. Erros são repassados a todos os que
+    aguardavam; se a chamada original for cancelada, quem aguardava
+    tenta novamente.
+
+    Attributes:
+        stats: Métricas acumuladas da coalescência.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa sem chamadas em andamento."""
+        self.stats = SingleFlightStats()
+        self.__calls: dict[Hashable, asyncio.Future] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """Chaves com chamada em andamento."""
+        return len(self.__calls)
+
+    async def do(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        """
+        Executa a chamada ou aguarda a que já está em andamento.
+
+        Args:
+            key: Chave que identifica chamadas equivalentes.
+            call: Função sem argumentos que executa a chamada.
+            timeout: Espera máxima por uma chamada em andamento, em
+                segundos (opcional).
+
+        Returns:
+            O resultado da chamada.
+
+        Raises:
+            asyncio.TimeoutError: Se a espera pela chamada em andamento
+                exceder `timeout`.
+        """
+        loop = asyncio.get_running_loop()
+        running = self.__calls.get(key)
+        if running is not None and running.get_loop() is loop:
+            self.stats.hits += 1
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(running), timeout
+                )
+            except asyncio.CancelledError:
+                if not running.cancelled():
+                    raise
+                # A chamada original foi cancelada: tenta novamente
+                return await self.do(key, call, timeout)
+
+        self.stats.misses += 1
+        future = loop.create_future()
+        self.__calls[key] = future
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Evita o aviso de exceção não consumida sem aguardadores
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            if self.__calls.get(key) is future:
+                del self.__calls[key]
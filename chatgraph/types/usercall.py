@@ -1,15 +1,21 @@
-import json
 import asyncio
 import concurrent.futures
+from collections import deque
+from dataclasses import replace
+from chatgraph.services.deadline import Deadline, DeadlineExceeded
+from chatgraph.services.downloads import fetch_etag
+from chatgraph.services.file_cache import FILE_CACHE, FileCache, Fingerprint
+from chatgraph.services.rate_limiter import KeyedRateLimiter
 from chatgraph.services.router_http_client import RouterHTTPClient
-from chatgraph.models.userstate import Menu, UserState
+from chatgraph.services.session_writer import SessionStateWriter
+from chatgraph.models.userstate import ChatID, Menu, UserState
 from chatgraph.models.message import (
     Message,
     File,
     MessageTypes,
 )
-from typing import Optional
-from rich.console import Console
+from chatgraph.logger.logger import console, logger
+from typing import Awaitable, Callable, Hashable, Optional
 
 
 class UserCall:
@@ -31,26 +37,154 @@ class UserCall:
         user_state: UserState,
         message: Message,
         router_client: RouterHTTPClient,
+        rate_limiter: Optional[KeyedRateLimiter] = None,
+        write_behind: bool = False,
+        state_writer: Optional[SessionStateWriter] = None,
+        file_cache: Optional[FileCache] = None,
+        upload_by_url: bool = False,
+        pipeline_sends: bool = False,
+        deadline: Optional[Deadline] = None,
     ) -> None:
-        self.type = type
+        self.__setup(
+            router_client,
+            rate_limiter,
+            write_behind,
+            state_writer,
+            file_cache,
+            upload_by_url,
+            pipeline_sends,
+            deadline,
+        )
         self.__message = message
         self.__user_state = user_state
-        self.__router_client = router_client
+        self.__raw_state: dict = {}
+        self.__raw_message: dict = {}
         self.__content_message = self.__message.text_message.detail
-        self.console = Console()
+
+    def __setup(
+        self,
+        router_client: RouterHTTPClient,
+        rate_limiter: Optional[KeyedRateLimiter],
+        write_behind: bool,
+        state_writer: Optional[SessionStateWriter],
+        file_cache: Optional[FileCache],
+        upload_by_url: bool,
+        pipeline_sends: bool,
+        deadline: Optional[Deadline],
+    ) -> None:
+        """Inicializa os atributos comuns aos modos eager e lazy."""
+        self.type = type
+        self.__chat_id: Optional[ChatID] = None
+        self.__router_client = router_client
+        self.__rate_limiter = rate_limiter
+        self.__write_behind = write_behind
+        self.__state_writer = state_writer or SessionStateWriter(
+            router_client
+        )
+        self.__file_cache = file_cache or FILE_CACHE
+        self.__upload_by_url = upload_by_url
+        self.__pipeline_sends = pipeline_sends
+        self.__deadline = deadline
+        self.__outbox: deque = deque()
+        self.__outbox_task: Optional[asyncio.Task] = None
+        self.__outbox_error: Optional[Exception] = None
+        self.__pending_routes: list[str] = []
+        self.__observation_dirty = False
+        self.console = console
+
+    @classmethod
+    def from_dict(
+        cls,
+        data: dict,
+        router_client: RouterHTTPClient,
+        rate_limiter: Optional[KeyedRateLimiter] = None,
+        write_behind: bool = False,
+        state_writer: Optional[SessionStateWriter] = None,
+        file_cache: Optional[FileCache] = None,
+        upload_by_url: bool = False,
+        pipeline_sends: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> 'UserCall':
+        """
+        Cria um UserCall a partir da entrega decodificada, em modo lazy.
+
+        Os modelos (UserState, Menu, User, Message, Button...) só são
+        construídos no primeiro acesso a uma propriedade que dependa deles.
+        `content_message`, `route` e os identificadores do chat são lidos
+        diretamente do dicionário.
+
+        Args:
+            data: Dicionário com as chaves 'user_state' e 'message'.
+            router_client: Cliente HTTP do roteador.
+            rate_limiter: Limitador de envio de mensagens (opcional).
+            write_behind: Acumula rota e observação até o `flush()`.
+            state_writer: Escritor de observações compartilhado (opcional).
+            file_cache: Cache de arquivos (padrão: FILE_CACHE).
+            upload_by_url: Servidor importa arquivos com url diretamente.
+            pipeline_sends: `send()` enfileira e retorna imediatamente.
+            deadline: Prazo da mensagem; envios, arquivos e
+                transferências após o prazo falham com DeadlineExceeded.
+        """
+        usercall = cls.__new__(cls)
+        usercall.__setup(
+            router_client,
+            rate_limiter,
+            write_behind,
+            state_writer,
+            file_cache,
+            upload_by_url,
+            pipeline_sends,
+            deadline,
+        )
+        usercall.__message = None
+        usercall.__user_state = None
+        usercall.__raw_state = data.get('user_state') or {}
+        usercall.__raw_message = data.get('message') or {}
+        text_message = usercall.__raw_message.get('text_message') or {}
+        usercall.__content_message = text_message.get('detail', '')
+        return usercall
 
     def __str__(self):
         return (
-            f'UserCall(UserState={self.__user_state}, '
-            f'Message={self.__message})'
+            f'UserCall(UserState={self.user_state}, '
+            f'Message={self.message})'
         )
 
+    @property
+    def user_state(self) -> UserState:
+        """Estado do usuário, construído no primeiro acesso."""
+        if self.__user_state is None:
+            self.__user_state = UserState.from_dict(self.__raw_state)
+        return self.__user_state
+
+    @property
+    def message(self) -> Message:
+        """Mensagem recebida, construída no primeiro acesso."""
+        if self.__message is None:
+            self.__message = Message.from_dict(self.__raw_message)
+        return self.__message
+
+    def __state_payload(self) -> UserState | dict:
+        """Estado a enviar: o recebido, sem construir o modelo, se intacto."""
+        if self.__user_state is not None:
+            return self.__user_state
+        return UserState.normalize_dict(self.__raw_state)
+
+    @property
+    def deadline(self) -> Optional[Deadline]:
+        """Prazo da mensagem, derivado do TTL da fila (opcional)."""
+        return self.__deadline
+
     async def __get_file_from_server(self, hash_id: str) -> Optional[File]:
         try:
-            file = await self.__router_client.get_file(hash_id)
+            file = await self.__router_client.get_file(
+                hash_id, deadline=self.__deadline
+            )
             if not file.url:
                 return None
             return file
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             # self.console.print(f'Erro ao obter arquivo do servidor: {e}')
             return None
@@ -59,47 +193,151 @@ class UserCall:
         self, file: File
     ) -> tuple[bool, str, Optional[File]]:
         try:
-            uploaded_file = await self.__router_client.upload_file(file)
+            uploaded_file = await self.__router_client.upload_file(
+                file, deadline=self.__deadline
+            )
             return True, 'Upload successful', uploaded_file
+        except DeadlineExceeded:
+            raise
         except Exception as e:
-            self.console.print(f'Erro ao enviar arquivo para o servidor: {e}')
+            logger.error('Erro ao enviar arquivo para o servidor: %s', e)
             return False, str(e), None
 
     async def __check_file_for_send(self, file: str | File) -> File:
+        if isinstance(file, str):
+            file = File(name=file)
+
+        # Arquivo remoto importado pelo servidor, sem download no bot
+        if file.url and self.__upload_by_url:
+            cached = self.__file_cache.get_url_file(file.url)
+            if cached is not None and not (
+                self.__file_cache.needs_revalidation(file.url)
+            ):
+                return cached[0]
+            # Envios simultâneos da mesma URL fazem uma única importação
+            return await self.__load_once(
+                ('url', file.url), lambda: self.__import_from_url(file)
+            )
+
+        # Arquivo local já visto (mesmo caminho, tamanho e mtime)
+        fingerprint = None
+        if file.name and not file.url:
+            fingerprint = self.__file_cache.fingerprint(file.name)
+        if fingerprint is not None:
+            hash_id = self.__file_cache.hash_for(fingerprint)
+            cached = self.__file_cache.get_file(hash_id) if hash_id else None
+            if cached is not None:
+                return cached
+            # Evita reler o arquivo apenas para recalcular o hash
+            file.hash_id = hash_id or file.hash_id
+            # Envios simultâneos do mesmo arquivo fazem um único upload
+            return await self.__load_once(
+                fingerprint, lambda: self.__resolve_file(file, fingerprint)
+            )
+
+        return await self.__resolve_file(file, None)
+
+    async def __load_once(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[File]],
+    ) -> File:
         try:
-            if isinstance(file, str):
-                file = File(name=file)
+            shared = await self.__file_cache.load_once(key, loader)
+        except DeadlineExceeded:
+            if self.__deadline is None or not self.__deadline.expired:
+                # O prazo esgotado era o de outra mensagem: tenta de novo
+                return await self.__load_once(key, loader)
+            raise
+        return replace(shared)
+
+    async def __import_from_url(self, file: File) -> File:
+        cached = self.__file_cache.get_url_file(file.url)
+        if cached is not None:
+            cached_file, cached_etag = cached
+            if not self.__file_cache.needs_revalidation(file.url):
+                return cached_file
+            # Revalida com a origem: reimporta apenas se o ETag mudou
+            etag = await fetch_etag(file.url, cached_etag)
+            if etag is None or etag == cached_etag:
+                self.__file_cache.mark_revalidated(file.url)
+                return cached_file
 
-            await file.load_file()
+        try:
+            uploaded, etag = await asyncio.gather(
+                self.__router_client.upload_file_from_url(
+                    file, deadline=self.__deadline
+                ),
+                fetch_etag(file.url),
+            )
+        except DeadlineExceeded:
+            raise
+        except Exception as e:
+            raise ValueError('Erro ao enviar arquivo: ' + str(e))
+
+        self.__file_cache.remember_url_file(file.url, uploaded, etag)
+        return uploaded
+
+    async def __resolve_file(
+        self,
+        file: File,
+        fingerprint: Optional[Fingerprint],
+    ) -> File:
+        try:
+            # Arquivos locais não ficam em memória: o upload é em streaming
+            await file.load_hash()
         except Exception as e:
             raise ValueError('Erro ao criar File: ' + str(e))
 
         if not file.hash_id:
             raise ValueError('Hash do arquivo não gerado.')
 
-        if not file.bytes_data:
-            raise ValueError('Dados do arquivo em bytes não carregados.')
+        if fingerprint is not None:
+            self.__file_cache.remember_hash(fingerprint, file.hash_id)
+
+        cached = self.__file_cache.get_file(file.hash_id)
+        if cached is not None:
+            return cached
 
-        existing_file = await self.__get_file_from_server(file.hash_id)
-        if existing_file:
-            return existing_file
+        return await self.__load_once(
+            file.hash_id, lambda: self.__fetch_or_upload(file)
+        )
+
+    async def __fetch_or_upload(self, file: File) -> File:
+        cached = self.__file_cache.get_file(file.hash_id)
+        if cached is not None:
+            return cached
+
+        if not self.__file_cache.is_missing(file.hash_id):
+            existing_file = await self.__get_file_from_server(file.hash_id)
+            if existing_file:
+                self.__file_cache.remember_file(file.hash_id, existing_file)
+                return existing_file
+            self.__file_cache.remember_missing(file.hash_id)
 
         status, msg, uploaded = await self.__upload_file(file)
         if not status or not uploaded:
             raise ValueError('Erro ao enviar arquivo: ' + msg)
 
+        self.__file_cache.remember_file(file.hash_id, uploaded)
         return uploaded
 
     async def __send(self, message: Message) -> None:
         try:
+            if self.__rate_limiter is not None:
+                key = self.__rate_limiter.key_for_chat(
+                    self.chatID, self.platform
+                )
+                await self.__rate_limiter.acquire(key)
+
             response = await self.__router_client.send_message(
-                message, self.__user_state
+                message, self.__state_payload(), deadline=self.__deadline
             )
 
             if response:
-                self.console.print(f'Mensagem enviada com sucesso: {response}')
-
-            await asyncio.sleep(0.1)
+                logger.debug('Mensagem enviada com sucesso: %s', response)
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             raise Exception(f'Erro ao enviar mensagem: {e}')
 
@@ -110,9 +348,51 @@ class UserCall:
         """
         Envia uma mensagem ao cliente.
 
+        Com `pipeline_sends`, a mensagem entra na fila de saída do chat e
+        o método retorna imediatamente; um worker envia a fila em ordem.
+        Erros de envio são levantados pelo próximo `send()` ou pelo
+        `flush()`, e as mensagens seguintes da fila são descartadas. A
+        mensagem não deve ser alterada após ser enfileirada.
+
         Args:
             message (Message|Button|ListElements): A mensagem a ser enviada.
+
+        Raises:
+            DeadlineExceeded: Se o prazo da mensagem recebida se esgotou.
         """
+        valid = isinstance(message, (Message, File))
+        if not valid and not isinstance(message, MessageTypes):
+            raise ValueError('Tipo de mensagem inválido.')
+
+        if not self.__pipeline_sends:
+            await self.__deliver(message)
+            return
+
+        self.__raise_outbox_error()
+        self.__outbox.append(message)
+        if self.__outbox_task is None:
+            self.__outbox_task = asyncio.create_task(self.__drain_outbox())
+
+    async def __drain_outbox(self) -> None:
+        """Envia, em ordem, as mensagens da fila de saída."""
+        try:
+            while self.__outbox:
+                await self.__deliver(self.__outbox.popleft())
+        except Exception as e:
+            self.__outbox_error = e
+            self.__outbox.clear()
+        finally:
+            self.__outbox_task = None
+
+    def __raise_outbox_error(self) -> None:
+        error, self.__outbox_error = self.__outbox_error, None
+        if error is not None:
+            raise error
+
+    async def __deliver(self, message: MessageTypes | Message | File):
+        if self.__deadline is not None:
+            self.__deadline.check('send')
+
         if isinstance(message, MessageTypes):
             msg = Message(str(message))
             await self.__send(msg)
@@ -120,19 +400,14 @@ class UserCall:
 
         if isinstance(message, Message):
             if message.has_file() and message.file:
-                message.file = await self.__check_file_for_send(
-                    message.file.name
-                )
+                message.file = await self.__check_file_for_send(message.file)
             await self.__send(message)
             return
 
         if isinstance(message, File):
-            file = await self.__check_file_for_send(message.name)
+            file = await self.__check_file_for_send(message)
             file_message = Message(file=file)
             await self.__send(file_message)
-            return
-
-        raise ValueError('Tipo de mensagem inválido.')
 
     async def end_chat(
         self,
@@ -140,6 +415,7 @@ class UserCall:
         end_action_name: str = '',
         observation: str = '',
     ) -> None:
+        await self.flush()
         try:
             end_action = await self.__router_client.get_end_action(
                 end_action_id,
@@ -150,7 +426,7 @@ class UserCall:
                 end_action.observation = observation
 
             await self.__router_client.end_chat(
-                self.__user_state.chat_id,
+                self.chatID,
                 end_action,
                 'chatgraph',
             )
@@ -160,48 +436,92 @@ class UserCall:
                 'Erro ao realizar ação de encerramento: ' + str(e)
             )
 
-    async def set_observation(self, observation: str = '') -> None:
-        try:
-            if not observation and self.__user_state.observation:
-                observation = self.__user_state.observation
+    async def flush(self) -> None:
+        """
+        Envia ao roteador as alterações de estado pendentes.
+
+        Aguarda o envio das mensagens da fila de saída (`pipeline_sends`)
+        e, no modo write-behind, envia de uma só vez as chamadas de
+        `set_route` e as alterações de observação acumuladas no handler:
+        cada trecho de rota, na ordem em que foi definido, e apenas a
+        observação final. Também aguarda as escritas de observação já
+        enfileiradas. Chamado automaticamente
+        ao fim de `ChatbotApp.process_message`.
+
+        Raises:
+            Exception: Se o envio de uma mensagem da fila falhou.
+        """
+        if self.__outbox_task is not None:
+            await asyncio.shield(self.__outbox_task)
 
-            await self.__router_client.update_session_observation(
-                self.__user_state.chat_id,
-                observation,
+        routes, self.__pending_routes = self.__pending_routes, []
+        if self.__observation_dirty:
+            self.__observation_dirty = False
+            if self.user_state.dirty_observation_keys:
+                self.__write_observation()
+
+        updates = [self.__state_writer.flush(self.chatID)]
+        if routes:
+            updates.append(self.__push_routes(routes))
+
+        await asyncio.gather(*updates)
+        self.__raise_outbox_error()
+
+    async def __push_routes(self, routes: list[str]) -> None:
+        # O roteador acumula os trechos: a ordem das chamadas importa
+        for current_route in routes:
+            await self.__push_route(current_route)
+
+    async def __push_route(self, current_route: str) -> None:
+        try:
+            await self.__router_client.set_session_route(
+                self.user_state.chat_id,
+                current_route,
             )
         except Exception as e:
-            self.console.print(f'Erro ao atualizar observação: {e}')
+            raise ValueError(f'Erro ao atualizar rota: {e}')
+
+    def __write_observation(self, observation: str = '') -> None:
+        if not observation:
+            observation = self.user_state.flush_observation() or ''
+        self.__state_writer.write_observation(self.chatID, observation)
+
+    async def set_observation(self, observation: str = '') -> None:
+        self.__write_observation(observation)
+        await self.__state_writer.flush(self.chatID)
 
     async def add_observation(self, observation: dict) -> None:
         try:
-            current_observation = self.observation
-            current_observation.update(observation)
-            self.__user_state.observation = json.dumps(current_observation)
+            self.user_state.update_observation(observation)
+            if self.__write_behind:
+                self.__observation_dirty = True
+                return
             await self.set_observation()
         except Exception as e:
             raise ValueError(f'Erro ao adicionar observação: {e}')
 
     async def set_route(self, current_route: str):
-        try:
-            if not current_route:
-                raise ValueError('Rota atual não pode ser vazia.')
+        if not current_route:
+            raise ValueError(
+                'Erro ao atualizar rota: Rota atual não pode ser vazia.'
+            )
 
-            if not self.__user_state.route:
-                self.__user_state.route = 'start'
+        if not self.user_state.route:
+            self.user_state.route = 'start'
 
-            self.__user_state.route += f'.{current_route}'
-            await self.__router_client.set_session_route(
-                self.__user_state.chat_id,
-                current_route,
-            )
-        except Exception as e:
-            raise ValueError(f'Erro ao atualizar rota: {e}')
+        self.user_state.route += f'.{current_route}'
+        if self.__write_behind:
+            self.__pending_routes.append(current_route)
+            return
+
+        await self.__push_route(current_route)
 
     async def transfer_to_menu(
         self,
         menu_name: str,
         user_message: str,
     ) -> None:
+        await self.flush()
         try:
             if not menu_name:
                 raise ValueError('Menu de destino não pode ser vazio.')
@@ -210,36 +530,57 @@ class UserCall:
             message = Message(text_message=user_message)
 
             await self.__router_client.transfer_to_menu(
-                self.__user_state.chat_id,
+                self.chatID,
                 menu,
                 message,
+                deadline=self.__deadline,
             )
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             raise ValueError(f'Erro ao transferir para menu: {e}')
 
     @property
     def chatID(self):
-        return self.__user_state.chat_id
+        if self.__user_state is not None:
+            return self.__user_state.chat_id
+        if self.__chat_id is None:
+            self.__chat_id = ChatID.from_dict(
+                self.__raw_state.get('chat_id') or {}
+            )
+        return self.__chat_id
 
     @property
     def user_id(self):
-        return self.__user_state.chat_id.user_id
+        return self.chatID.user_id
 
     @property
     def company_id(self):
-        return self.__user_state.chat_id.company_id
+        return self.chatID.company_id
 
     @property
     def menu(self):
-        return self.__user_state.menu
+        return self.user_state.menu
+
+    @property
+    def platform(self) -> str:
+        if self.__user_state is None:
+            return self.__raw_state.get('platform', '')
+        return self.__user_state.platform
 
     @property
     def route(self):
+        if self.__user_state is None:
+            return self.__raw_state.get('route', 'start')
         return self.__user_state.route
 
     @property
     def observation(self):
-        return self.__user_state.observation_dict
+        return self.user_state.observation_dict
+
+    @property
+    def buttons(self):
+        return self.message.buttons
 
     @property
     def content_message(self):
@@ -247,9 +588,12 @@ class UserCall:
 
     @observation.setter
     def observation(self, observation: dict):
-        self.__user_state.observation = json.dumps(observation)
-        loop = asyncio.get_event_loop()
-        loop.create_task(self.add_observation(observation))
+        self.user_state.set_observation_dict(observation)
+        if self.__write_behind:
+            self.__observation_dirty = True
+            return
+
+        self.__write_observation()
 
     @content_message.setter
     def content_message(self, content_message: str):
@@ -0,0 +1,107 @@
+"""
+Testes para o LoadBalancer.
+
+Este módulo contém testes unitários para a escolha de réplicas, a ejeção
+passiva e a readmissão gradual.
+"""
+
+import pytest
+
+from chatgraph.services.balancer import LoadBalancer
+
+URLS = ['http://r1/v1', 'http://r2/v1', 'http://r3/v1']
+
+
+@pytest.mark.unit
+class TestLoadBalancer:
+    """Testes para o LoadBalancer."""
+
+    def test_invalid_params(self):
+        """Testa que parâmetros inválidos são rejeitados."""
+        with pytest.raises(ValueError, match='réplica'):
+            LoadBalancer([])
+        with pytest.raises(ValueError, match='Estratégia inválida'):
+            LoadBalancer(URLS, strategy='round_robin')
+
+    def test_least_outstanding(self):
+        """Testa que a réplica com menos requisições é escolhida."""
+        balancer = LoadBalancer(URLS, strategy='least_outstanding')
+        r1, r2, r3 = balancer.replicas
+        balancer.start(r1)
+        balancer.start(r3)
+
+        assert balancer.pick() is r2
+
+    def test_p2c_spreads_load(self):
+        """Testa que p2c distribui requisições concorrentes."""
+        balancer = LoadBalancer(URLS)
+
+        for _ in range(30):
+            balancer.start(balancer.pick())
+
+        outstanding = [r.outstanding for r in balancer.replicas]
+        assert max(outstanding) - min(outstanding) <= 2
+
+    def test_ejects_after_failures(self):
+        """Testa que a réplica com falhas consecutivas é ejetada."""
+        balancer = LoadBalancer(
+            URLS[:2], strategy='least_outstanding', failure_threshold=2
+        )
+        r1, r2 = balancer.replicas
+        for _ in range(2):
+            balancer.start(r1)
+            balancer.finish(r1, healthy=False)
+
+        assert r1.ejected
+        assert r1.ejections == 1
+        assert all(balancer.pick() is r2 for _ in range(10))
+
+    def test_success_resets_failures(self):
+        """Testa que um sucesso zera as falhas consecutivas."""
+        balancer = LoadBalancer(URLS, failure_threshold=2)
+        r1 = balancer.replicas[0]
+
+        for healthy in (False, True, False):
+            balancer.start(r1)
+            balancer.finish(r1, healthy=healthy)
+
+        assert not r1.ejected
+
+    def test_cancelled_request_has_no_verdict(self):
+        """Testa que requisições sem resultado não contam como falha."""
+        balancer = LoadBalancer(URLS, failure_threshold=1)
+        r1 = balancer.replicas[0]
+
+        balancer.start(r1)
+        balancer.finish(r1, healthy=None)
+
+        assert r1.outstanding == 0
+        assert not r1.ejected
+
+    def test_all_ejected_uses_all(self):
+        """Testa que, com todas ejetadas, o balanceador não fica vazio."""
+        balancer = LoadBalancer(URLS[:1], failure_threshold=1)
+        r1 = balancer.replicas[0]
+        balancer.start(r1)
+        balancer.finish(r1, healthy=False)
+
+        assert balancer.pick() is r1
+
+    def test_readmitted_replica_warms_up(self):
+        """Testa que a réplica readmitida recebe menos carga no início."""
+        balancer = LoadBalancer(
+            URLS[:2],
+            strategy='least_outstanding',
+            failure_threshold=1,
+            ejection_time=0,
+            warmup=60,
+        )
+        r1, r2 = balancer.replicas
+        balancer.start(r1)
+        balancer.finish(r1, healthy=False)
+        for _ in range(3):
+            balancer.start(r2)
+
+        # r2 tem 3 requisições, mas r1 ainda está com peso mínimo
+        assert not r1.ejected
+        assert balancer.pick() is r2
@@ -0,0 +1,50 @@
+"""
+Testes para o WorkerSupervisor.
+
+Este módulo contém testes unitários para verificar a criação e o
+reinício supervisionado dos processos worker.
+"""
+
+import os
+
+import pytest
+
+from chatgraph.bot.supervisor import CLEANUP_MARGIN, WorkerSupervisor
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.mark.unit
+class TestWorkerSupervisor:
+    """Testes para o WorkerSupervisor."""
+
+    def test_invalid_workers(self):
+        """Testa que workers menor que 1 é rejeitado."""
+        with pytest.raises(ValueError, match='workers'):
+            WorkerSupervisor(_crash, workers=0)
+
+    def test_shutdown_timeout_exceeds_drain(self):
+        """Testa que o encerramento espera a drenagem e a limpeza."""
+        supervisor = WorkerSupervisor(_crash, workers=1, drain_timeout=20.0)
+
+        assert supervisor.shutdown_timeout == 20.0 + CLEANUP_MARGIN
+        with pytest.raises(ValueError, match='drain_timeout'):
+            WorkerSupervisor(
+                _crash, workers=1, drain_timeout=30.0, shutdown_timeout=30.0
+            )
+
+    def test_restart_rate_cap(self):
+        """Testa que reinícios em excesso encerram o supervisor."""
+        supervisor = WorkerSupervisor(
+            _crash,
+            workers=1,
+            max_restarts=2,
+            restart_window=60.0,
+            drain_timeout=0.5,
+            shutdown_timeout=1.0,
+        )
+
+        with pytest.raises(RuntimeError, match='reiniciados'):
+            supervisor.run()
@@ -0,0 +1,56 @@
+"""
+Testes para o CLI do chatgraph.
+
+Este módulo contém testes unitários para o comando `run`, que inicia um
+ChatbotApp a partir do caminho 'modulo:variavel'.
+"""
+
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+from chatgraph.cli import app
+
+
+@pytest.fixture
+def bot_module(tmp_path, monkeypatch):
+    """Módulo de bot no diretório atual que registra o `start`."""
+    (tmp_path / 'cli_fake_bot.py').write_text(
+        'calls = []\n'
+        '\n'
+        'class FakeApp:\n'
+        '    def start(self, workers=1):\n'
+        '        calls.append(workers)\n'
+        '\n'
+        'app = FakeApp()\n'
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.delitem(sys.modules, 'cli_fake_bot', raising=False)
+    return tmp_path
+
+
+@pytest.mark.unit
+class TestCliRun:
+    """Testes para o comando `chatgraph run`."""
+
+    def test_run_with_workers(self, bot_module):
+        """Testa que --workers é repassado ao ChatbotApp.start."""
+        result = CliRunner().invoke(
+            app, ['run', 'cli_fake_bot:app', '--workers', '4']
+        )
+
+        import cli_fake_bot
+
+        assert result.exit_code == 0, result.output
+        assert cli_fake_bot.calls == [4]
+
+    def test_run_defaults(self, bot_module):
+        """Testa o padrão de um worker e da variável `app`."""
+        result = CliRunner().invoke(app, ['run', 'cli_fake_bot'])
+
+        import cli_fake_bot
+
+        assert result.exit_code == 0, result.output
+        assert cli_fake_bot.calls == [1]
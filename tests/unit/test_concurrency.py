@@ -0,0 +1,119 @@
+"""
+Testes para o limitador adaptativo de concorrência.
+
+Este módulo contém testes unitários para o ajuste do limite pela
+latência, a fila de espera e o descarte de requisições excedentes.
+"""
+
+import asyncio
+
+import pytest
+
+from chatgraph.services.concurrency import (
+    AdaptiveConcurrencyLimiter,
+    LimitExceeded,
+)
+
+
+@pytest.mark.unit
+class TestAdaptiveConcurrencyLimiter:
+    """Testes para o AdaptiveConcurrencyLimiter."""
+
+    def test_invalid_limits(self):
+        """Testa que os limites precisam ser coerentes."""
+        with pytest.raises(ValueError, match='min_limit'):
+            AdaptiveConcurrencyLimiter(initial_limit=5, max_limit=2)
+
+    @pytest.mark.asyncio
+    async def test_queues_above_limit(self):
+        """Testa que as requisições excedentes aguardam em ordem."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire()
+
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0)
+        assert limiter.queue_depth == 1
+        assert not waiter.done()
+
+        limiter.release()
+        await waiter
+        assert limiter.in_flight == 1
+        assert limiter.queue_depth == 0
+        assert limiter.stats.queued == 1
+
+    @pytest.mark.asyncio
+    async def test_sheds_when_queue_is_full(self):
+        """Testa que, com a fila cheia, a requisição é recusada."""
+        limiter = AdaptiveConcurrencyLimiter(
+            initial_limit=1, max_limit=1, max_queue=0
+        )
+        await limiter.acquire()
+
+        with pytest.raises(LimitExceeded):
+            await limiter.acquire()
+        assert limiter.stats.rejected == 1
+
+    @pytest.mark.asyncio
+    async def test_queue_timeout_frees_slot(self):
+        """Testa que a espera expirada sai da fila sem vazar permissões."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        await limiter.acquire()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await limiter.acquire(timeout=0.01)
+        assert limiter.queue_depth == 0
+
+        limiter.release()
+        assert limiter.in_flight == 0
+        await limiter.acquire()
+        assert limiter.in_flight == 1
+
+    @pytest.mark.asyncio
+    async def test_limit_grows_with_stable_latency(self):
+        """Testa que o limite cresce enquanto a latência se mantém."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=4, max_limit=50)
+
+        for _ in range(20):
+            for _ in range(limiter.limit):
+                await limiter.acquire()
+            for _ in range(limiter.in_flight):
+                limiter.release(rtt=0.01)
+
+        assert limiter.limit > 4
+
+    @pytest.mark.asyncio
+    async def test_limit_shrinks_when_latency_rises(self):
+        """Testa que o limite cai quando a latência sobe."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=40, max_limit=50)
+        for _ in range(5):
+            await limiter.acquire()
+            limiter.release(rtt=0.01)
+
+        for _ in range(40):
+            await limiter.acquire()
+        for _ in range(40):
+            limiter.release(rtt=0.2)
+
+        assert limiter.limit < 40
+
+    @pytest.mark.asyncio
+    async def test_idle_limit_does_not_grow(self):
+        """Testa que o limite não cresce sem demanda."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=50)
+
+        for _ in range(50):
+            await limiter.acquire()
+            limiter.release(rtt=0.01)
+
+        assert limiter.limit == 10
+
+    @pytest.mark.asyncio
+    async def test_drop_reduces_limit(self):
+        """Testa que falhas do roteador reduzem o limite."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=50)
+
+        await limiter.acquire()
+        limiter.release(dropped=True)
+
+        assert limiter.limit == 9
+        assert limiter.stats.dropped == 1
@@ -0,0 +1,55 @@
+"""
+Testes para o Deadline.
+
+Este módulo contém testes unitários para o prazo das mensagens derivado
+do TTL e do instante de publicação.
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from chatgraph.services.deadline import Deadline, DeadlineExceeded
+
+
+@pytest.mark.unit
+class TestDeadline:
+    """Testes para o Deadline."""
+
+    def test_without_timestamp_counts_from_now(self):
+        """Testa que, sem timestamp, o prazo é o TTL inteiro."""
+        deadline = Deadline.from_delivery(ttl=60)
+
+        assert deadline.remaining() == pytest.approx(60, abs=0.5)
+        assert not deadline.expired
+
+    def test_discounts_age(self):
+        """Testa que o tempo desde a publicação é descontado."""
+        sent_at = datetime.now(timezone.utc) - timedelta(seconds=20)
+
+        deadline = Deadline.from_delivery(ttl=60, sent_at=sent_at)
+
+        assert deadline.remaining() == pytest.approx(40, abs=0.5)
+
+    def test_naive_timestamp_is_utc(self):
+        """Testa que timestamps sem fuso são tratados como UTC."""
+        sent_at = datetime.now(timezone.utc).replace(tzinfo=None)
+
+        deadline = Deadline.from_delivery(ttl=60, sent_at=sent_at)
+
+        assert deadline.remaining() == pytest.approx(60, abs=0.5)
+
+    def test_future_timestamp_does_not_extend(self):
+        """Testa que relógios adiantados não estendem o prazo."""
+        sent_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+
+        deadline = Deadline.from_delivery(ttl=60, sent_at=sent_at)
+
+        assert deadline.remaining() <= 60
+
+    def test_check_expired(self):
+        """Testa que check() falha após o prazo."""
+        Deadline.after(10).check()
+
+        with pytest.raises(DeadlineExceeded, match='send_message'):
+            Deadline.after(-1).check('send_message')
@@ -0,0 +1,108 @@
+"""
+Testes para os downloads de arquivos remotos.
+
+Este módulo contém testes unitários para verificar o reaproveitamento do
+cliente HTTP compartilhado e o cache em disco revalidado por ETag.
+"""
+
+import httpx
+import pytest
+
+from chatgraph.models.message import File
+from chatgraph.services import downloads
+from chatgraph.services.downloads import DownloadSettings
+
+URL = 'https://cdn.example.com/menu.png'
+
+
+@pytest.fixture(autouse=True)
+def reset_downloads():
+    """Restaura a configuração padrão após cada teste."""
+    yield
+    downloads.configure_downloads(DownloadSettings())
+
+
+@pytest.mark.unit
+class TestDownloads:
+    """Testes para o módulo de downloads."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared(self):
+        """Testa que o mesmo cliente é reutilizado no event loop."""
+        downloads.configure_downloads(DownloadSettings(max_connections=5))
+
+        client = downloads.get_download_client()
+
+        assert downloads.get_download_client() is client
+        await downloads.close_download_client()
+        assert client.is_closed
+
+    @pytest.mark.asyncio
+    async def test_file_load_file_uses_download(self, respx_mock):
+        """Testa que File com url é baixado pelo pool compartilhado."""
+        downloads.configure_downloads(DownloadSettings())
+        respx_mock.get(URL).mock(
+            return_value=httpx.Response(200, content=b'imagem')
+        )
+
+        file = File(url=URL)
+        await file.load_file()
+
+        assert file.bytes_data == b'imagem'
+        await downloads.close_download_client()
+
+    @pytest.mark.asyncio
+    async def test_disk_cache_revalidates_with_etag(
+        self, respx_mock, tmp_path
+    ):
+        """Testa que um 304 devolve o conteúdo armazenado em disco."""
+        downloads.configure_downloads(
+            DownloadSettings(cache_dir=str(tmp_path))
+        )
+        route = respx_mock.get(URL)
+        route.side_effect = [
+            httpx.Response(200, content=b'imagem', headers={'ETag': '"v1"'}),
+            httpx.Response(304),
+        ]
+
+        first = await downloads.download(URL)
+        second = await downloads.download(URL)
+
+        assert first == second == b'imagem'
+        assert route.calls.last.request.headers['If-None-Match'] == '"v1"'
+        await downloads.close_download_client()
+
+    @pytest.mark.asyncio
+    async def test_response_without_validators_is_not_cached(
+        self, respx_mock, tmp_path
+    ):
+        """Testa que respostas sem ETag/Last-Modified não são armazenadas."""
+        downloads.configure_downloads(
+            DownloadSettings(cache_dir=str(tmp_path))
+        )
+        route = respx_mock.get(URL).mock(
+            return_value=httpx.Response(200, content=b'imagem')
+        )
+
+        await downloads.download(URL)
+        await downloads.download(URL)
+
+        assert 'If-None-Match' not in route.calls.last.request.headers
+        assert not list((tmp_path / 'blobs').iterdir())
+        await downloads.close_download_client()
+
+    @pytest.mark.asyncio
+    async def test_fetch_etag_is_conditional(self, respx_mock):
+        """Testa que o ETag é consultado com HEAD e If-None-Match."""
+        route = respx_mock.head(URL)
+        route.side_effect = [
+            httpx.Response(200, headers={'ETag': '"v1"'}),
+            httpx.Response(304),
+            httpx.Response(404),
+        ]
+
+        assert await downloads.fetch_etag(URL) == '"v1"'
+        assert await downloads.fetch_etag(URL, '"v1"') == '"v1"'
+        assert route.calls.last.request.headers['If-None-Match'] == '"v1"'
+        assert await downloads.fetch_etag(URL) is None
+        await downloads.close_download_client()
@@ -0,0 +1,158 @@
+"""
+Testes para o FileCache.
+
+Este módulo contém testes unitários para verificar o mapeamento de
+arquivos locais para hashes e arquivos do servidor, o cache negativo e a
+persistência em disco.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from chatgraph.models.message import File
+from chatgraph.services.file_cache import FileCache
+
+
+@pytest.fixture
+def image(tmp_path):
+    """Arquivo local de exemplo."""
+    path = tmp_path / 'menu.png'
+    path.write_bytes(b'imagem')
+    return str(path)
+
+
+@pytest.mark.unit
+class TestFileCache:
+    """Testes para o FileCache."""
+
+    def test_fingerprint_changes_with_content(self, image):
+        """Testa que a identidade muda quando o arquivo é alterado."""
+        before = FileCache.fingerprint(image)
+
+        with open(image, 'ab') as fp:
+            fp.write(b'!')
+        os.utime(image, ns=(0, before[2] + 1_000_000))
+
+        assert FileCache.fingerprint(image) != before
+        assert FileCache.fingerprint(image + '.inexistente') is None
+
+    def test_hash_and_file_lookup(self, image):
+        """Testa o caminho identidade -> hash -> File do servidor."""
+        cache = FileCache()
+        fingerprint = cache.fingerprint(image)
+
+        cache.remember_hash(fingerprint, 'abc')
+        cache.remember_file('abc', File(id='f1', url='http://x/f1'))
+
+        assert cache.hash_for(fingerprint) == 'abc'
+        cached = cache.get_file('abc')
+        assert cached.id == 'f1'
+        assert cached.hash_id == 'abc'
+        assert cached is not cache.get_file('abc')
+
+    def test_missing_hash_expires(self, monkeypatch):
+        """Testa que o cache negativo expira após negative_ttl."""
+        now = [100.0]
+        monkeypatch.setattr(
+            'chatgraph.services.file_cache.time.monotonic', lambda: now[0]
+        )
+        cache = FileCache(negative_ttl=10)
+
+        cache.remember_missing('abc')
+        assert cache.is_missing('abc')
+
+        now[0] += 11
+        assert not cache.is_missing('abc')
+
+    def test_persistence_across_instances(self, image, tmp_path):
+        """Testa que hashes e arquivos são recarregados do disco."""
+        path = str(tmp_path / 'cache.json')
+        cache = FileCache(path=path)
+        fingerprint = cache.fingerprint(image)
+        cache.remember_hash(fingerprint, 'abc')
+        cache.remember_file('abc', File(id='f1', url='http://x/f1'))
+
+        reloaded = FileCache(path=path)
+
+        assert reloaded.hash_for(fingerprint) == 'abc'
+        assert reloaded.get_file('abc').url == 'http://x/f1'
+
+    def test_url_file_persisted_with_etag(self, tmp_path):
+        """Testa que arquivos importados por URL são recarregados."""
+        path = str(tmp_path / 'cache.json')
+        cache = FileCache(path=path)
+        cache.remember_url_file(
+            'https://cdn.example.com/doc.pdf',
+            File(id='f2', url='http://x/f2'),
+            '"v1"',
+        )
+
+        file, etag = FileCache(path=path).get_url_file(
+            'https://cdn.example.com/doc.pdf'
+        )
+
+        assert file.id == 'f2'
+        assert etag == '"v1"'
+        assert cache.get_url_file('https://cdn.example.com/outro') is None
+
+    def test_url_revalidation_interval(self, monkeypatch):
+        """Testa que URLs com ETag só são revalidadas após o intervalo."""
+        now = [1000.0]
+        monkeypatch.setattr(
+            'chatgraph.services.file_cache.time.time', lambda: now[0]
+        )
+        cache = FileCache(revalidate_after=60)
+        cache.remember_url_file('https://a', File(id='f1'), '"v1"')
+        cache.remember_url_file('https://b', File(id='f2'))
+
+        assert not cache.needs_revalidation('https://a')
+        now[0] += 61
+        assert cache.needs_revalidation('https://a')
+        assert not cache.needs_revalidation('https://b')
+
+        cache.mark_revalidated('https://a')
+        assert not cache.needs_revalidation('https://a')
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        """Testa que um arquivo de persistência inválido é ignorado."""
+        path = tmp_path / 'cache.json'
+        path.write_text('{inválido')
+
+        assert FileCache(path=str(path)).get_file('abc') is None
+
+    @pytest.mark.asyncio
+    async def test_saves_are_batched_off_the_loop(self, image, tmp_path):
+        """Testa que, no event loop, a gravação é agrupada até o flush."""
+        path = tmp_path / 'cache.json'
+        cache = FileCache(path=str(path), save_delay=60)
+        fingerprint = cache.fingerprint(image)
+
+        cache.remember_hash(fingerprint, 'abc')
+        cache.remember_file('abc', File(id='f1', url='http://x/f1'))
+        assert not path.exists()
+
+        await cache.flush()
+
+        assert FileCache(path=str(path)).get_file('abc').id == 'f1'
+        assert not list(tmp_path.glob('*.tmp'))
+
+    @pytest.mark.asyncio
+    async def test_load_once_coalesces(self):
+        """Testa que cargas simultâneas da mesma chave executam uma vez."""
+        cache = FileCache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return File(id='f1')
+
+        files = await asyncio.gather(
+            *(cache.load_once('k', loader) for _ in range(3))
+        )
+
+        assert calls == 1
+        assert {file.id for file in files} == {'f1'}
@@ -0,0 +1,59 @@
+"""
+Testes para o pipeline de logging.
+
+Este módulo contém testes unitários para verificar a amostragem por
+nível e a configuração do logger 'chatgraph'.
+"""
+
+import logging
+import logging.handlers
+
+import pytest
+
+from chatgraph.logger.logger import (
+    SamplingFilter,
+    _parse_sampling,
+    configure_logging,
+    logger,
+)
+
+
+@pytest.mark.unit
+class TestLogging:
+    """Testes para o logger do chatgraph."""
+
+    def test_parse_sampling(self):
+        """Testa a conversão da variável de amostragem."""
+        assert _parse_sampling('DEBUG=0.01, info=0.5,invalido') == {
+            logging.DEBUG: 0.01,
+            logging.INFO: 0.5,
+        }
+
+    def test_sampling_filter_drops_by_level(self):
+        """Testa que a taxa zero descarta e níveis sem taxa passam."""
+        sampling = SamplingFilter({logging.DEBUG: 0.0})
+        debug = logging.LogRecord('x', logging.DEBUG, '', 0, 'm', (), None)
+        error = logging.LogRecord('x', logging.ERROR, '', 0, 'm', (), None)
+
+        assert not sampling.filter(debug)
+        assert sampling.filter(error)
+
+    def test_configure_uses_queue_handler(self):
+        """Testa que o logger escreve por meio de uma fila."""
+        configure_logging(level='DEBUG', sampling={'DEBUG': 0.5})
+        try:
+            assert logger.level == logging.DEBUG
+            assert not logger.propagate
+            (handler,) = logger.handlers
+            assert isinstance(handler, logging.handlers.QueueHandler)
+            assert isinstance(handler.filters[0], SamplingFilter)
+        finally:
+            configure_logging()
+
+    def test_silent_by_default(self, monkeypatch):
+        """Testa que, sem configuração, DEBUG e INFO ficam desligados."""
+        monkeypatch.delenv('CHATGRAPH_LOG_LEVEL', raising=False)
+        configure_logging()
+
+        assert not logger.isEnabledFor(logging.INFO)
+        assert logger.isEnabledFor(logging.WARNING)
@@ -0,0 +1,378 @@
+"""
+Testes para o MessageConsumer.
+
+Este módulo contém testes unitários para verificar a supervisão do
+consumo da fila, sem depender de um broker RabbitMQ real.
+"""
+
+import asyncio
+import contextlib
+import json
+from datetime import datetime, timedelta, timezone
+
+import aio_pika
+import pytest
+
+from chatgraph.auth.credentials import Credential
+from chatgraph.messages import message_consumer
+from chatgraph.messages.message_consumer import MessageConsumer
+from chatgraph.messages.prefetch import AdaptivePrefetch
+from chatgraph.services.backoff import ExponentialBackoff
+
+
+@pytest.fixture
+def consumer_config():
+    """Configuração mínima para o MessageConsumer."""
+    return {
+        'credential': Credential(username='guest', password='guest'),
+        'amqp_url': 'localhost:5672',
+        'router_url': 'http://localhost:8080/v1/actions',
+        'router_token': 'token',
+        'queue_consume': 'chat_queue',
+    }
+
+
+class FakeMessage:
+    """Entrega falsa que registra o ack ao final do processamento."""
+
+    def __init__(self, payload: dict, timestamp=None, expiration=None):
+        self.body = json.dumps(payload).encode()
+        self.timestamp = timestamp
+        self.expiration = expiration
+        self.acked = False
+
+    @contextlib.asynccontextmanager
+    async def process(self):
+        yield
+        self.acked = True
+
+
+class FakeQueueIterator:
+    """Iterador de fila que entrega mensagens até ser fechado."""
+
+    def __init__(self, messages):
+        self.messages = asyncio.Queue()
+        for message in messages:
+            self.messages.put_nowait(message)
+        self.closed = asyncio.Event()
+
+    async def close(self):
+        self.closed.set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        get = asyncio.ensure_future(self.messages.get())
+        closed = asyncio.ensure_future(self.closed.wait())
+        await asyncio.wait({get, closed}, return_when=asyncio.FIRST_COMPLETED)
+        if get.done():
+            closed.cancel()
+            return get.result()
+        get.cancel()
+        raise StopAsyncIteration
+
+
+class FakeQueue:
+    def __init__(self, iterator):
+        self._iterator = iterator
+
+    def iterator(self):
+        return self._iterator
+
+
+class FakeChannel:
+    def __init__(self, queue):
+        self.queue = queue
+        self.prefetch_count = None
+
+    async def set_qos(self, prefetch_count):
+        self.prefetch_count = prefetch_count
+
+    async def declare_queue(self, name, **kwargs):
+        return self.queue
+
+
+class FakeConnection:
+    def __init__(self, channel):
+        self._channel = channel
+
+    async def channel(self):
+        return self._channel
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+
+def make_payload(user_id: str) -> dict:
+    """Cria o corpo de uma entrega para o usuário informado."""
+    return {
+        'user_state': {
+            'chat_id': {'user_id': user_id, 'company_id': 'company'},
+            'platform': 'whatsapp',
+            'route': 'start',
+        },
+        'message': {'text_message': {'detail': 'oi'}},
+    }
+
+
+@pytest.mark.unit
+class TestMessageConsumerSupervision:
+    """Testes para o loop supervisionado de consumo."""
+
+    @pytest.mark.asyncio
+    async def test_restarts_with_backoff_until_cap(
+        self, consumer_config, monkeypatch
+    ):
+        """Testa que falhas geram reconexões até o limite de reinícios."""
+        attempts = 0
+
+        async def failing_connect(url):
+            nonlocal attempts
+            attempts += 1
+            raise ConnectionError('broker indisponível')
+
+        monkeypatch.setattr(aio_pika, 'connect_robust', failing_connect)
+
+        consumer = MessageConsumer(
+            **consumer_config,
+            backoff=ExponentialBackoff(base=0.001, max_delay=0.001),
+            max_restarts=3,
+        )
+
+        with pytest.raises(RuntimeError, match='reiniciado'):
+            await consumer.start_consume(lambda usercall: None)
+
+        assert attempts == 4
+        assert consumer.stats.reconnects == 3
+        assert consumer.stats.disconnected_seconds == 0
+        assert 'broker indisponível' in consumer.stats.last_error
+
+
+@pytest.mark.unit
+class TestMessageConsumerDrain:
+    """Testes para o encerramento gracioso do consumidor."""
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_in_flight_messages(
+        self, consumer_config, monkeypatch
+    ):
+        """Testa que stop() aguarda os handlers e confirma as entregas."""
+        messages = [FakeMessage(make_payload(str(i))) for i in range(3)]
+        iterator = FakeQueueIterator(messages)
+        connection = FakeConnection(FakeChannel(FakeQueue(iterator)))
+
+        async def connect(url):
+            return connection
+
+        monkeypatch.setattr(aio_pika, 'connect_robust', connect)
+
+        consumer = MessageConsumer(**consumer_config, max_concurrency=3)
+        release = asyncio.Event()
+        started = 0
+
+        async def process_message(usercall):
+            nonlocal started
+            started += 1
+            await release.wait()
+
+        consume = asyncio.create_task(
+            consumer.start_consume(process_message)
+        )
+        while started < 3:
+            await asyncio.sleep(0.01)
+
+        assert consumer.in_flight == 3
+
+        await consumer.stop()
+        await asyncio.sleep(0.01)
+        assert consumer.stopping
+        assert not consume.done()
+        assert not any(message.acked for message in messages)
+
+        release.set()
+        await asyncio.wait_for(consume, timeout=1)
+
+        assert all(message.acked for message in messages)
+        assert consumer.in_flight == 0
+
+
+@pytest.mark.unit
+class TestMessageConsumerDeadline:
+    """Testes para o prazo das mensagens derivado do TTL."""
+
+    @pytest.mark.asyncio
+    async def test_deadline_discounts_time_in_queue(
+        self, consumer_config, monkeypatch
+    ):
+        """Testa que o prazo desconta o tempo desde a publicação."""
+        now = datetime.now(timezone.utc)
+        messages = [
+            FakeMessage(make_payload('1'), timestamp=now),
+            FakeMessage(
+                make_payload('2'), timestamp=now - timedelta(seconds=400)
+            ),
+            FakeMessage(make_payload('3'), expiration=5.0),
+        ]
+        iterator = FakeQueueIterator(messages)
+        connection = FakeConnection(FakeChannel(FakeQueue(iterator)))
+
+        async def connect(url):
+            return connection
+
+        monkeypatch.setattr(aio_pika, 'connect_robust', connect)
+
+        consumer = MessageConsumer(**consumer_config, message_ttl=300)
+        deadlines = {}
+
+        async def process_message(usercall):
+            deadlines[usercall.user_id] = usercall.deadline
+
+        consume = asyncio.create_task(
+            consumer.start_consume(process_message)
+        )
+        while len(deadlines) < 3:
+            await asyncio.sleep(0.01)
+        await consumer.stop()
+        await asyncio.wait_for(consume, timeout=1)
+
+        assert deadlines['1'].remaining() == pytest.approx(300, abs=1)
+        assert deadlines['2'].expired
+        assert deadlines['3'].remaining() == pytest.approx(5, abs=1)
+
+
+@pytest.mark.unit
+class TestMessageConsumerPrefetch:
+    """Testes para o ajuste adaptativo do prefetch."""
+
+    def test_prefetch_uses_message_ttl(self, consumer_config):
+        """Testa que o limite do prefetch usa o TTL do consumidor."""
+        controller = AdaptivePrefetch()
+
+        MessageConsumer(
+            **consumer_config, adaptive_prefetch=controller, message_ttl=60
+        )
+
+        assert controller.message_ttl == 60
+
+    @pytest.mark.asyncio
+    async def test_tuning_logs_window_error_rate(
+        self, consumer_config, monkeypatch
+    ):
+        """Testa que o log mostra a taxa de erros da janela ajustada."""
+        controller = AdaptivePrefetch(current=10, interval=0.01)
+        for ok in (True, False):
+            controller.record(0.1, ok=ok)
+        consumer = MessageConsumer(
+            **consumer_config, adaptive_prefetch=controller
+        )
+        queue = FakeQueue(None)
+        queue.channel = FakeChannel(queue)
+        logged = []
+        monkeypatch.setattr(
+            message_consumer.logger, 'debug', logged.append
+        )
+
+        tuner = asyncio.create_task(
+            consumer._MessageConsumer__tune_prefetch(queue)
+        )
+        while not logged:
+            await asyncio.sleep(0.01)
+        tuner.cancel()
+
+        assert 'erros=50.0%' in logged[0]
+        assert queue.channel.prefetch_count == 5
+
+    def test_dispatcher_fits_prefetch_window(self, consumer_config):
+        """Testa que, sem concorrência explícita, cabe o prefetch máximo."""
+        consumer = MessageConsumer(
+            **consumer_config,
+            adaptive_prefetch=AdaptivePrefetch(current=10, max_prefetch=64),
+        )
+
+        assert consumer._MessageConsumer__max_concurrency == 64
+
+    @pytest.mark.asyncio
+    async def test_router_failures_count_as_errors(
+        self, consumer_config, monkeypatch
+    ):
+        """Testa que falhas do roteador entram na taxa de erros."""
+        controller = AdaptivePrefetch(current=10, interval=0.01)
+        consumer = MessageConsumer(
+            **consumer_config, adaptive_prefetch=controller
+        )
+        router_client = await consumer._MessageConsumer__initialize_router()
+        queue = FakeQueue(None)
+        queue.channel = FakeChannel(queue)
+        logged = []
+        monkeypatch.setattr(
+            message_consumer.logger, 'debug', logged.append
+        )
+
+        tuner = asyncio.create_task(
+            consumer._MessageConsumer__tune_prefetch(queue)
+        )
+        await asyncio.sleep(0)
+        for _ in range(4):
+            controller.record(0.1)
+        router_client.resilience_stats.failures += 2
+        while not logged:
+            await asyncio.sleep(0.01)
+        tuner.cancel()
+        await consumer.cleanup()
+
+        assert 'erros=50.0%' in logged[0]
+        assert queue.channel.prefetch_count == 5
+
+    @pytest.mark.asyncio
+    async def test_latency_includes_dispatcher_wait(self, consumer_config):
+        """Testa que a latência vai da entrega ao ack, com a fila."""
+        controller = AdaptivePrefetch(current=10)
+        consumer = MessageConsumer(
+            **consumer_config,
+            adaptive_prefetch=controller,
+            max_concurrency=1,
+        )
+        dispatcher = message_consumer.ChatDispatcher(1)
+
+        async def process_message(usercall):
+            await asyncio.sleep(0.05)
+
+        for user_id in ('1', '2'):
+            consumer._MessageConsumer__dispatch(
+                dispatcher, FakeMessage(make_payload(user_id)), process_message
+            )
+        await dispatcher.join()
+        await consumer.cleanup()
+
+        # 0.05s da primeira entrega e 0.1s (espera + handler) da segunda
+        assert controller.latency == pytest.approx(0.06, abs=0.01)
+
+
+@pytest.mark.unit
+class TestExponentialBackoff:
+    """Testes para a política de backoff."""
+
+    def test_delay_without_jitter(self):
+        """Testa o crescimento exponencial limitado por max_delay."""
+        backoff = ExponentialBackoff(
+            base=1, factor=2, max_delay=5, jitter=False
+        )
+
+        assert [backoff.delay(n) for n in range(4)] == [1, 2, 4, 5]
+
+    def test_delay_with_jitter_within_bounds(self):
+        """Testa que o jitter mantém o atraso dentro do teto."""
+        backoff = ExponentialBackoff(base=1, factor=2, max_delay=5)
+
+        for attempt in range(2000):
+            assert 0 <= backoff.delay(attempt) <= 5
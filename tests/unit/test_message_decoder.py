@@ -0,0 +1,41 @@
+"""
+Testes para os decodificadores JSON das entregas.
+
+Este módulo contém testes unitários para verificar a seleção e o
+funcionamento dos decodificadores plugáveis.
+"""
+
+import pytest
+
+from chatgraph.messages.decoder import DECODERS, get_decoder
+
+BODY = b'{"user_state": {"route": "start"}, "message": {}}'
+
+
+@pytest.mark.unit
+class TestGetDecoder:
+    """Testes para get_decoder."""
+
+    def test_invalid_name(self):
+        """Testa que um nome desconhecido é rejeitado."""
+        with pytest.raises(ValueError, match='Decodificador JSON inválido'):
+            get_decoder('yaml')
+
+    def test_auto_decodes_bytes(self):
+        """Testa que o modo automático decodifica bytes."""
+        decode = get_decoder()
+
+        assert decode(BODY)['user_state']['route'] == 'start'
+
+    @pytest.mark.parametrize('name', DECODERS)
+    def test_decodes_memoryview(self, name):
+        """Testa que cada decodificador aceita memoryview."""
+        try:
+            decode = get_decoder(name)
+        except ImportError:
+            pytest.skip(f'{name} não instalado')
+
+        assert decode(memoryview(BODY)) == {
+            'user_state': {'route': 'start'},
+            'message': {},
+        }
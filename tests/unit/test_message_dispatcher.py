@@ -0,0 +1,107 @@
+"""
+Testes para o ChatDispatcher.
+
+Este módulo contém testes unitários para verificar a ordenação por chat
+e a concorrência entre chats do despachante de mensagens.
+"""
+
+import asyncio
+
+import pytest
+
+from chatgraph.messages.dispatcher import ChatDispatcher
+
+
+@pytest.mark.unit
+class TestChatDispatcher:
+    """Testes para o ChatDispatcher."""
+
+    def test_invalid_concurrency(self):
+        """Testa que max_concurrency menor que 1 é rejeitado."""
+        with pytest.raises(ValueError, match='max_concurrency'):
+            ChatDispatcher(0)
+
+    @pytest.mark.asyncio
+    async def test_same_chat_keeps_order(self):
+        """Testa que tarefas do mesmo chat executam em ordem."""
+        dispatcher = ChatDispatcher(max_concurrency=4)
+        executed = []
+
+        def make_job(value, delay):
+            async def job():
+                await asyncio.sleep(delay)
+                executed.append(value)
+
+            return job
+
+        dispatcher.submit('chat', make_job(1, 0.03))
+        dispatcher.submit('chat', make_job(2, 0.0))
+        dispatcher.submit('chat', make_job(3, 0.01))
+        await dispatcher.join()
+
+        assert executed == [1, 2, 3]
+        assert dispatcher.in_flight == 0
+        assert dispatcher.active_chats == 0
+
+    @pytest.mark.asyncio
+    async def test_different_chats_run_concurrently(self):
+        """Testa que chats diferentes são processados em paralelo."""
+        dispatcher = ChatDispatcher(max_concurrency=2)
+        started = asyncio.Event()
+        release = asyncio.Event()
+        executed = []
+
+        async def slow_job():
+            started.set()
+            await release.wait()
+            executed.append('slow')
+
+        async def fast_job():
+            executed.append('fast')
+            release.set()
+
+        dispatcher.submit('chat-a', slow_job)
+        await started.wait()
+        dispatcher.submit('chat-b', fast_job)
+        await asyncio.wait_for(dispatcher.join(), timeout=1)
+
+        assert executed == ['fast', 'slow']
+
+    @pytest.mark.asyncio
+    async def test_respects_max_concurrency(self):
+        """Testa que o limite de tarefas simultâneas é respeitado."""
+        dispatcher = ChatDispatcher(max_concurrency=2)
+        running = 0
+        peak = 0
+
+        async def job():
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        for chat in range(6):
+            dispatcher.submit(chat, job)
+
+        assert dispatcher.in_flight == 6
+        await dispatcher.join()
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_error_does_not_stop_chat(self):
+        """Testa que um erro em uma tarefa não interrompe as seguintes."""
+        dispatcher = ChatDispatcher()
+        executed = []
+
+        async def failing_job():
+            raise RuntimeError('falha')
+
+        async def job():
+            executed.append('ok')
+
+        dispatcher.submit('chat', failing_job)
+        dispatcher.submit('chat', job)
+        await dispatcher.join()
+
+        assert executed == ['ok']
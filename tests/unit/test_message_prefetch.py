@@ -0,0 +1,82 @@
+"""
+Testes para o AdaptivePrefetch.
+
+Este módulo contém testes unitários para verificar o controle AIMD do
+prefetch a partir da latência, erros e atraso do event loop.
+"""
+
+import pytest
+
+from chatgraph.messages.prefetch import AdaptivePrefetch
+
+
+@pytest.mark.unit
+class TestAdaptivePrefetch:
+    """Testes para o AdaptivePrefetch."""
+
+    def test_invalid_bounds(self):
+        """Testa que limites inconsistentes são rejeitados."""
+        with pytest.raises(ValueError, match='prefetch'):
+            AdaptivePrefetch(min_prefetch=10, max_prefetch=5)
+
+    def test_initial_value_is_clamped(self):
+        """Testa que o prefetch inicial respeita os limites."""
+        assert AdaptivePrefetch(min_prefetch=5, current=1).current == 5
+        assert AdaptivePrefetch(max_prefetch=10, current=50).current == 10
+
+    def test_additive_increase_when_healthy(self):
+        """Testa o aumento aditivo com latência e erros aceitáveis."""
+        controller = AdaptivePrefetch(current=10, increase=2)
+        controller.record(0.1)
+
+        assert controller.adjust() == 12
+
+    def test_no_change_without_traffic(self):
+        """Testa que sem amostras o prefetch não muda."""
+        controller = AdaptivePrefetch(current=10)
+
+        assert controller.adjust() == 10
+
+    def test_multiplicative_decrease_on_latency(self):
+        """Testa a redução multiplicativa com latência alta."""
+        controller = AdaptivePrefetch(current=40, target_latency=1.0)
+        controller.record(3.0)
+
+        assert controller.adjust() == 20
+
+    def test_multiplicative_decrease_on_errors(self):
+        """Testa a redução multiplicativa com taxa de erros alta."""
+        controller = AdaptivePrefetch(current=40, max_error_rate=0.1)
+        controller.record(0.1, ok=True)
+        controller.record(0.1, ok=False)
+
+        assert controller.error_rate == 0.5
+        assert controller.adjust() == 20
+        assert controller.error_rate == 0.0
+
+    def test_external_errors_decrease(self):
+        """Testa que falhas externas reduzem o prefetch, mesmo sem tráfego."""
+        controller = AdaptivePrefetch(current=40, max_error_rate=0.1)
+        controller.record_errors(1)
+
+        assert controller.error_rate == 1.0
+        assert controller.adjust() == 20
+
+    def test_multiplicative_decrease_on_loop_lag(self):
+        """Testa a redução multiplicativa com event loop atrasado."""
+        controller = AdaptivePrefetch(current=40, max_loop_lag=0.1)
+
+        assert controller.adjust(loop_lag=0.5) == 20
+
+    def test_ttl_bounds_window(self):
+        """Testa que a janela não excede o orçamento do TTL."""
+        controller = AdaptivePrefetch(
+            current=100,
+            target_latency=20.0,
+            message_ttl=300.0,
+            ttl_safety=0.5,
+        )
+        controller.record(10.0)
+
+        # 150s de orçamento / 10s por mensagem com 2 handlers paralelos
+        assert controller.adjust(concurrency=2) == 30
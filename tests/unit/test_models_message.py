@@ -5,6 +5,8 @@ Este módulo contém testes unitários para SendType, File, ButtonType,
 TextMessage, Button e Message.
 """
 
+import hashlib
+
 import pytest
 from datetime import datetime
 from chatgraph.models.message import (
@@ -109,6 +111,59 @@ class TestFile:
         assert file.name == 'image.jpg'
         assert file.size == 1024
 
+    @pytest.mark.asyncio
+    async def test_file_load_file_in_chunks(self, tmp_path, monkeypatch):
+        """Testa leitura em blocos com hash incremental."""
+        monkeypatch.setattr('chatgraph.models.message.CHUNK_SIZE', 4)
+        path = tmp_path / 'doc.pdf'
+        path.write_bytes(b'conteudo do arquivo')
+        file = File(name=str(path))
+
+        await file.load_file()
+
+        assert file.bytes_data == b'conteudo do arquivo'
+        assert file.hash_id == hashlib.sha256(file.bytes_data).hexdigest()
+
+    @pytest.mark.asyncio
+    async def test_file_load_hash_keeps_no_bytes(self, tmp_path):
+        """Testa que load_hash não mantém os bytes em memória."""
+        path = tmp_path / 'doc.pdf'
+        path.write_bytes(b'conteudo do arquivo')
+        file = File(name=str(path))
+
+        hash_id = await file.load_hash()
+
+        assert hash_id == hashlib.sha256(b'conteudo do arquivo').hexdigest()
+        assert file.bytes_data is None
+
+    @pytest.mark.asyncio
+    async def test_file_load_hash_missing_file(self, tmp_path):
+        """Testa erro ao calcular hash de arquivo inexistente."""
+        file = File(name=str(tmp_path / 'inexistente.pdf'))
+
+        with pytest.raises(ValueError, match='Arquivo não encontrado'):
+            await file.load_hash()
+
+    @pytest.mark.asyncio
+    async def test_file_load_hash_uses_bytes_in_memory(self, tmp_path):
+        """Testa que bytes em memória são usados sem ler o caminho."""
+        file = File(
+            name=str(tmp_path / 'relatorio.pdf'), bytes_data=b'conteudo'
+        )
+
+        hash_id = await file.load_hash()
+
+        assert hash_id == hashlib.sha256(b'conteudo').hexdigest()
+        assert file.bytes_data == b'conteudo'
+
+    @pytest.mark.asyncio
+    async def test_file_load_hash_bytes_without_name(self):
+        """Testa o hash de um File apenas com bytes."""
+        file = File(bytes_data=b'abc')
+
+        assert await file.load_hash() == hashlib.sha256(b'abc').hexdigest()
+
+
 @pytest.mark.unit
 class TestButtonType:
     """Testes para o enum ButtonType."""
@@ -4,6 +4,8 @@ Testes para os modelos de UserState.
 Este módulo contém testes unitários para ChatID, User, Menu e UserState.
 """
 
+import json
+
 import pytest
 from chatgraph.models.userstate import ChatID, User, Menu, UserState
 
@@ -247,3 +249,125 @@ class TestUserState:
         assert user_state.menu.name == 'Main' if user_state.menu.name else ''
         assert user_state.user.name == 'João' if user_state.user.name else ''
         assert user_state.route == 'start'
+
+    @pytest.mark.parametrize(
+        'data',
+        [
+            {
+                'chat_id': {'user_id': 'user123', 'company_id': 'c1'},
+                'platform': 'whatsapp',
+                'session_id': 100,
+                'menu': {'id': 1, 'name': 'Main', 'active': None},
+                'user': {'name': 'João', 'email': None},
+                'route': 'start.menu',
+                'direction_in': True,
+                'observation': '{"a": 1}',
+                'last_update': '2025-11-16T07:42:47-03:00',
+                'dt_created': '2025-11-07T19:57:54-03:00',
+                'extra': 'ignorado',
+            },
+            {'chat_id': {'user_id': 'user123'}},
+            {},
+        ],
+    )
+    def test_normalize_dict_matches_models(self, data):
+        """Testa que normalize_dict equivale a from_dict().to_dict()."""
+        assert UserState.normalize_dict(data) == (
+            UserState.from_dict(data).to_dict()
+        )
+
+
+@pytest.mark.unit
+class TestUserStateObservation:
+    """Testes para o cache e o controle de alterações da observação."""
+
+    def make_state(self, observation=None):
+        return UserState(
+            chat_id=ChatID(user_id='user123', company_id='company456'),
+            platform='whatsapp',
+            observation=observation,
+        )
+
+    def test_observation_parsed_once(self, monkeypatch):
+        """Testa que o JSON é decodificado apenas no primeiro acesso."""
+        user_state = self.make_state('{"a": 1}')
+        calls = []
+        loads = json.loads
+        monkeypatch.setattr(
+            json, 'loads', lambda s: calls.append(s) or loads(s)
+        )
+
+        assert user_state.observation_dict == {'a': 1}
+        assert user_state.observation_dict == {'a': 1}
+        assert len(calls) == 1
+
+    def test_returned_dict_is_a_copy(self):
+        """Testa que alterar o retorno não altera o estado."""
+        user_state = self.make_state('{"a": 1}')
+
+        user_state.observation_dict['a'] = 2
+
+        assert user_state.observation_dict == {'a': 1}
+        assert not user_state.dirty_observation_keys
+
+    def test_only_changed_keys_are_dirty(self):
+        """Testa que apenas as chaves alteradas são registradas."""
+        user_state = self.make_state('{"a": 1, "b": 2, "c": 3}')
+
+        obs = user_state.observation_dict
+        obs['a'] = 10
+        del obs['c']
+        user_state.set_observation_dict(obs)
+        user_state.update_observation({'b': 2, 'd': 4})
+
+        assert user_state.dirty_observation_keys == {'a', 'c', 'd'}
+
+    def test_serialized_only_on_flush(self):
+        """Testa que `observation` só é atualizado no flush."""
+        user_state = self.make_state('{"a": 1}')
+
+        user_state.update_observation({'b': {'x': 1}})
+        assert user_state.observation == '{"a": 1}'
+
+        assert user_state.flush_observation() == '{"a": 1, "b": {"x": 1}}'
+        assert not user_state.dirty_observation_keys
+        assert user_state.to_dict()['observation'] == user_state.observation
+
+    def test_to_dict_keeps_dirty_keys(self):
+        """Testa que `to_dict` serializa as alterações sem limpá-las."""
+        user_state = self.make_state('{"a": 1}')
+
+        user_state.update_observation({'b': 2})
+        data = user_state.to_dict()
+
+        assert json.loads(data['observation']) == {'a': 1, 'b': 2}
+        assert user_state.dirty_observation_keys == {'b'}
+        assert user_state.observation == '{"a": 1}'
+
+    def test_shared_container_is_dirty(self):
+        """Testa que um contêiner reatribuído é considerado alterado."""
+        user_state = self.make_state('{"lista": [1]}')
+
+        obs = user_state.observation_dict
+        obs['lista'].append(2)
+        user_state.set_observation_dict(obs)
+
+        assert user_state.dirty_observation_keys == {'lista'}
+        assert json.loads(user_state.flush_observation()) == {
+            'lista': [1, 2]
+        }
+
+    def test_replaced_observation_string_is_reparsed(self):
+        """Testa que atribuir uma nova string descarta o cache."""
+        user_state = self.make_state('{"a": 1}')
+        assert user_state.observation_dict == {'a': 1}
+
+        user_state.observation = '{"b": 2}'
+
+        assert user_state.observation_dict == {'b': 2}
+
+    def test_dict_and_invalid_observation(self):
+        """Testa observação já decodificada e JSON inválido."""
+        assert self.make_state({'a': 1}).observation_dict == {'a': 1}
+        assert self.make_state('inválido').observation_dict == {}
+        assert self.make_state('[1, 2]').observation_dict == {}
@@ -0,0 +1,70 @@
+"""
+Testes para o KeyedRateLimiter.
+
+Este módulo contém testes unitários para verificar o token bucket por
+chave usado no envio de mensagens.
+"""
+
+import pytest
+
+from chatgraph.models.userstate import UserState
+from chatgraph.services.rate_limiter import KeyedRateLimiter
+
+
+@pytest.mark.unit
+class TestKeyedRateLimiter:
+    """Testes para o KeyedRateLimiter."""
+
+    def test_invalid_params(self):
+        """Testa que parâmetros inválidos são rejeitados."""
+        with pytest.raises(ValueError, match='rate e burst'):
+            KeyedRateLimiter(rate=0)
+        with pytest.raises(ValueError, match='Escopo inválido'):
+            KeyedRateLimiter(rate=1, scope='bairro')
+
+    def test_burst_is_free(self):
+        """Testa que envios dentro do burst não aguardam."""
+        limiter = KeyedRateLimiter(rate=1, burst=3)
+
+        delays = [limiter.reserve('chat') for _ in range(3)]
+
+        assert delays == [0.0, 0.0, 0.0]
+        assert limiter.stats.throttled == 0
+
+    def test_throttles_beyond_rate(self):
+        """Testa que envios acima da taxa reservam tempo futuro."""
+        limiter = KeyedRateLimiter(rate=10, burst=1)
+
+        assert limiter.reserve('chat') == 0.0
+        assert limiter.reserve('chat') == pytest.approx(0.1, abs=0.01)
+        assert limiter.reserve('chat') == pytest.approx(0.2, abs=0.01)
+        assert limiter.stats.throttled == 2
+        assert limiter.stats.throttled_seconds == pytest.approx(0.3, abs=0.02)
+
+    def test_keys_are_independent(self):
+        """Testa que chats diferentes não compartilham o bucket."""
+        limiter = KeyedRateLimiter(rate=1, burst=1)
+
+        assert limiter.reserve('chat-a') == 0.0
+        assert limiter.reserve('chat-b') == 0.0
+
+    @pytest.mark.asyncio
+    async def test_acquire_waits(self):
+        """Testa que acquire aguarda o tempo reservado."""
+        limiter = KeyedRateLimiter(rate=50, burst=1)
+
+        assert await limiter.acquire('chat') == 0.0
+        assert await limiter.acquire('chat') > 0
+
+    def test_key_scopes(self, sample_user_state_data):
+        """Testa a chave gerada para cada escopo."""
+        user_state = UserState.from_dict(sample_user_state_data)
+
+        assert KeyedRateLimiter(1).key_for(user_state) == (
+            'user123',
+            'company456',
+        )
+        company = KeyedRateLimiter(1, scope='company')
+        assert company.key_for(user_state) == 'company456'
+        platform = KeyedRateLimiter(1, scope='platform')
+        assert platform.key_for(user_state) == 'whatsapp'
@@ -0,0 +1,108 @@
+"""
+Testes para as políticas de resiliência.
+
+Este módulo contém testes unitários para o orçamento de repetições e o
+disjuntor usados nas chamadas ao roteador.
+"""
+
+import time
+
+import pytest
+
+from chatgraph.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    RetryPolicy,
+)
+
+
+@pytest.mark.unit
+class TestRetryPolicy:
+    """Testes para a RetryPolicy."""
+
+    def test_invalid_attempts(self):
+        """Testa que ao menos uma tentativa é exigida."""
+        with pytest.raises(ValueError, match='attempts'):
+            RetryPolicy(attempts=0)
+
+
+@pytest.mark.unit
+class TestRetryBudget:
+    """Testes para o RetryBudget."""
+
+    def test_withdraw_until_empty(self):
+        """Testa que as repetições param quando as fichas acabam."""
+        budget = RetryBudget(ratio=0.5, max_tokens=2)
+
+        assert budget.try_withdraw()
+        assert budget.try_withdraw()
+        assert not budget.try_withdraw()
+
+    def test_deposit_refills_up_to_max(self):
+        """Testa que cada requisição repõe uma fração, até o máximo."""
+        budget = RetryBudget(ratio=0.5, max_tokens=2)
+        budget.tokens = 0
+
+        budget.deposit()
+        assert not budget.try_withdraw()
+        budget.deposit()
+        assert budget.try_withdraw()
+
+        for _ in range(10):
+            budget.deposit()
+        assert budget.tokens == 2
+
+
+@pytest.mark.unit
+class TestCircuitBreaker:
+    """Testes para o CircuitBreaker."""
+
+    def test_opens_after_threshold(self):
+        """Testa que o circuito abre após falhas consecutivas."""
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+
+        breaker.record_failure()
+        assert breaker.state == 'closed'
+        breaker.record_failure()
+        assert breaker.state == 'open'
+
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+    def test_success_resets_failures(self):
+        """Testa que um sucesso zera as falhas consecutivas."""
+        breaker = CircuitBreaker(failure_threshold=2)
+
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == 'closed'
+
+    def test_half_open_allows_single_probe(self):
+        """Testa que, após o tempo aberto, apenas uma chamada é liberada."""
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+        breaker.record_failure()
+
+        time.sleep(0.02)
+        assert breaker.state == 'half_open'
+
+        breaker.before_call()
+        with pytest.raises(CircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        assert breaker.state == 'closed'
+
+    def test_failed_probe_reopens(self):
+        """Testa que a falha da chamada de teste reabre o circuito."""
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=0.01)
+        for _ in range(3):
+            breaker.record_failure()
+
+        time.sleep(0.02)
+        breaker.before_call()
+        breaker.record_failure()
+
+        assert breaker.state == 'open'
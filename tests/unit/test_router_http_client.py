@@ -5,12 +5,25 @@ Este módulo contém testes unitários para verificar a inicialização
 e funcionamento do cliente HTTP de roteamento.
 """
 
+import asyncio
+import json
+
 import httpx
 import pytest
 
+from chatgraph.services.backoff import ExponentialBackoff
+from chatgraph.services.cache import AsyncTTLCache
+from chatgraph.services.concurrency import AdaptiveConcurrencyLimiter
+from chatgraph.services.deadline import Deadline, DeadlineExceeded
+from chatgraph.services.resilience import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryBudget,
+    RetryPolicy,
+)
 from chatgraph.services.router_http_client import RouterHTTPClient
 from chatgraph.models.userstate import ChatID, UserState
-from chatgraph.models.message import Message
+from chatgraph.models.message import File, Message
 
 @pytest.mark.unit
 class TestRouterHTTPClientInit:
@@ -333,3 +346,770 @@ class TestRouterHTTPClientFiles:
             assert 'file_id' in result
         finally:
             await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientEndActions:
+    """Testes para o cache das ações de encerramento."""
+
+    @pytest.mark.asyncio
+    async def test_get_end_action_is_cached(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que consultas repetidas fazem uma única requisição."""
+        route = respx_mock.get(f'{http_client_base_url}/end_actions/').mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': {'id': 'ea1', 'name': 'voll_ended'},
+                },
+            )
+        )
+
+        client = RouterHTTPClient(
+            base_url=http_client_base_url,
+            end_action_cache=AsyncTTLCache(),
+        )
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    client.get_end_action(end_action_name='voll_ended')
+                    for _ in range(3)
+                )
+            )
+            by_id = await client.get_end_action('ea1')
+
+            assert route.call_count == 1
+            assert all(r.name == 'voll_ended' for r in results)
+            assert by_id.name == 'voll_ended'
+
+            # Cada chamada recebe uma cópia que pode ser alterada
+            results[0].observation = 'alterada'
+            again = await client.get_end_action(end_action_name='voll_ended')
+            assert again.observation != 'alterada'
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_preload_end_actions(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa a pré-carga e a contagem de ações carregadas."""
+        respx_mock.get(
+            f'{http_client_base_url}/end_actions/',
+            params={'name': 'voll_ended'},
+        ).mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': {'id': 'ea1', 'name': 'voll_ended'},
+                },
+            )
+        )
+        respx_mock.get(f'{http_client_base_url}/end_actions/').mock(
+            return_value=httpx.Response(
+                200, json={'status': False, 'message': 'não encontrada'}
+            )
+        )
+
+        cache = AsyncTTLCache()
+        client = RouterHTTPClient(
+            base_url=http_client_base_url, end_action_cache=cache
+        )
+
+        try:
+            loaded = await client.preload_end_actions(
+                ['voll_ended', 'inexistente']
+            )
+            assert loaded == 1
+            assert cache.get((client.base_url, '', 'voll_ended')) is not None
+        finally:
+            await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientUploadStreaming:
+    """Testes para o upload em streaming de arquivos locais."""
+
+    @pytest.mark.asyncio
+    async def test_upload_streams_local_file(
+        self, http_client_base_url, respx_mock, sample_file_data, tmp_path
+    ):
+        """Testa upload de arquivo local sem bytes carregados."""
+        path = tmp_path / 'doc.pdf'
+        path.write_bytes(b'conteudo do arquivo')
+        route = respx_mock.post(f'{http_client_base_url}/files/upload/').mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': sample_file_data,
+                },
+            )
+        )
+
+        client = RouterHTTPClient(base_url=http_client_base_url)
+
+        try:
+            result = await client.upload_file(File(name=str(path)))
+            assert result.id == sample_file_data['id']
+            assert b'conteudo do arquivo' in route.calls.last.request.read()
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_upload_stream_is_read_in_chunks(
+        self,
+        http_client_base_url,
+        respx_mock,
+        sample_file_data,
+        tmp_path,
+        monkeypatch,
+    ):
+        """Testa o corpo multipart montado a partir de blocos do disco."""
+        monkeypatch.setattr(
+            'chatgraph.services.router_http_client.CHUNK_SIZE', 4
+        )
+        path = tmp_path / 'doc.pdf'
+        path.write_bytes(b'conteudo do arquivo')
+        route = respx_mock.post(f'{http_client_base_url}/files/upload/').mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': sample_file_data,
+                },
+            )
+        )
+
+        client = RouterHTTPClient(base_url=http_client_base_url)
+
+        try:
+            await client.upload_file(
+                File(name=str(path), mime_type='application/pdf')
+            )
+        finally:
+            await client.close()
+
+        request = route.calls.last.request
+        body = request.read()
+        boundary = request.headers['Content-Type'].split('boundary=')[1]
+        assert int(request.headers['Content-Length']) == len(body)
+        assert body.startswith(f'--{boundary}\r\n'.encode())
+        assert b'filename="doc.pdf"' in body
+        assert b'Content-Type: application/pdf' in body
+        assert body.endswith(
+            f'\r\n\r\nconteudo do arquivo\r\n--{boundary}--\r\n'.encode()
+        )
+
+    @pytest.mark.asyncio
+    async def test_upload_without_data_raises(self, http_client_base_url):
+        """Testa erro quando não há bytes nem arquivo local."""
+        client = RouterHTTPClient(base_url=http_client_base_url)
+
+        try:
+            with pytest.raises(ValueError, match='Arquivo não carregado'):
+                await client.upload_file(File(name='inexistente.pdf'))
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_upload_file_from_url(
+        self, http_client_base_url, respx_mock, sample_file_data
+    ):
+        """Testa que apenas a URL é enviada ao servidor."""
+        route = respx_mock.post(f'{http_client_base_url}/files/upload/').mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': sample_file_data,
+                },
+            )
+        )
+
+        client = RouterHTTPClient(base_url=http_client_base_url)
+
+        try:
+            result = await client.upload_file_from_url(
+                File(url='https://cdn.example.com/doc.pdf', name='doc.pdf')
+            )
+            body = route.calls.last.request.read()
+            assert result.id == sample_file_data['id']
+            assert b'file_url=https%3A%2F%2Fcdn.example.com%2Fdoc.pdf' in body
+        finally:
+            await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientBatching:
+    """Testes para o envio de mensagens em lote."""
+
+    @pytest.mark.asyncio
+    async def test_send_message_batched(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que envios concorrentes usam o endpoint em lote."""
+        route = respx_mock.post(
+            f'{http_client_base_url}/messages/send/batch/'
+        ).mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': [
+                        {'status': True, 'message': 'enviada'},
+                        {'status': False, 'message': 'chat encerrado'},
+                    ],
+                },
+            )
+        )
+
+        client = RouterHTTPClient(
+            base_url=http_client_base_url,
+            batch_endpoint='/messages/send/batch/',
+        )
+        states = [
+            UserState(
+                chat_id=ChatID(user_id=user, company_id='c1'),
+                platform='whatsapp',
+            )
+            for user in ('u1', 'u2')
+        ]
+
+        try:
+            results = await asyncio.gather(
+                *(
+                    client.send_message(Message(text_message='Olá'), state)
+                    for state in states
+                ),
+                return_exceptions=True,
+            )
+            assert route.call_count == 1
+            assert results[0].status is True
+            assert 'chat encerrado' in str(results[1])
+        finally:
+            await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientPool:
+    """Testes para a configuração e as métricas do pool de conexões."""
+
+    def test_pool_limits(self, http_client_base_url):
+        """Testa que os limites do pool são repassados ao httpx."""
+        client = RouterHTTPClient(
+            base_url=http_client_base_url,
+            max_connections=7,
+            max_keepalive_connections=3,
+            keepalive_expiry=2.5,
+        )
+        pool = client._client._transport._pool
+
+        assert pool._max_connections == 7
+        assert pool._max_keepalive_connections == 3
+        assert pool._keepalive_expiry == 2.5
+
+    def test_http2_without_h2(self, http_client_base_url):
+        """Testa que HTTP/2 sem o pacote h2 gera ImportError."""
+        try:
+            import h2  # noqa: F401
+
+            pytest.skip('h2 instalado')
+        except ImportError:
+            pass
+
+        with pytest.raises(ImportError):
+            RouterHTTPClient(base_url=http_client_base_url, http2=True)
+
+    @pytest.mark.asyncio
+    async def test_pool_stats_waiters(self):
+        """Testa que requisições acima do limite aparecem como espera."""
+        release = asyncio.Event()
+
+        async def handle(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            await release.wait()
+            writer.write(
+                b'HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}'
+            )
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RouterHTTPClient(
+            base_url=f'http://127.0.0.1:{port}', max_connections=1
+        )
+
+        try:
+            assert client.pool_stats().connections == 0
+
+            tasks = [
+                asyncio.create_task(client._client.get('/'))
+                for _ in range(3)
+            ]
+            for _ in range(50):
+                await asyncio.sleep(0.01)
+                stats = client.pool_stats()
+                if stats.active == 1 and stats.waiters == 2:
+                    break
+
+            assert stats.connections == 1
+            assert stats.active == 1
+            assert stats.in_flight == 1
+            assert stats.waiters == 2
+
+            release.set()
+            await asyncio.gather(*tasks)
+            assert client.pool_stats().waiters == 0
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientResilience:
+    """Testes para repetições, orçamento e disjuntor."""
+
+    @staticmethod
+    def make_client(base_url, **kwargs):
+        return RouterHTTPClient(
+            base_url=base_url,
+            retry_policy=RetryPolicy(
+                attempts=3, backoff=ExponentialBackoff(base=0)
+            ),
+            **kwargs,
+        )
+
+    @pytest.mark.asyncio
+    async def test_get_retries_transient_errors(
+        self, http_client_base_url, respx_mock, sample_file_data
+    ):
+        """Testa que GETs idempotentes são repetidos após falhas."""
+        route = respx_mock.get(f'{http_client_base_url}/files/f1/').mock(
+            side_effect=[
+                httpx.ConnectError('recusada'),
+                httpx.Response(503),
+                httpx.Response(
+                    200,
+                    json={
+                        'status': True,
+                        'message': 'ok',
+                        'data': sample_file_data,
+                    },
+                ),
+            ]
+        )
+        client = self.make_client(http_client_base_url)
+
+        try:
+            result = await client.get_file('f1')
+            assert result.id == sample_file_data['id']
+            assert route.call_count == 3
+            assert client.resilience_stats.retries == 2
+            assert client.circuit_breaker.failures == 0
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_post_is_not_retried(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que chamadas não idempotentes não são repetidas."""
+        route = respx_mock.post(
+            f'{http_client_base_url}/session/route/'
+        ).mock(side_effect=httpx.ConnectError('recusada'))
+        client = self.make_client(http_client_base_url)
+
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.set_session_route(
+                    ChatID(user_id='u1', company_id='c1'), 'start'
+                )
+            assert route.call_count == 1
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_budget_limits_retries(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que sem orçamento a falha é devolvida sem repetir."""
+        route = respx_mock.get(f'{http_client_base_url}/files/f1/').mock(
+            side_effect=httpx.ConnectError('recusada')
+        )
+        client = self.make_client(
+            http_client_base_url,
+            retry_budget=RetryBudget(ratio=0, max_tokens=1),
+        )
+
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.get_file('f1')
+            assert route.call_count == 2
+            assert client.resilience_stats.budget_exhausted == 1
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_open_circuit_fails_fast(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que o circuito aberto recusa chamadas sem requisição."""
+        route = respx_mock.post(
+            f'{http_client_base_url}/session/route/'
+        ).mock(side_effect=httpx.ConnectError('recusada'))
+        client = self.make_client(
+            http_client_base_url,
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=2, reset_timeout=60
+            ),
+        )
+        chat_id = ChatID(user_id='u1', company_id='c1')
+
+        try:
+            for _ in range(2):
+                with pytest.raises(httpx.ConnectError):
+                    await client.set_session_route(chat_id, 'start')
+            with pytest.raises(CircuitOpenError):
+                await client.set_session_route(chat_id, 'start')
+
+            assert route.call_count == 2
+            assert client.resilience_stats.rejected == 1
+        finally:
+            await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientBalancing:
+    """Testes para o balanceamento entre réplicas."""
+
+    @pytest.mark.asyncio
+    async def test_single_url_keeps_relative_requests(
+        self, http_client_base_url
+    ):
+        """Testa que com uma única URL não há balanceador."""
+        client = RouterHTTPClient(base_url=[http_client_base_url])
+
+        assert client.balancer is None
+        assert client.base_url == http_client_base_url
+        await client.close()
+
+    @pytest.mark.asyncio
+    async def test_retry_moves_to_healthy_replica(
+        self, respx_mock, sample_file_data
+    ):
+        """Testa que a falha de uma réplica é repetida em outra e ejetada."""
+        down = respx_mock.get('http://r1/v1/files/f1/').mock(
+            side_effect=httpx.ConnectError('recusada')
+        )
+        up = respx_mock.get('http://r2/v1/files/f1/').mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': sample_file_data,
+                },
+            )
+        )
+        client = RouterHTTPClient(
+            base_url=['http://r1/v1', 'http://r2/v1'],
+            retry_policy=RetryPolicy(
+                attempts=3, backoff=ExponentialBackoff(base=0)
+            ),
+        )
+        client.balancer.failure_threshold = 1
+
+        try:
+            for _ in range(5):
+                result = await client.get_file('f1')
+                assert result.id == sample_file_data['id']
+
+            assert down.call_count <= 1
+            assert up.call_count == 5
+            assert client.balancer.replicas[0].ejected
+        finally:
+            await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientDeadline:
+    """Testes para timeouts por operação e o prazo das mensagens."""
+
+    def test_timeouts_profile(self, http_client_base_url):
+        """Testa que os timeouts por operação sobrepõem os padrões."""
+        client = RouterHTTPClient(
+            base_url=http_client_base_url, timeouts={'get_file': 5.0}
+        )
+
+        assert client.timeouts['get_file'] == 5.0
+        assert client.timeouts['upload_file'] == 120.0
+
+    @pytest.mark.asyncio
+    async def test_expired_deadline_fails_fast(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que nenhuma requisição é feita após o prazo."""
+        route = respx_mock.post(f'{http_client_base_url}/messages/send/')
+        client = RouterHTTPClient(base_url=http_client_base_url)
+        state = UserState(
+            chat_id=ChatID(user_id='u1', company_id='c1'),
+            platform='whatsapp',
+        )
+
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await client.send_message(
+                    Message(text_message='Olá'),
+                    state,
+                    deadline=Deadline.after(-1),
+                )
+            assert route.call_count == 0
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_deadline_bounds_timeout(self):
+        """Testa que o timeout é limitado ao prazo sem abrir o disjuntor."""
+
+        async def handle(reader, writer):
+            await reader.readuntil(b'\r\n\r\n')
+            await asyncio.sleep(1)
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RouterHTTPClient(base_url=f'http://127.0.0.1:{port}')
+
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await client.get_file('f1', deadline=Deadline.after(0.1))
+            assert client.circuit_breaker.failures == 0
+            assert client.resilience_stats.failures == 0
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientConcurrency:
+    """Testes para o limitador adaptativo de concorrência."""
+
+    @pytest.mark.asyncio
+    async def test_limiter_releases_and_samples(
+        self, http_client_base_url, respx_mock, sample_file_data
+    ):
+        """Testa que cada requisição ocupa e libera uma permissão."""
+        respx_mock.get(f'{http_client_base_url}/files/f1/').mock(
+            return_value=httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': sample_file_data,
+                },
+            )
+        )
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=2, max_limit=2)
+        client = RouterHTTPClient(
+            base_url=http_client_base_url, concurrency_limiter=limiter
+        )
+
+        try:
+            await client.get_file('f1')
+            assert limiter.in_flight == 0
+            assert limiter.stats.acquired == 1
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_failures_reduce_limit(
+        self, http_client_base_url, respx_mock
+    ):
+        """Testa que erros de transporte reduzem o limite."""
+        respx_mock.post(f'{http_client_base_url}/session/route/').mock(
+            side_effect=httpx.ConnectError('recusada')
+        )
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=10, max_limit=20)
+        client = RouterHTTPClient(
+            base_url=http_client_base_url, concurrency_limiter=limiter
+        )
+
+        try:
+            with pytest.raises(httpx.ConnectError):
+                await client.set_session_route(
+                    ChatID(user_id='u1', company_id='c1'), 'start'
+                )
+            assert limiter.limit == 9
+            assert limiter.in_flight == 0
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_queue_wait_bounded_by_deadline(self, http_client_base_url):
+        """Testa que a espera na fila respeita o prazo da mensagem."""
+        limiter = AdaptiveConcurrencyLimiter(initial_limit=1, max_limit=1)
+        client = RouterHTTPClient(
+            base_url=http_client_base_url, concurrency_limiter=limiter
+        )
+        await limiter.acquire()
+
+        try:
+            with pytest.raises(DeadlineExceeded):
+                await client.get_file('f1', deadline=Deadline.after(0.05))
+            assert limiter.queue_depth == 0
+        finally:
+            limiter.release()
+            await client.close()
+
+
+@pytest.mark.unit
+class TestRouterHTTPClientCoalescing:
+    """Testes para a coalescência de GETs concorrentes."""
+
+    @staticmethod
+    def mock_file(respx_mock, base_url, file_data):
+        async def respond(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200,
+                json={'status': True, 'message': 'ok', 'data': file_data},
+            )
+
+        return respx_mock.get(f'{base_url}/files/f1/').mock(
+            side_effect=respond
+        )
+
+    @pytest.mark.asyncio
+    async def test_concurrent_gets_share_request(
+        self, http_client_base_url, respx_mock, sample_file_data
+    ):
+        """Testa que GETs idênticos simultâneos fazem uma requisição."""
+        route = self.mock_file(
+            respx_mock, http_client_base_url, sample_file_data
+        )
+        client = RouterHTTPClient(base_url=http_client_base_url)
+
+        try:
+            files = await asyncio.gather(
+                *(client.get_file('f1') for _ in range(10))
+            )
+            assert {f.id for f in files} == {sample_file_data['id']}
+            assert route.call_count == 1
+            assert client.singleflight.stats.misses == 1
+            assert client.singleflight.stats.hits == 9
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_session_reads_share_request(
+        self, http_client_base_url, respx_mock, sample_chat_id_data
+    ):
+        """Testa a coalescência de get_session_by_chat_id por chat."""
+        chat_id = ChatID.from_dict(sample_chat_id_data)
+
+        async def respond(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(
+                200,
+                json={
+                    'status': True,
+                    'message': 'ok',
+                    'data': {
+                        'chat_id': sample_chat_id_data,
+                        'platform': 'whatsapp',
+                    },
+                },
+            )
+
+        route = respx_mock.get(f'{http_client_base_url}/session/').mock(
+            side_effect=respond
+        )
+        client = RouterHTTPClient(base_url=http_client_base_url)
+        other = ChatID(user_id='outro', company_id=chat_id.company_id)
+
+        try:
+            states = await asyncio.gather(
+                *(client.get_session_by_chat_id(chat_id) for _ in range(5)),
+                client.get_session_by_chat_id(other),
+            )
+            assert all(state.platform == 'whatsapp' for state in states)
+            # Uma requisição por chat: parâmetros diferentes não coalescem
+            assert route.call_count == 2
+            assert client.singleflight.stats.hits == 4
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_coalescing_disabled(
+        self, http_client_base_url, respx_mock, sample_file_data
+    ):
+        """Testa que sem coalescência cada chamada faz sua requisição."""
+        route = self.mock_file(
+            respx_mock, http_client_base_url, sample_file_data
+        )
+        client = RouterHTTPClient(
+            base_url=http_client_base_url, coalesce_reads=False
+        )
+
+        try:
+            await asyncio.gather(*(client.get_file('f1') for _ in range(3)))
+            assert client.singleflight is None
+            assert route.call_count == 3
+        finally:
+            await client.close()
+
+    @pytest.mark.asyncio
+    async def test_other_deadline_does_not_fail_follower(
+        self, sample_file_data
+    ):
+        """Testa que o prazo esgotado de outra chamada não é repassado."""
+        requests = 0
+
+        async def handle(reader, writer):
+            nonlocal requests
+            await reader.readuntil(b'\r\n\r\n')
+            requests += 1
+            await asyncio.sleep(0.2)
+            data = json.dumps(
+                {'status': True, 'message': 'ok', 'data': sample_file_data}
+            ).encode()
+            writer.write(
+                b'HTTP/1.1 200 OK\r\n'
+                b'Content-Type: application/json\r\n'
+                + f'Content-Length: {len(data)}\r\n\r\n'.encode()
+                + data
+            )
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(handle, '127.0.0.1', 0)
+        port = server.sockets[0].getsockname()[1]
+        client = RouterHTTPClient(base_url=f'http://127.0.0.1:{port}')
+
+        try:
+            results = await asyncio.gather(
+                client.get_file('f1', deadline=Deadline.after(0.05)),
+                client.get_file('f1'),
+                return_exceptions=True,
+            )
+            assert isinstance(results[0], DeadlineExceeded)
+            assert results[1].id == sample_file_data['id']
+            assert requests == 2
+        finally:
+            await client.close()
+            server.close()
+            await server.wait_closed()
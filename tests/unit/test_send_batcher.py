@@ -0,0 +1,149 @@
+"""
+Testes para o SendBatcher.
+
+Este módulo contém testes unitários para verificar o agrupamento de
+envios, a ordem por chat e a entrega individual de resultados.
+"""
+
+import asyncio
+
+import pytest
+
+from chatgraph.services.send_batcher import SendBatcher
+
+
+class FakeRouter:
+    """Destino de envios que registra lotes e itens individuais."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.singles: list[dict] = []
+        self.batches: list[list[dict]] = []
+        self.order: list[tuple] = []
+
+    async def send_one(self, item: dict):
+        await asyncio.sleep(self.delay)
+        self.singles.append(item)
+        self.order.append((item['chat'], item['seq']))
+        if item.get('fail'):
+            raise ValueError('falhou')
+        return f"ok-{item['seq']}"
+
+    async def send_many(self, items: list[dict]):
+        await asyncio.sleep(self.delay)
+        self.batches.append(items)
+        self.order.extend((item['chat'], item['seq']) for item in items)
+        return [
+            ValueError('falhou') if item.get('fail') else f"ok-{item['seq']}"
+            for item in items
+        ]
+
+
+@pytest.mark.unit
+class TestSendBatcher:
+    """Testes para o SendBatcher."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_sends_share_one_batch(self):
+        """Testa que envios simultâneos formam um único lote."""
+        router = FakeRouter()
+        batcher = SendBatcher(router.send_one, router.send_many)
+
+        results = await asyncio.gather(
+            *(
+                batcher.submit(chat, {'chat': chat, 'seq': chat})
+                for chat in range(10)
+            )
+        )
+
+        assert results == [f'ok-{chat}' for chat in range(10)]
+        assert len(router.batches) == 1
+        assert batcher.stats.batches == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_flush(self):
+        """Testa que o lote é enviado ao atingir max_batch."""
+        router = FakeRouter()
+        batcher = SendBatcher(
+            router.send_one, router.send_many, max_batch=3, max_delay=10
+        )
+
+        await asyncio.wait_for(
+            asyncio.gather(
+                *(
+                    batcher.submit(chat, {'chat': chat, 'seq': chat})
+                    for chat in range(6)
+                )
+            ),
+            timeout=1,
+        )
+
+        assert [len(batch) for batch in router.batches] == [3, 3]
+
+    @pytest.mark.asyncio
+    async def test_single_item_uses_single_send(self):
+        """Testa que um lote de um item usa o envio individual."""
+        router = FakeRouter()
+        batcher = SendBatcher(router.send_one, router.send_many)
+
+        assert await batcher.submit('a', {'chat': 'a', 'seq': 1}) == 'ok-1'
+        assert router.singles
+        assert not router.batches
+
+    @pytest.mark.asyncio
+    async def test_errors_are_delivered_per_item(self):
+        """Testa que a falha de um item não afeta os demais."""
+        router = FakeRouter()
+        batcher = SendBatcher(router.send_one, router.send_many)
+
+        results = await asyncio.gather(
+            batcher.submit('a', {'chat': 'a', 'seq': 1}),
+            batcher.submit('b', {'chat': 'b', 'seq': 2, 'fail': True}),
+            return_exceptions=True,
+        )
+
+        assert results[0] == 'ok-1'
+        assert isinstance(results[1], ValueError)
+
+    @pytest.mark.asyncio
+    async def test_chat_order_is_preserved_across_batches(self):
+        """Testa que itens de um chat nunca ultrapassam os anteriores."""
+        router = FakeRouter(delay=0.01)
+        batcher = SendBatcher(
+            router.send_one, router.send_many, max_batch=2, max_delay=0
+        )
+
+        await asyncio.gather(
+            *(
+                batcher.submit(chat, {'chat': chat, 'seq': seq})
+                for seq in range(4)
+                for chat in ('a', 'b', 'c')
+            )
+        )
+
+        for chat in ('a', 'b', 'c'):
+            seqs = [seq for key, seq in router.order if key == chat]
+            assert seqs == [0, 1, 2, 3]
+        assert batcher.stats.deferred > 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_batch_releases_chat(self):
+        """Testa que um lote cancelado não trava os envios do chat."""
+        router = FakeRouter(delay=0.05)
+        batcher = SendBatcher(router.send_one, router.send_many, max_delay=0)
+
+        first = asyncio.create_task(
+            batcher.submit('a', {'chat': 'a', 'seq': 1})
+        )
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(
+            batcher.submit('a', {'chat': 'a', 'seq': 2})
+        )
+        await asyncio.sleep(0)
+        for task in list(batcher._SendBatcher__tasks):
+            task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await asyncio.wait_for(first, timeout=1)
+        assert await asyncio.wait_for(second, timeout=1) == 'ok-2'
+        assert not batcher._SendBatcher__in_flight
@@ -0,0 +1,83 @@
+"""
+Testes para o AsyncTTLCache.
+
+Este módulo contém testes unitários para verificar expiração, descarte
+LRU e coalescência de carregamentos concorrentes do cache.
+"""
+
+import asyncio
+
+import pytest
+
+from chatgraph.services.cache import AsyncTTLCache
+
+
+@pytest.mark.unit
+class TestAsyncTTLCache:
+    """Testes para o AsyncTTLCache."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_loads_are_coalesced(self):
+        """Testa que consultas simultâneas executam um só carregamento."""
+        cache = AsyncTTLCache()
+        calls = 0
+
+        async def loader():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 'valor'
+
+        results = await asyncio.gather(
+            *(cache.get_or_load('chave', loader) for _ in range(5))
+        )
+
+        assert results == ['valor'] * 5
+        assert calls == 1
+        assert cache.stats.misses == 1
+        assert cache.stats.coalesced == 4
+
+        assert await cache.get_or_load('chave', loader) == 'valor'
+        assert cache.stats.hits == 1
+
+    @pytest.mark.asyncio
+    async def test_values_expire(self, monkeypatch):
+        """Testa que valores expirados são carregados novamente."""
+        now = [100.0]
+        monkeypatch.setattr(
+            'chatgraph.services.cache.time.monotonic', lambda: now[0]
+        )
+        cache = AsyncTTLCache(ttl=10)
+        cache.set('chave', 1)
+
+        now[0] += 9
+        assert cache.get('chave') == 1
+        now[0] += 2
+        assert cache.get('chave') is None
+
+    def test_least_recently_used_is_evicted(self):
+        """Testa que a chave menos usada é descartada ao exceder o limite."""
+        cache = AsyncTTLCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert cache.get('a') == 1
+        assert cache.get('b') is None
+        assert len(cache) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_are_not_cached(self):
+        """Testa que um erro é repassado e não fica armazenado."""
+        cache = AsyncTTLCache()
+
+        async def failing():
+            raise ValueError('indisponível')
+
+        async def loader():
+            return 'valor'
+
+        with pytest.raises(ValueError, match='indisponível'):
+            await cache.get_or_load('chave', failing)
+        assert await cache.get_or_load('chave', loader) == 'valor'
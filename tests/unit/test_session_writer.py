@@ -0,0 +1,110 @@
+"""
+Testes para o SessionStateWriter.
+
+Este módulo contém testes unitários para verificar a ordem, o descarte
+de snapshots substituídos e o flush das escritas de observação.
+"""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from chatgraph.models.userstate import ChatID
+from chatgraph.services.session_writer import SessionStateWriter
+
+
+@pytest.fixture
+def router_client():
+    """Cliente do roteador que registra as observações recebidas."""
+    client = AsyncMock()
+    client.written = []
+
+    async def update(chat_id, observation):
+        await asyncio.sleep(0)
+        client.written.append((chat_id.user_id, observation))
+
+    client.update_session_observation.side_effect = update
+    return client
+
+
+@pytest.mark.unit
+class TestSessionStateWriter:
+    """Testes para o SessionStateWriter."""
+
+    @pytest.mark.asyncio
+    async def test_flush_waits_for_writes_in_order(self, router_client):
+        """Testa que o flush aguarda as escritas, na ordem de chegada."""
+        writer = SessionStateWriter(router_client)
+        chat = ChatID(user_id='u1', company_id='c1')
+
+        writer.write_observation(chat, '{"a": 1}')
+        await asyncio.sleep(0)
+        writer.write_observation(chat, '{"a": 2}')
+        await writer.flush(chat)
+
+        assert router_client.written == [
+            ('u1', '{"a": 1}'),
+            ('u1', '{"a": 2}'),
+        ]
+        assert writer.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_queued_snapshots_are_coalesced(self, router_client):
+        """Testa que apenas o snapshot mais recente da fila é enviado."""
+        writer = SessionStateWriter(router_client)
+        chat = ChatID(user_id='u1', company_id='c1')
+
+        for value in range(5):
+            writer.write_observation(chat, f'{{"a": {value}}}')
+        await writer.flush()
+
+        assert router_client.written == [('u1', '{"a": 4}')]
+        assert writer.stats.coalesced == 4
+
+    @pytest.mark.asyncio
+    async def test_sent_snapshot_is_rewritten(self, router_client):
+        """Testa que um snapshot já enviado é reenviado se repetido."""
+        writer = SessionStateWriter(router_client)
+        chat = ChatID(user_id='u1', company_id='c1')
+
+        writer.write_observation(chat, '{"a": 1}')
+        await writer.flush(chat)
+        # Outro processo altera a observação diretamente no roteador
+        await router_client.update_session_observation(chat, '{"b": 2}')
+        writer.write_observation(chat, '{"a": 1}')
+        await writer.flush(chat)
+
+        assert router_client.written == [
+            ('u1', '{"a": 1}'),
+            ('u1', '{"b": 2}'),
+            ('u1', '{"a": 1}'),
+        ]
+        assert writer.stats.written == 2
+
+    @pytest.mark.asyncio
+    async def test_bounded_queue_drops_oldest(self, router_client):
+        """Testa que a fila cheia descarta o snapshot mais antigo."""
+        writer = SessionStateWriter(router_client, max_pending=2)
+        chat = ChatID(user_id='u1', company_id='c1')
+
+        for value in range(3):
+            writer.write_observation(chat, str(value))
+
+        assert writer.pending == 2
+        await writer.flush()
+        assert router_client.written == [('u1', '2')]
+
+    @pytest.mark.asyncio
+    async def test_errors_do_not_block_flush(self, router_client):
+        """Testa que uma falha é contabilizada e não trava o flush."""
+        router_client.update_session_observation.side_effect = Exception(
+            'indisponível'
+        )
+        writer = SessionStateWriter(router_client)
+        chat = ChatID(user_id='u1', company_id='c1')
+
+        writer.write_observation(chat, '{}')
+        await writer.flush(chat)
+
+        assert writer.stats.failed == 1
@@ -0,0 +1,106 @@
+"""
+Testes para a coalescência de chamadas concorrentes.
+
+Este módulo contém testes unitários para o SingleFlight, que compartilha
+o resultado de chamadas simultâneas com a mesma chave.
+"""
+
+import asyncio
+
+import pytest
+
+from chatgraph.services.singleflight import SingleFlight
+
+
+@pytest.mark.unit
+class TestSingleFlight:
+    """Testes para o SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_result(self):
+        """Testa que chamadas simultâneas executam uma única vez."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 'valor'
+
+        results = await asyncio.gather(
+            *(flight.do('k', call) for _ in range(5))
+        )
+
+        assert results == ['valor'] * 5
+        assert calls == 1
+        assert flight.stats.misses == 1
+        assert flight.stats.hits == 4
+        assert flight.in_flight == 0
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_are_not_cached(self):
+        """Testa que nada é reaproveitado após o término da chamada."""
+        flight = SingleFlight()
+
+        async def call():
+            return 1
+
+        await flight.do('k', call)
+        await flight.do('k', call)
+
+        assert flight.stats.misses == 2
+        assert flight.stats.hits == 0
+
+    @pytest.mark.asyncio
+    async def test_error_is_shared(self):
+        """Testa que o erro da chamada é repassado a quem aguardava."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.01)
+            raise RuntimeError('falhou')
+
+        results = await asyncio.gather(
+            flight.do('k', call),
+            flight.do('k', call),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert flight.stats.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_is_retried(self):
+        """Testa que quem aguardava refaz a chamada cancelada."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return calls
+
+        leader = asyncio.create_task(flight.do('k', call))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flight.do('k', call))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await follower == 2
+
+    @pytest.mark.asyncio
+    async def test_wait_timeout(self):
+        """Testa que a espera pela chamada em andamento é limitada."""
+        flight = SingleFlight()
+
+        async def call():
+            await asyncio.sleep(0.1)
+
+        leader = asyncio.create_task(flight.do('k', call))
+        await asyncio.sleep(0)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await flight.do('k', call, timeout=0.01)
+        await leader
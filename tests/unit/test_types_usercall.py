@@ -0,0 +1,479 @@
+"""
+Testes para o UserCall.
+
+Este módulo contém testes unitários para verificar a construção do
+UserCall, incluindo o modo lazy de materialização dos modelos.
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, call
+
+import pytest
+
+from chatgraph.models.message import File, Message
+from chatgraph.models.userstate import UserState
+from chatgraph.services.deadline import Deadline, DeadlineExceeded
+from chatgraph.services.file_cache import FileCache
+from chatgraph.services.rate_limiter import KeyedRateLimiter
+from chatgraph.services.router_http_client import RouterHTTPClient
+from chatgraph.types import usercall as usercall_module
+from chatgraph.types.usercall import UserCall
+
+
+@pytest.fixture
+def router_client(http_client_base_url):
+    """RouterHTTPClient sem chamadas reais."""
+    return RouterHTTPClient(base_url=http_client_base_url)
+
+
+@pytest.fixture
+def delivery(sample_user_state_data, sample_message_data):
+    """Entrega decodificada com estado do usuário e mensagem."""
+    return {
+        'user_state': sample_user_state_data,
+        'message': sample_message_data,
+    }
+
+
+@pytest.mark.unit
+class TestUserCallLazy:
+    """Testes para o UserCall em modo lazy."""
+
+    def test_cheap_properties_do_not_build_models(
+        self, delivery, router_client
+    ):
+        """Testa que rota, conteúdo e chat não constroem os modelos."""
+        usercall = UserCall.from_dict(delivery, router_client)
+
+        assert usercall.content_message == 'Bem-vindo'
+        assert usercall.route == 'start'
+        assert usercall.user_id == 'user123'
+        assert usercall.company_id == 'company456'
+        assert usercall._UserCall__user_state is None
+        assert usercall._UserCall__message is None
+
+    @pytest.mark.asyncio
+    async def test_send_does_not_build_user_state(
+        self, delivery, router_client, monkeypatch
+    ):
+        """Testa que um envio simples não constrói o UserState."""
+        expected = UserState.from_dict(delivery['user_state']).to_dict()
+        router_client.send_message = AsyncMock()
+        usercall = UserCall.from_dict(
+            delivery,
+            router_client,
+            rate_limiter=KeyedRateLimiter(rate=100, burst=10),
+        )
+
+        def build(data):
+            raise AssertionError('UserState construído')
+
+        monkeypatch.setattr(UserState, 'from_dict', build)
+        await usercall.send(Message(text_message='Olá'))
+
+        assert usercall._UserCall__user_state is None
+        assert router_client.send_message.await_args.args[1] == expected
+
+    def test_models_built_on_first_access(self, delivery, router_client):
+        """Testa que menu e botões constroem os modelos sob demanda."""
+        usercall = UserCall.from_dict(delivery, router_client)
+
+        assert usercall.menu.name == 'Main'
+        assert isinstance(usercall.user_state, UserState)
+        assert usercall.user_state is usercall.user_state
+
+        assert usercall.buttons[0].title == 'Sim'
+        assert isinstance(usercall.message, Message)
+
+    def test_matches_eager_construction(self, delivery, router_client):
+        """Testa que os modos lazy e eager expõem os mesmos dados."""
+        lazy = UserCall.from_dict(delivery, router_client)
+        eager = UserCall(
+            user_state=UserState.from_dict(delivery['user_state']),
+            message=Message.from_dict(delivery['message']),
+            router_client=router_client,
+        )
+
+        assert lazy.content_message == eager.content_message
+        assert lazy.route == eager.route
+        assert lazy.chatID == eager.chatID
+        assert lazy.menu == eager.menu
+        assert lazy.user_state == eager.user_state
+
+
+@pytest.fixture
+def state_client(router_client):
+    """RouterHTTPClient com os endpoints de estado substituídos."""
+    router_client.set_session_route = AsyncMock()
+    router_client.update_session_observation = AsyncMock()
+    return router_client
+
+
+@pytest.mark.unit
+class TestUserCallWriteBehind:
+    """Testes para o acúmulo de rota e observação até o flush."""
+
+    @pytest.mark.asyncio
+    async def test_updates_coalesced_on_flush(self, delivery, state_client):
+        """Testa que a rota é enviada inteira e a observação uma vez."""
+        usercall = UserCall.from_dict(
+            delivery, state_client, write_behind=True
+        )
+
+        await usercall.set_route('menu')
+        await usercall.set_route('pagamento')
+        usercall.observation = {'a': 1}
+        await usercall.add_observation({'b': 2})
+
+        state_client.set_session_route.assert_not_called()
+        state_client.update_session_observation.assert_not_called()
+        assert usercall.route == 'start.menu.pagamento'
+        assert usercall.observation == {'a': 1, 'b': 2}
+
+        await usercall.flush()
+
+        assert state_client.set_session_route.await_args_list == [
+            call(usercall.chatID, 'menu'),
+            call(usercall.chatID, 'pagamento'),
+        ]
+        state_client.update_session_observation.assert_awaited_once_with(
+            usercall.chatID, '{"a": 1, "b": 2}'
+        )
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize('lazy', [True, False])
+    async def test_send_keeps_pending_observation(
+        self, delivery, state_client, lazy
+    ):
+        """Testa que um envio antes do flush não descarta a observação."""
+        sent_states = []
+
+        async def send_message(message, user_state, deadline=None):
+            # Como o RouterHTTPClient, serializa o estado no envio
+            if isinstance(user_state, UserState):
+                user_state = user_state.to_dict()
+            sent_states.append(user_state)
+
+        state_client.send_message = send_message
+        if lazy:
+            usercall = UserCall.from_dict(
+                delivery, state_client, write_behind=True
+            )
+        else:
+            usercall = UserCall(
+                user_state=UserState.from_dict(delivery['user_state']),
+                message=Message.from_dict(delivery['message']),
+                router_client=state_client,
+                write_behind=True,
+            )
+
+        observation = usercall.observation
+        observation['x'] = 1
+        usercall.observation = observation
+        await usercall.send('olá')
+
+        assert json.loads(sent_states[0]['observation'])['x'] == 1
+
+        await usercall.flush()
+
+        state_client.update_session_observation.assert_awaited_once()
+        written = state_client.update_session_observation.await_args.args[1]
+        assert json.loads(written)['x'] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_without_changes(self, delivery, state_client):
+        """Testa que o flush não chama o roteador sem alterações."""
+        usercall = UserCall.from_dict(
+            delivery, state_client, write_behind=True
+        )
+
+        await usercall.set_route('menu')
+        await usercall.flush()
+        await usercall.flush()
+
+        state_client.set_session_route.assert_awaited_once()
+        state_client.update_session_observation.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_disabled_writes_immediately(self, delivery, state_client):
+        """Testa que, sem write-behind, a rota é enviada na hora."""
+        usercall = UserCall.from_dict(delivery, state_client)
+
+        await usercall.set_route('menu')
+
+        state_client.set_session_route.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_disabled_setter_write_is_awaited_by_flush(
+        self, delivery, state_client
+    ):
+        """Testa que a escrita do setter é concluída pelo flush."""
+        usercall = UserCall.from_dict(delivery, state_client)
+
+        usercall.observation = {'a': 1}
+        await usercall.flush()
+
+        state_client.update_session_observation.assert_awaited_once_with(
+            usercall.chatID, '{"a": 1}'
+        )
+
+
+@pytest.mark.unit
+class TestUserCallFileCache:
+    """Testes para o envio de arquivos com o cache de arquivos."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_send_skips_read_and_probe(
+        self, delivery, router_client, tmp_path, monkeypatch
+    ):
+        """Testa que o reenvio não lê o arquivo nem consulta o servidor."""
+        image = tmp_path / 'menu.png'
+        image.write_bytes(b'imagem')
+        router_client.get_file = AsyncMock(
+            return_value=File(id='f1', url='http://x/f1')
+        )
+        router_client.send_message = AsyncMock()
+        usercall = UserCall.from_dict(
+            delivery, router_client, file_cache=FileCache()
+        )
+
+        await usercall.send(File(name=str(image)))
+
+        load_hash = AsyncMock()
+        monkeypatch.setattr(File, 'load_hash', load_hash)
+        await usercall.send(File(name=str(image)))
+
+        router_client.get_file.assert_awaited_once()
+        load_hash.assert_not_called()
+        sent = router_client.send_message.await_args.args[0]
+        assert sent.file.id == 'f1'
+
+    @pytest.mark.asyncio
+    async def test_concurrent_first_sends_upload_once(
+        self, delivery, router_client, tmp_path
+    ):
+        """Testa que envios simultâneos de um arquivo novo sobem uma vez."""
+        image = tmp_path / 'menu.png'
+        image.write_bytes(b'imagem')
+
+        async def upload(file, **kwargs):
+            await asyncio.sleep(0.01)
+            return File(id='f1', url='http://x/f1')
+
+        router_client.get_file = AsyncMock(return_value=None)
+        router_client.upload_file = AsyncMock(side_effect=upload)
+        router_client.send_message = AsyncMock()
+        file_cache = FileCache()
+        usercalls = [
+            UserCall.from_dict(delivery, router_client, file_cache=file_cache)
+            for _ in range(3)
+        ]
+
+        await asyncio.gather(
+            *(usercall.send(File(name=str(image))) for usercall in usercalls)
+        )
+
+        router_client.upload_file.assert_awaited_once()
+        router_client.get_file.assert_awaited_once()
+        assert router_client.send_message.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_upload_by_url_skips_download(
+        self, delivery, router_client, monkeypatch
+    ):
+        """Testa que arquivos com url são importados pelo servidor."""
+        router_client.upload_file_from_url = AsyncMock(
+            return_value=File(id='f2', url='http://x/f2')
+        )
+        router_client.send_message = AsyncMock()
+        load_hash = AsyncMock()
+        monkeypatch.setattr(File, 'load_hash', load_hash)
+        monkeypatch.setattr(
+            usercall_module, 'fetch_etag', AsyncMock(return_value=None)
+        )
+        usercall = UserCall.from_dict(
+            delivery,
+            router_client,
+            upload_by_url=True,
+            file_cache=FileCache(),
+        )
+
+        await usercall.send(File(url='https://cdn.example.com/doc.pdf'))
+
+        load_hash.assert_not_called()
+        sent = router_client.send_message.await_args.args[0]
+        assert sent.file.id == 'f2'
+
+    @pytest.mark.asyncio
+    async def test_repeated_url_is_imported_once(
+        self, delivery, router_client, monkeypatch
+    ):
+        """Testa que a mesma URL sem ETag é importada uma única vez."""
+        fetch_etag = AsyncMock(return_value=None)
+        monkeypatch.setattr(usercall_module, 'fetch_etag', fetch_etag)
+        router_client.upload_file_from_url = AsyncMock(
+            return_value=File(id='f2', url='http://x/f2')
+        )
+        router_client.send_message = AsyncMock()
+        usercall = UserCall.from_dict(
+            delivery,
+            router_client,
+            upload_by_url=True,
+            file_cache=FileCache(),
+        )
+
+        for _ in range(3):
+            await usercall.send(File(url='https://cdn.example.com/doc.pdf'))
+
+        router_client.upload_file_from_url.assert_awaited_once()
+        fetch_etag.assert_awaited_once()
+        sent = router_client.send_message.await_args.args[0]
+        assert sent.file.id == 'f2'
+
+    @pytest.mark.asyncio
+    async def test_url_reimported_when_etag_changes(
+        self, delivery, router_client, monkeypatch
+    ):
+        """Testa que a URL é revalidada pelo ETag antes de ser reusada."""
+        fetch_etag = AsyncMock(side_effect=['"v1"', '"v1"', '"v2"', '"v2"'])
+        monkeypatch.setattr(usercall_module, 'fetch_etag', fetch_etag)
+        router_client.upload_file_from_url = AsyncMock(
+            side_effect=[
+                File(id='f2', url='http://x/f2'),
+                File(id='f3', url='http://x/f3'),
+            ]
+        )
+        router_client.send_message = AsyncMock()
+        usercall = UserCall.from_dict(
+            delivery,
+            router_client,
+            upload_by_url=True,
+            file_cache=FileCache(revalidate_after=0),
+        )
+        url = 'https://cdn.example.com/doc.pdf'
+
+        sent = []
+        for _ in range(3):
+            await usercall.send(File(url=url))
+            sent.append(router_client.send_message.await_args.args[0])
+
+        assert [message.file.id for message in sent] == ['f2', 'f2', 'f3']
+        assert router_client.upload_file_from_url.await_count == 2
+        assert fetch_etag.await_args_list[1] == call(url, '"v1"')
+
+    @pytest.mark.asyncio
+    async def test_url_not_revalidated_within_interval(
+        self, delivery, router_client, monkeypatch
+    ):
+        """Testa que reenvios dentro do intervalo não consultam a origem."""
+        fetch_etag = AsyncMock(return_value='"v1"')
+        monkeypatch.setattr(usercall_module, 'fetch_etag', fetch_etag)
+        router_client.upload_file_from_url = AsyncMock(
+            return_value=File(id='f2', url='http://x/f2')
+        )
+        router_client.send_message = AsyncMock()
+        usercall = UserCall.from_dict(
+            delivery,
+            router_client,
+            upload_by_url=True,
+            file_cache=FileCache(revalidate_after=300),
+        )
+
+        for _ in range(3):
+            await usercall.send(File(url='https://cdn.example.com/doc.pdf'))
+
+        router_client.upload_file_from_url.assert_awaited_once()
+        fetch_etag.assert_awaited_once()
+
+
+@pytest.mark.unit
+class TestUserCallPipelinedSends:
+    """Testes para a fila de saída de mensagens por chat."""
+
+    @pytest.mark.asyncio
+    async def test_send_returns_before_delivery(self, delivery, router_client):
+        """Testa que send() retorna antes do envio e flush() o aguarda."""
+        release = asyncio.Event()
+        sent = []
+
+        async def send_message(message, user_state, deadline=None):
+            await release.wait()
+            sent.append(message.text_message.detail)
+
+        router_client.send_message = send_message
+        usercall = UserCall.from_dict(
+            delivery, router_client, pipeline_sends=True
+        )
+
+        for text in ('um', 'dois', 'três'):
+            await usercall.send(text)
+        assert sent == []
+
+        release.set()
+        await usercall.flush()
+        assert sent == ['um', 'dois', 'três']
+
+    @pytest.mark.asyncio
+    async def test_error_raised_on_flush(self, delivery, router_client):
+        """Testa que a falha é levantada no flush e descarta o restante."""
+        router_client.send_message = AsyncMock(
+            side_effect=[Exception('indisponível'), None]
+        )
+        usercall = UserCall.from_dict(
+            delivery, router_client, pipeline_sends=True
+        )
+
+        await usercall.send('um')
+        await usercall.send('dois')
+
+        with pytest.raises(Exception, match='indisponível'):
+            await usercall.flush()
+        assert router_client.send_message.await_count == 1
+        await usercall.flush()
+
+    @pytest.mark.asyncio
+    async def test_invalid_type_raises_immediately(
+        self, delivery, router_client
+    ):
+        """Testa que tipos inválidos falham no próprio send()."""
+        usercall = UserCall.from_dict(
+            delivery, router_client, pipeline_sends=True
+        )
+
+        with pytest.raises(ValueError, match='Tipo de mensagem inválido'):
+            await usercall.send(object())
+
+
+@pytest.mark.unit
+class TestUserCallDeadline:
+    """Testes para o prazo da mensagem no UserCall."""
+
+    @pytest.mark.asyncio
+    async def test_send_after_deadline_fails_fast(
+        self, delivery, router_client
+    ):
+        """Testa que envios após o prazo não chamam o roteador."""
+        router_client.send_message = AsyncMock()
+        usercall = UserCall.from_dict(
+            delivery, router_client, deadline=Deadline.after(-1)
+        )
+
+        with pytest.raises(DeadlineExceeded):
+            await usercall.send('oi')
+        router_client.send_message.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_deadline_passed_to_router(self, delivery, router_client):
+        """Testa que o prazo acompanha as chamadas de envio."""
+        router_client.send_message = AsyncMock()
+        deadline = Deadline.after(60)
+        usercall = UserCall.from_dict(
+            delivery, router_client, deadline=deadline
+        )
+
+        await usercall.send('oi')
+
+        kwargs = router_client.send_message.await_args.kwargs
+        assert kwargs['deadline'] is deadline
+        assert usercall.deadline is deadline